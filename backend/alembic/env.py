@@ -32,7 +32,12 @@ from app.db.models import (
     Tool,
     ToolProvider,
     Document,
+    DocumentContent,
+    IngestionJob,
+    SearchEntry,
+    UserStats,
 )
+from app.db.search import FTS_TABLE
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -50,6 +55,17 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave the full-text index outside the models alone (see app.db.search)"""
+    if type_ == "table" and name.startswith(FTS_TABLE):
+        return False
+    if type_ == "column" and object.table.name == "search_entries" and name == "tsv":
+        return False
+    if type_ == "index" and name == "idx_search_entry_tsv":
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -68,6 +84,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -80,6 +97,7 @@ def do_run_migrations(connection: Connection) -> None:
         connection=connection,
         target_metadata=target_metadata,
         compare_type=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -0,0 +1,49 @@
+"""Store document content externally and drop per-document copies
+
+Revision ID: 3dca284af755
+Revises: b71e0d5a9c38
+Create Date: 2026-10-19 15:12:44.208153
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3dca284af755'
+down_revision: Union[str, Sequence[str], None] = 'b71e0d5a9c38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('documents', sa.Column('content_blob', sa.String(length=64), nullable=True))
+    op.add_column('document_contents', sa.Column('content_blob', sa.String(length=64), nullable=True))
+    op.add_column('document_contents', sa.Column('content_length', sa.Integer(), nullable=True))
+
+    op.execute(
+        "UPDATE document_contents SET content_length = length(content) "
+        "WHERE content IS NOT NULL"
+    )
+    # Documents backed by shared content read it from document_contents;
+    # their copies of the text are no longer used
+    op.execute(
+        "UPDATE documents SET content = NULL "
+        "WHERE content_hash IN (SELECT id FROM document_contents WHERE content IS NOT NULL)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Texts kept in the blob store are not restored
+    op.execute(
+        "UPDATE documents SET content = ("
+        "SELECT content FROM document_contents WHERE document_contents.id = documents.content_hash"
+        ") WHERE content_hash IS NOT NULL"
+    )
+    op.drop_column('document_contents', 'content_length')
+    op.drop_column('document_contents', 'content_blob')
+    op.drop_column('documents', 'content_blob')
@@ -0,0 +1,65 @@
+"""Add conversation counters and per-user stats
+
+Revision ID: 5e8d3a1c7f02
+Revises: c4e1f06b9d27
+Create Date: 2026-10-19 18:02:37.114920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8d3a1c7f02'
+down_revision: Union[str, Sequence[str], None] = 'c4e1f06b9d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('conversations', sa.Column('message_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('conversations', sa.Column('document_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('conversations', sa.Column('document_bytes', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('conversations', sa.Column('last_message_at', sa.DateTime(), nullable=True))
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('assistant_id', sa.String(length=36), nullable=False),
+    sa.Column('conversation_count', sa.Integer(), nullable=False),
+    sa.Column('message_count', sa.Integer(), nullable=False),
+    sa.Column('document_count', sa.Integer(), nullable=False),
+    sa.Column('document_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['assistant_id'], ['assistants.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'assistant_id')
+    )
+
+    # From here on the counters are maintained by the application
+    op.execute(
+        "UPDATE conversations SET "
+        "message_count = (SELECT count(*) FROM messages WHERE messages.conversation_id = conversations.id), "
+        "last_message_at = (SELECT max(created_at) FROM messages WHERE messages.conversation_id = conversations.id), "
+        "document_count = (SELECT count(*) FROM documents WHERE documents.conversation_id = conversations.id), "
+        "document_bytes = (SELECT coalesce(sum(size_bytes), 0) FROM documents "
+        "WHERE documents.conversation_id = conversations.id)"
+    )
+    op.execute(
+        "INSERT INTO user_stats (user_id, assistant_id, conversation_count, message_count, "
+        "document_count, document_bytes, created_at, updated_at) "
+        "SELECT user_id, assistant_id, count(*), sum(message_count), sum(document_count), "
+        "sum(document_bytes), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP "
+        "FROM conversations GROUP BY user_id, assistant_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_stats')
+    op.drop_column('conversations', 'last_message_at')
+    op.drop_column('conversations', 'document_bytes')
+    op.drop_column('conversations', 'document_count')
+    op.drop_column('conversations', 'message_count')
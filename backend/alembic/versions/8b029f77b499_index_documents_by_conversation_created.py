@@ -0,0 +1,30 @@
+"""Index documents by conversation and creation time for keyset pagination
+
+Revision ID: 8b029f77b499
+Revises: 3dca284af755
+Create Date: 2026-10-19 16:03:12.481027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b029f77b499'
+down_revision: Union[str, Sequence[str], None] = '3dca284af755'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_document_conversation_created', 'documents', ['conversation_id', 'created_at'], unique=False)
+    op.drop_index('idx_document_conversation', table_name='documents')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('idx_document_conversation', 'documents', ['conversation_id'], unique=False)
+    op.drop_index('idx_document_conversation_created', table_name='documents')
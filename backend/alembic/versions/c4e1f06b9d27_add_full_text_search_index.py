@@ -0,0 +1,54 @@
+"""Add full-text search index of conversations, messages and documents
+
+Revision ID: c4e1f06b9d27
+Revises: 8b029f77b499
+Create Date: 2026-10-19 17:21:08.530614
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1f06b9d27'
+down_revision: Union[str, Sequence[str], None] = '8b029f77b499'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('search_entries',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('ref_id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('conversation_id', sa.String(length=36), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_search_entry_ref', 'search_entries', ['kind', 'ref_id'], unique=True)
+    op.create_index('idx_search_entry_user', 'search_entries', ['user_id', 'kind'], unique=False)
+    op.create_index('idx_search_entry_conversation', 'search_entries', ['conversation_id'], unique=False)
+
+    # Indexed text (see app.db.search); existing rows are indexed online
+    # by scripts/rebuild_search_index.py, as their text may be compressed
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE search_fts USING fts5("
+            "body, scope, tokenize='porter unicode61 remove_diacritics 2')"
+        )
+    else:
+        op.execute("ALTER TABLE search_entries ADD COLUMN tsv tsvector NOT NULL DEFAULT ''::tsvector")
+        op.execute("CREATE INDEX idx_search_entry_tsv ON search_entries USING gin (tsv)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TABLE search_fts")
+    op.drop_index('idx_search_entry_conversation', table_name='search_entries')
+    op.drop_index('idx_search_entry_user', table_name='search_entries')
+    op.drop_index('idx_search_entry_ref', table_name='search_entries')
+    op.drop_table('search_entries')
@@ -4,18 +4,19 @@ SIMBA Backend - Chat API Routes
 Chat endpoints for sending messages and managing conversations.
 """
 
-from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
 from app.services.chat_service import ChatService
-from app.models.message import Message
-from app.models.conversation import Conversation
+from app.models.message import Message, MessagePage, message_page_json
+from app.models.conversation import Conversation, ConversationPage
 from app.utils.logger import logger
-from app.utils.exceptions import ChatException
+from app.utils.exceptions import ChatException, ValidationError
 
 
 router = APIRouter(prefix="/chat", tags=["chat"])
@@ -37,6 +38,21 @@ class CreateConversationRequest(BaseModel):
     device: Optional[str] = None
 
 
+class ImportedMessage(BaseModel):
+    """Message of an imported conversation"""
+    role: Literal["user", "assistant", "system", "tool"]
+    content: str = Field(..., min_length=1)
+    created_at: Optional[datetime] = None
+    msg_metadata: Dict[str, Any] = Field(default_factory=dict)
+
+
+class ImportConversationRequest(BaseModel):
+    """Request to import a conversation with its history"""
+    assistant_id: str
+    title: Optional[str] = Field(None, max_length=200)
+    messages: List[ImportedMessage] = Field(..., max_length=50000)
+
+
 class MessageResponse(BaseModel):
     """Message response"""
     message: Message
@@ -191,36 +207,218 @@ async def create_conversation(
         )
 
 
-@router.get("/conversations/{conversation_id}/messages", response_model=List[Message])
+@router.post("/conversations/import", response_model=Conversation, status_code=status.HTTP_201_CREATED)
+async def import_conversation(
+    request: ImportConversationRequest,
+    user_id: str = "testuser",  # TODO: Get from auth
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Import a conversation with its message history.
+
+    Args:
+        request: Conversation and messages, in chronological order
+        user_id: User ID (from auth)
+        db: Database session
+
+    Returns:
+        Created conversation
+    """
+    try:
+        chat_service = ChatService(db)
+
+        return await chat_service.import_conversation(
+            user_id=user_id,
+            assistant_id=request.assistant_id,
+            messages=[message.model_dump() for message in request.messages],
+            title=request.title
+        )
+
+    except ChatException as e:
+        logger.error(f"Import conversation error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+@router.get("/conversations", response_model=ConversationPage)
+async def list_conversations(
+    user_id: str = "testuser",  # TODO: Get from auth
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    List the user's conversations, most recently updated first.
+
+    Args:
+        user_id: User ID (from auth)
+        limit: Maximum number of conversations
+        cursor: next_cursor of the previous page
+        db: Database session
+
+    Returns:
+        Page of conversations
+    """
+    try:
+        chat_service = ChatService(db)
+
+        return await chat_service.list_conversations(
+            user_id=user_id,
+            limit=limit,
+            cursor=cursor
+        )
+
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message
+        )
+    except Exception as e:
+        logger.error(f"List conversations error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+@router.get("/conversations/search", response_model=ConversationPage)
+async def search_conversations(
+    q: str = Query(..., min_length=1, max_length=200),
+    user_id: str = "testuser",  # TODO: Get from auth
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Search the user's conversations by title, best matches first.
+
+    Args:
+        q: Search words (all must match)
+        user_id: User ID (from auth)
+        limit: Maximum number of conversations
+        cursor: next_cursor of the previous page
+        db: Database session
+
+    Returns:
+        Page of conversations
+    """
+    try:
+        chat_service = ChatService(db)
+
+        return await chat_service.search_conversations(
+            user_id=user_id,
+            query=q,
+            limit=limit,
+            cursor=cursor
+        )
+
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message
+        )
+    except Exception as e:
+        logger.error(f"Search conversations error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+@router.get("/search", response_model=MessagePage)
+async def search_messages(
+    q: str = Query(..., min_length=1, max_length=200),
+    conversation_id: Optional[str] = None,
+    user_id: str = "testuser",  # TODO: Get from auth
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Search the user's messages, best matches first.
+
+    Args:
+        q: Search words (all must match)
+        conversation_id: Only messages of this conversation
+        user_id: User ID (from auth)
+        limit: Maximum number of messages
+        cursor: next_cursor of the previous page
+        db: Database session
+
+    Returns:
+        Page of messages
+    """
+    try:
+        chat_service = ChatService(db)
+
+        page = await chat_service.search_messages(
+            user_id=user_id,
+            query=q,
+            conversation_id=conversation_id,
+            limit=limit,
+            cursor=cursor
+        )
+
+        return Response(content=message_page_json(page), media_type="application/json")
+
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message
+        )
+    except Exception as e:
+        logger.error(f"Search messages error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+@router.get("/conversations/{conversation_id}/messages", response_model=MessagePage)
 async def get_messages(
     conversation_id: str,
-    limit: int = 50,
-    offset: int = 0,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Get messages from a conversation.
+    Get messages from a conversation, oldest first.
 
     Args:
         conversation_id: Conversation ID
         limit: Maximum number of messages
-        offset: Offset for pagination
+        cursor: next_cursor of the previous page
         db: Database session
 
     Returns:
-        List of messages
+        Page of messages
     """
     try:
         chat_service = ChatService(db)
 
-        messages = await chat_service.get_conversation_messages(
+        page = await chat_service.get_conversation_messages(
             conversation_id=conversation_id,
             limit=limit,
-            offset=offset
+            cursor=cursor
         )
 
-        return messages
+        # Serialized directly: returning a Response skips FastAPI's
+        # response validation of every stored message
+        return Response(content=message_page_json(page), media_type="application/json")
 
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message
+        )
     except Exception as e:
         logger.error(f"Get messages error: {e}")
         raise HTTPException(
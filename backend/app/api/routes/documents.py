@@ -4,150 +4,536 @@ SIMBA Backend - Documents API Routes
 Document upload and management endpoints.
 """
 
+import asyncio
 import uuid
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from datetime import datetime
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
-from app.repositories import DocumentRepository
+from app.config import settings
+from app.db.session import get_db, AsyncSessionLocal
+from app.repositories import (
+    DocumentRepository,
+    DocumentContentRepository,
+    IngestionJobRepository,
+)
 from app.services.rag import RAGService
-from app.services.file_processing import FileExtractorFactory
-from app.models.document import Document, DocumentListItem
+from app.services.file_processing import (
+    FileExtractorFactory,
+    SpooledUpload,
+    receive_upload,
+    spool_path,
+    discard_spool,
+)
+from app.services.ingestion import get_ingestion_worker
+from app.models.document import Document, DocumentListItem, DocumentPage
+from app.models.ingestion_job import IngestionJob
+from app.utils.exceptions import FileUploadError, FileTooLargeError, ValidationError
 from app.utils.logger import logger
 
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
+# Job progress stream
+SSE_POLL_SECONDS = 0.5
+SSE_KEEPALIVE_SECONDS = 15.0
+
+# Uploads are parsed from the raw request stream, so describe the body for OpenAPI
+FILE_UPLOAD_BODY = {
+    "requestBody": {
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        }
+    }
+}
+
+
+def upload_error_response(e: FileUploadError) -> HTTPException:
+    """Map an upload error to an HTTP error"""
+    if isinstance(e, FileTooLargeError):
+        return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=e.message)
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+
 
 class UploadResponse(BaseModel):
-    """Response after uploading document"""
+    """Response after accepting a document upload"""
     document_id: str
+    job_id: str
     filename: str
     mime_type: str
     size_bytes: int
-    indexed: bool
-    num_chunks: int
+    status: str
 
 
-@router.post("/upload", response_model=UploadResponse, status_code=status.HTTP_201_CREATED)
+class ReindexResponse(BaseModel):
+    """Response after re-indexing document"""
+    document_id: str
+    num_chunks: int
+    added: int
+    moved: int
+    unchanged: int
+    removed: int
+
+
+@router.post(
+    "/upload",
+    response_model=UploadResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    openapi_extra=FILE_UPLOAD_BODY
+)
 async def upload_document(
+    request: Request,
     conversation_id: str,
-    file: UploadFile = File(...),
     auto_index: bool = True,
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Upload a document and optionally index it for RAG.
+    Upload a document and queue it for extraction and (optionally) indexing.
+
+    The file is streamed to the spool directory as it arrives (never held
+    in memory) and rejected as soon as it exceeds MAX_UPLOAD_SIZE_MB.
+    Processing happens in the background; poll /documents/jobs/{job_id} or
+    stream /documents/jobs/{job_id}/events for progress.
 
     Args:
+        request: Request with a multipart "file" field
         conversation_id: Conversation ID to associate with
-        file: Uploaded file
         auto_index: Whether to automatically index for RAG
         db: Database session
 
     Returns:
-        Upload response with document info
+        Upload response with document and job IDs
     """
+    job_repo = IngestionJobRepository(db)
+
+    # Backpressure: refuse new work while the queue is full
+    if await job_repo.count_active() >= settings.INGESTION_MAX_QUEUED:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Ingestion queue is full, retry later",
+            headers={"Retry-After": str(int(settings.INGESTION_RETRY_BACKOFF * 6))}
+        )
+
+    job_id = str(uuid.uuid4())
     try:
-        # Read file
-        file_bytes = await file.read()
-        file_size = len(file_bytes)
+        upload = await receive_upload(request, spool_path(job_id))
+    except FileUploadError as e:
+        raise upload_error_response(e)
 
-        logger.info(f"Uploading file: {file.filename} ({file_size} bytes)")
+    try:
+        logger.info(f"Uploaded file: {upload.filename} ({upload.size_bytes} bytes, sha256 {upload.sha256[:12]})")
 
-        # Extract text content
-        content = FileExtractorFactory.extract(file_bytes, file.content_type)
+        # Take a reference on the file's shared content (created on first upload)
+        shared = await DocumentContentRepository(db).acquire(
+            upload.sha256, upload.content_type, upload.size_bytes
+        )
+        extracted = shared.content_length is not None
+        indexed = shared.vector_ids is not None
 
-        # Create document in database
+        # Document is created now so its ID can be returned; the worker
+        # fills in content and vector IDs unless they can be reused
         doc_repo = DocumentRepository(db)
         document = await doc_repo.create(
             id=str(uuid.uuid4()),
             conversation_id=conversation_id,
-            filename=file.filename,
-            mime_type=file.content_type,
-            size_bytes=file_size,
-            content=content,
-            doc_metadata={"original_name": file.filename},
-            vector_ids=[]
+            filename=upload.filename,
+            mime_type=upload.content_type,
+            size_bytes=upload.size_bytes,
+            content_hash=upload.sha256,
+            doc_metadata={"original_name": upload.filename, "sha256": upload.sha256},
+            vector_ids=shared.vector_ids if (auto_index and indexed) else []
         )
 
-        # Index for RAG if requested
-        num_chunks = 0
-        if auto_index and content and not content.startswith("[Error"):
-            rag_service = RAGService(db)
-            vector_ids = await rag_service.index_document(
+        if extracted and (indexed or not auto_index):
+            # Duplicate of an already processed file: nothing left to do
+            discard_spool(upload.path)
+            job = await job_repo.create(
+                id=job_id,
                 document_id=document.id,
                 conversation_id=conversation_id,
-                content=content,
-                metadata={
-                    "filename": file.filename,
-                    "mime_type": file.content_type
-                }
+                auto_index=auto_index,
+                status="completed",
+                stage="done",
+                progress=1.0,
+                num_chunks=len(document.vector_ids),
+                message="Reused existing content",
+                finished_at=datetime.utcnow()
+            )
+            logger.info(f"Upload {upload.filename} deduplicated against content {upload.sha256[:12]}")
+        else:
+            job = await job_repo.create(
+                id=job_id,
+                document_id=document.id,
+                conversation_id=conversation_id,
+                spool_path=upload.path,
+                auto_index=auto_index,
+                status="queued",
+                stage="index" if extracted else "extract",
+                message="Queued"
             )
 
-            # Update document with vector IDs
-            await doc_repo.update(document.id, vector_ids=vector_ids)
-            num_chunks = len(vector_ids)
-            logger.info(f"Indexed document {document.id} with {num_chunks} chunks")
+        # Make the job visible to workers before waking them
+        await db.commit()
+        if job.status == "queued":
+            get_ingestion_worker().notify()
 
         return UploadResponse(
             document_id=document.id,
-            filename=file.filename,
-            mime_type=file.content_type,
-            size_bytes=file_size,
-            indexed=num_chunks > 0,
-            num_chunks=num_chunks
+            job_id=job.id,
+            filename=upload.filename,
+            mime_type=upload.content_type,
+            size_bytes=upload.size_bytes,
+            status=job.status
         )
 
     except Exception as e:
         logger.error(f"Upload error: {e}")
+        discard_spool(upload.path)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Upload failed: {str(e)}"
         )
 
 
-@router.get("/conversation/{conversation_id}", response_model=List[DocumentListItem])
+@router.get("/jobs/{job_id}", response_model=IngestionJob)
+async def get_ingestion_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get ingestion job status.
+
+    Args:
+        job_id: Ingestion job ID
+        db: Database session
+
+    Returns:
+        Ingestion job
+    """
+    job = await IngestionJobRepository(db).get(job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ingestion job not found"
+        )
+
+    return IngestionJob.model_validate(job)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_ingestion_job(job_id: str):
+    """
+    Stream ingestion job progress as Server-Sent Events.
+
+    An event is sent whenever the job changes; the stream ends once the job
+    completes or fails.
+
+    Args:
+        job_id: Ingestion job ID
+
+    Returns:
+        Streaming response with Server-Sent Events
+    """
+    async with AsyncSessionLocal() as db:
+        if not await IngestionJobRepository(db).exists(job_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Ingestion job not found"
+            )
+
+    async def event_generator():
+        """Generate SSE events"""
+        last = None
+        idle = 0.0
+
+        # The job may be processed in another process, so poll the record
+        while True:
+            async with AsyncSessionLocal() as db:
+                job = await IngestionJobRepository(db).get(job_id)
+            if job is None:
+                return
+
+            data = IngestionJob.model_validate(job).model_dump_json()
+            if data != last:
+                yield f"data: {data}\n\n"
+                last = data
+                idle = 0.0
+            elif idle >= SSE_KEEPALIVE_SECONDS:
+                yield ": keepalive\n\n"
+                idle = 0.0
+
+            if job.status in ("completed", "failed"):
+                return
+
+            await asyncio.sleep(SSE_POLL_SECONDS)
+            idle += SSE_POLL_SECONDS
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        }
+    )
+
+
+def require_content(content: Optional[str]):
+    """Reject documents without usable extracted text"""
+    # Older versions stored extraction failures as "[Error ...]" content
+    if not content or content.startswith("[Error"):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Document has no extractable content"
+        )
+
+
+async def extract_upload(upload: SpooledUpload) -> str:
+    """Extract an uploaded file's text, rejecting files that fail extraction"""
+    result = await asyncio.to_thread(
+        FileExtractorFactory.extract, upload.path, upload.content_type, upload.sha256
+    )
+    if not result.ok:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"message": result.error, "error_type": result.error_type}
+        )
+    require_content(result.text)
+    return result.text
+
+
+async def reindex_shared_content(
+    db: AsyncSession,
+    rag_service: RAGService,
+    document,
+    upload: Optional[SpooledUpload]
+) -> Dict[str, Any]:
+    """
+    Re-index a document backed by deduplicated content.
+
+    Without a new file (or with an identical one) the shared content is
+    re-chunked in place for every document referencing it. A different
+    file moves the document to that file's content, reusing it if it was
+    uploaded before and otherwise indexing it with the embeddings of
+    unchanged chunks carried over from the old version.
+    """
+    content_repo = DocumentContentRepository(db)
+    doc_repo = DocumentRepository(db)
+    old_hash = document.content_hash
+    previous = len(document.vector_ids or [])
+
+    if upload is None or upload.sha256 == old_hash:
+        shared = await content_repo.get(old_hash)
+        content = await content_repo.get_content(old_hash) if shared else None
+        require_content(content)
+
+        result = await rag_service.reindex_content(
+            content_hash=old_hash,
+            content=content,
+            existing_ids=shared.vector_ids or [],
+            metadata={"mime_type": shared.mime_type}
+        )
+        await content_repo.update(old_hash, vector_ids=result["vector_ids"])
+        await doc_repo.set_content_vectors(old_hash, result["vector_ids"])
+        await doc_repo.update(document.id, vector_ids=result["vector_ids"])
+        return result
+
+    # Extract and embed first, then write everything in one short
+    # transaction: on SQLite a write holds the process's single writer
+    shared = await content_repo.get(upload.sha256)
+    if shared is not None and shared.content_length is not None:
+        content = await content_repo.get_content(upload.sha256)
+    else:
+        content = await extract_upload(upload)
+
+    added = 0
+    vector_ids = shared.vector_ids if shared is not None else None
+    if vector_ids is None:
+        # Chunk IDs are content-addressed: if this request fails, the next
+        # upload of the file reuses whatever was written
+        vector_ids = await rag_service.index_content(
+            content_hash=upload.sha256,
+            content=content,
+            metadata={"mime_type": upload.content_type},
+            reuse_from=old_hash
+        )
+        added = len(vector_ids)
+
+    shared = await content_repo.acquire(upload.sha256, upload.content_type, upload.size_bytes)
+    if shared.content_length is None:
+        await content_repo.set_content(upload.sha256, content)
+    if shared.vector_ids is None:
+        await content_repo.update(upload.sha256, vector_ids=vector_ids)
+
+    await doc_repo.update(
+        document.id,
+        content_hash=upload.sha256,
+        mime_type=upload.content_type,
+        size_bytes=upload.size_bytes,
+        vector_ids=vector_ids
+    )
+
+    last_reference = await content_repo.release(old_hash)
+    await db.commit()
+    if last_reference:
+        await rag_service.delete_content(old_hash)
+
+    return {
+        "vector_ids": vector_ids,
+        "added": added,
+        "moved": 0,
+        "unchanged": len(vector_ids) - added,
+        "removed": previous,
+    }
+
+
+@router.post("/{document_id}/reindex", response_model=ReindexResponse, openapi_extra=FILE_UPLOAD_BODY)
+async def reindex_document(
+    request: Request,
+    document_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Re-index a document, optionally replacing its content.
+
+    Only chunks whose content changed are re-embedded; vectors for chunks
+    that no longer exist are removed.
+
+    Args:
+        request: Request, optionally with a multipart "file" field holding
+                 a new version of the file
+        document_id: Document ID
+        db: Database session
+
+    Returns:
+        Re-index response with chunk diff counts
+    """
+    upload = None
+    try:
+        doc_repo = DocumentRepository(db)
+        document = await doc_repo.get(document_id)
+
+        if not document:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Document not found"
+            )
+
+        try:
+            upload = await receive_upload(request, spool_path(str(uuid.uuid4())), required=False)
+        except FileUploadError as e:
+            raise upload_error_response(e)
+
+        rag_service = RAGService(db)
+        if document.content_hash:
+            result = await reindex_shared_content(db, rag_service, document, upload)
+        else:
+            content = await doc_repo.get_content(document)
+            updates = {}
+            if upload is not None:
+                content = await extract_upload(upload)
+                updates = {
+                    "mime_type": upload.content_type,
+                    "size_bytes": upload.size_bytes,
+                }
+            require_content(content)
+
+            result = await rag_service.reindex_document(
+                document_id=document.id,
+                conversation_id=document.conversation_id,
+                content=content,
+                existing_ids=document.vector_ids or [],
+                metadata={
+                    "filename": document.filename,
+                    "mime_type": updates.get("mime_type", document.mime_type)
+                }
+            )
+
+            # Written after the slow re-indexing (see reindex_shared_content)
+            if upload is not None:
+                await doc_repo.set_content(document.id, content)
+            await doc_repo.update(document.id, vector_ids=result["vector_ids"], **updates)
+
+        return ReindexResponse(
+            document_id=document.id,
+            num_chunks=len(result["vector_ids"]),
+            added=result["added"],
+            moved=result["moved"],
+            unchanged=result["unchanged"],
+            removed=result["removed"]
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Reindex document error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to re-index document: {str(e)}"
+        )
+    finally:
+        if upload is not None:
+            discard_spool(upload.path)
+
+
+@router.get("/conversation/{conversation_id}", response_model=DocumentPage)
 async def get_conversation_documents(
     conversation_id: str,
-    limit: int = 50,
-    offset: int = 0,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Get documents for a conversation.
+    Get documents for a conversation, newest first.
 
     Args:
         conversation_id: Conversation ID
         limit: Maximum documents to return
-        offset: Offset for pagination
+        cursor: next_cursor of the previous page
         db: Database session
 
     Returns:
-        List of documents
+        Page of documents
     """
     try:
         doc_repo = DocumentRepository(db)
-        documents = await doc_repo.get_by_conversation(
+        page = await doc_repo.get_by_conversation(
             conversation_id,
-            skip=offset,
-            limit=limit
-        )
-
-        return [
-            DocumentListItem(
-                id=doc.id,
-                filename=doc.filename,
-                mime_type=doc.mime_type,
-                size_bytes=doc.size_bytes,
-                uploaded_at=doc.uploaded_at,
-                indexed=len(doc.vector_ids) > 0
-            )
-            for doc in documents
-        ]
+            limit=limit,
+            cursor=cursor
+        )
 
+        return DocumentPage(
+            items=[
+                DocumentListItem(
+                    id=doc.id,
+                    filename=doc.filename,
+                    mime_type=doc.mime_type,
+                    size_bytes=doc.size_bytes,
+                    uploaded_at=doc.uploaded_at,
+                    indexed=len(doc.vector_ids) > 0
+                )
+                for doc in page.items
+            ],
+            next_cursor=page.next_cursor,
+            has_more=page.has_more
+        )
+
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message
+        )
     except Exception as e:
         logger.error(f"Get documents error: {e}")
         raise HTTPException(
@@ -156,6 +542,65 @@ async def get_conversation_documents(
         )
 
 
+@router.get("/conversation/{conversation_id}/search", response_model=DocumentPage)
+async def search_conversation_documents(
+    conversation_id: str,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Search the text of a conversation's documents, best matches first.
+
+    Args:
+        conversation_id: Conversation ID
+        q: Search words (all must match)
+        limit: Maximum documents to return
+        cursor: next_cursor of the previous page
+        db: Database session
+
+    Returns:
+        Page of documents
+    """
+    try:
+        doc_repo = DocumentRepository(db)
+        page = await doc_repo.search_by_content(
+            conversation_id,
+            q,
+            limit=limit,
+            cursor=cursor
+        )
+
+        return DocumentPage(
+            items=[
+                DocumentListItem(
+                    id=doc.id,
+                    filename=doc.filename,
+                    mime_type=doc.mime_type,
+                    size_bytes=doc.size_bytes,
+                    uploaded_at=doc.uploaded_at,
+                    indexed=len(doc.vector_ids) > 0
+                )
+                for doc in page.items
+            ],
+            next_cursor=page.next_cursor,
+            has_more=page.has_more
+        )
+
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message
+        )
+    except Exception as e:
+        logger.error(f"Search documents error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search documents: {str(e)}"
+        )
+
+
 @router.get("/{document_id}", response_model=Document)
 async def get_document(
     document_id: str,
@@ -173,7 +618,7 @@ async def get_document(
     """
     try:
         doc_repo = DocumentRepository(db)
-        document = await doc_repo.get(document_id)
+        document = await doc_repo.get_with_content(document_id)
 
         if not document:
             raise HTTPException(
@@ -218,9 +663,13 @@ async def delete_document(
                 detail="Document not found"
             )
 
-        # Delete vectors from ChromaDB if indexed
-        if document.vector_ids:
-            rag_service = RAGService(db)
+        rag_service = RAGService(db)
+        if document.content_hash:
+            # Shared vectors go with the last document referencing them
+            if await DocumentContentRepository(db).release(document.content_hash):
+                await rag_service.delete_content(document.content_hash)
+        elif document.vector_ids:
+            # Delete vectors from ChromaDB if indexed
             await rag_service.delete_document_vectors(
                 conversation_id=document.conversation_id,
                 vector_ids=document.vector_ids
@@ -26,8 +26,8 @@ class IndexDocumentRequest(BaseModel):
     conversation_id: str
     content: str
     metadata: Optional[dict] = Field(default_factory=dict)
-    chunk_size: int = Field(500, ge=100, le=2000)
-    chunk_overlap: int = Field(50, ge=0, le=500)
+    chunk_size: Optional[int] = Field(None, ge=32, le=2048)  # Tokens (default: RAG_CHUNK_SIZE)
+    chunk_overlap: Optional[int] = Field(None, ge=0, le=512)  # Tokens (default: RAG_CHUNK_OVERLAP)
 
 
 class IndexDocumentResponse(BaseModel):
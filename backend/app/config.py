@@ -5,7 +5,7 @@ Configuration management using Pydantic Settings.
 Loads from environment variables with .env file support.
 """
 
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field, validator
 
@@ -26,11 +26,47 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./simba.db"
+    COLUMN_COMPRESSION: str = "zlib"  # Large message/document text is stored compressed: zlib | zstd | none
+    COLUMN_COMPRESSION_THRESHOLD_BYTES: int = 2048  # Smaller values are stored as-is
+    DB_BULK_INSERT_BATCH_SIZE: int = 1000  # Rows per multi-row INSERT of create_many()
+
+    # PostgreSQL connection pool (per worker process, see GET /metrics/db)
+    DB_POOL_SIZE: int = 10  # Connections kept open
+    DB_MAX_OVERFLOW: int = 20  # Extra connections opened under load, closed when returned
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds after which a connection is replaced (-1: never)
+    DB_POOL_PRE_PING: bool = False  # Test connections on checkout (a round trip each)
+    DB_STATEMENT_CACHE_SIZE: int = 100  # Prepared statements cached per connection (0: off)
+    DB_PGBOUNCER: bool = False  # Behind PgBouncer in transaction mode: no pool, no statement cache
+
+    # SQLite profile (pragmas set on every connection, single writer per process)
+    SQLITE_JOURNAL_MODE: str = "WAL"  # Readers and the writer don't block each other
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # fsync at checkpoints only; safe with WAL
+    SQLITE_MMAP_SIZE: int = 268435456  # Bytes of the database file memory-mapped (256 MB)
+    SQLITE_CACHE_SIZE: int = -65536  # Page cache per connection; negative: KiB (64 MB)
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait for another process's write lock
+    SQLITE_POOL_SIZE: int = 8  # Connections kept open (reads run concurrently on them)
+    SQLITE_WRITE_TIMEOUT: float = 30.0  # Seconds a session or queued write waits for this process's writer
+    SQLITE_WRITE_BATCH_SIZE: int = 200  # Most queued writes committed together
+    SQLITE_WRITE_BATCH_WAIT_MS: float = 0.0  # Wait to gather a batch (0: batch what queued meanwhile)
 
     # ChromaDB
     CHROMA_HOST: str = "localhost"
     CHROMA_PORT: int = 8001
     CHROMA_PERSIST_DIRECTORY: str = "./chroma_data"
+    CHROMA_HEALTH_CHECK_INTERVAL: float = 15.0  # Seconds between background heartbeats
+    CHROMA_RETRY_AFTER_SECONDS: float = 5.0  # Fail fast this long after a connection error
+
+    # Vector store backend: chroma_http | chroma_embedded | flat
+    VECTOR_STORE_BACKEND: str = "chroma_http"
+    VECTOR_STORE_DIRECTORY: str = "./vector_data"  # Used by the flat backend
+    VECTOR_STORE_MAX_CONCURRENCY: int = 8  # In-flight calls per backend
+    VECTOR_STORE_TIMEOUT: float = 10.0  # Seconds for reads, including wait for a free slot
+    VECTOR_STORE_WRITE_TIMEOUT: float = 120.0  # Seconds for writes (large indexing batches)
+
+    # Vector collection layout: per_conversation | shared (partitioned by tenant)
+    RAG_COLLECTION_LAYOUT: str = "per_conversation"
+    RAG_SHARED_COLLECTIONS: int = 8
 
     @property
     def chroma_url(self) -> str:
@@ -69,16 +105,58 @@ class Settings(BaseSettings):
     MAX_UPLOAD_SIZE_MB: int = 50
     ALLOWED_EXTENSIONS: List[str] = [
         "pdf", "docx", "xlsx", "pptx",
-        "png", "jpg", "jpeg", "gif",
+        "png", "jpg", "jpeg", "gif", "tif", "tiff", "bmp", "webp",
         "txt", "md", "csv"
     ]
 
+    # Text extraction
+    EXTRACTION_WORKERS: int = 0  # Extraction processes (0 = one per CPU core)
+    EXTRACTION_TIMEOUT_SECONDS: float = 120.0  # Wall-clock limit per extraction task
+    EXTRACTION_MEMORY_LIMIT_MB: int = 1024  # Address space limit per worker (0 = unlimited)
+    EXTRACTION_MAX_TASKS_PER_WORKER: int = 50  # Worker processes are replaced after this many tasks
+    PDF_PAGES_PER_TASK: int = 16  # Pages extracted per process pool task
+    PDF_PARALLEL_MIN_PAGES: int = 32  # Smaller PDFs are extracted as a single task
+    EXTRACTION_CACHE_DIRECTORY: str = "./extraction_cache"
+    EXTRACTION_CACHE_MAX_MB: int = 2048  # Compressed size bound (0 = cache disabled)
+
+    # OCR (images and scanned PDF pages; needs the tesseract binary)
+    OCR_ENABLED: bool = True
+    OCR_LANGUAGES: str = "eng"  # tesseract language codes, e.g. "eng+spa"
+    OCR_DPI: int = 300  # Rendering resolution of scanned PDF pages
+    OCR_MAX_DIMENSION: int = 4000  # Larger page images are downscaled (pixels)
+    OCR_MIN_PAGE_CHARS: int = 20  # PDF pages with images and less text are OCRed
+    OCR_PAGE_TIMEOUT_SECONDS: float = 60.0
+    TESSERACT_CMD: Optional[str] = None  # Path to tesseract if not on PATH
+
+    # Extracted document text larger than this is kept compressed in the
+    # blob store instead of the database (0 = always in the database).
+    # Streamed extractions are written to the blob store as they are
+    # extracted; only texts stored in the database are read back whole
+    CONTENT_BLOB_THRESHOLD_KB: int = 0
+    BLOB_STORE_DIRECTORY: str = "./blob_store"
+
+    # Background ingestion (extraction + indexing of uploads)
+    INGESTION_WORKER_MODE: str = "inprocess"  # inprocess | external (scripts/ingestion_worker.py)
+    INGESTION_CONCURRENCY: int = 2  # Jobs processed at once per worker process
+    INGESTION_MAX_QUEUED: int = 100  # Uploads are rejected (429) beyond this backlog
+    INGESTION_MAX_RETRIES: int = 3  # Attempts per stage before a job fails
+    INGESTION_RETRY_BACKOFF: float = 5.0  # Seconds, doubled on each retry
+    INGESTION_POLL_INTERVAL: float = 2.0  # Seconds between queue polls when idle
+    INGESTION_JOB_LEASE_SECONDS: int = 300  # Running jobs without a heartbeat are requeued
+    INGESTION_SPOOL_DIRECTORY: str = "./ingestion_spool"
+
     # RAG Settings
     RAG_TOP_K: int = 10
-    RAG_CHUNK_SIZE: int = 1000
-    RAG_CHUNK_OVERLAP: int = 200
+    RAG_CHUNK_SIZE: int = 256  # Tokens (capped at the embedding model's max sequence length)
+    RAG_CHUNK_OVERLAP: int = 32  # Tokens
+    RAG_INDEX_BATCH_SIZE: int = 64  # Chunks embedded and written per batch
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
 
+    # Hybrid retrieval (BM25 + vectors, fused with reciprocal rank fusion)
+    RAG_HYBRID_SEARCH: bool = True
+    RAG_LEXICAL_INDEX_DIRECTORY: str = "./lexical_index"
+    RAG_RRF_K: int = 60
+
     # Tools Settings
     TOOLS_CONFIG_PATH: str = "./config/tools.yaml"
     TOOLS_TIMEOUT: int = 30
@@ -0,0 +1,273 @@
+"""
+SIMBA Backend - Blob Store
+
+Compressed on-disk storage for large extracted document texts.
+
+Extracted text can run to tens of megabytes; kept in a Text column it
+bloats the database and every row read that touches it. Texts larger than
+CONTENT_BLOB_THRESHOLD_KB are instead written here, gzip-compressed, and
+the row keeps only the blob's key (Document.content_blob /
+DocumentContent.content_blob).
+
+Blobs are content-addressed (SHA-256 of the text), so identical texts are
+stored once and a write never changes an existing blob. They are written
+to a temporary file and renamed into place, so readers never see a partial
+blob. Blobs are not deleted when rows stop referencing them, because the
+referencing transaction may still roll back; scripts/gc_blob_store.py
+removes unreferenced blobs.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+from app.config import settings
+from app.utils.logger import logger
+
+
+class BlobStore:
+    """
+    Content-addressed store of gzip-compressed texts.
+
+    Usage:
+        store = BlobStore("./blob_store")
+        key = store.put(text)
+        text = store.get(key)
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize store.
+
+        Args:
+            directory: Store directory
+        """
+        self.directory = Path(directory)
+
+    @staticmethod
+    def key(text: str) -> str:
+        """Key of a text (SHA-256 of its UTF-8 encoding)"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        # Fan out by hash prefix to keep directories small
+        return self.directory / key[:2] / f"{key}.txt.gz"
+
+    def put(self, text: str) -> str:
+        """
+        Store a text.
+
+        Args:
+            text: Text to store
+
+        Returns:
+            Blob key
+        """
+        key = self.key(text)
+        path = self._path(key)
+        if path.exists():
+            # Refresh the write time: a new row is about to reference it,
+            # and the garbage collector spares recently written blobs
+            try:
+                os.utime(path)
+                return key
+            except FileNotFoundError:
+                pass
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.part")
+        try:
+            with gzip.open(partial, "wt", encoding="utf-8", compresslevel=6) as handle:
+                handle.write(text)
+            os.replace(partial, path)
+        finally:
+            try:
+                os.unlink(partial)
+            except FileNotFoundError:
+                pass
+        return key
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Read a text.
+
+        Args:
+            key: Blob key
+
+        Returns:
+            Stored text, or None if the blob doesn't exist
+        """
+        try:
+            with gzip.open(self._path(key), "rt", encoding="utf-8") as handle:
+                return handle.read()
+        except FileNotFoundError:
+            logger.warning(f"Blob {key[:12]} is missing from the blob store")
+            return None
+
+    def delete(self, key: str) -> bool:
+        """Delete a blob; returns False if it didn't exist"""
+        try:
+            os.unlink(self._path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def keys(self) -> Iterator[str]:
+        """Keys of all stored blobs"""
+        for path in self.directory.glob("*/*.txt.gz"):
+            yield path.name[:-len(".txt.gz")]
+
+    def age(self, key: str) -> float:
+        """Seconds since a blob was written"""
+        try:
+            return time.time() - self._path(key).stat().st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+
+class TextWriter:
+    """
+    Stores a text written piece by piece, without holding it in memory.
+
+    Pieces are compressed into a pending blob as they arrive. finish()
+    publishes the blob or, when the text is small enough to be kept in the
+    database (see store_text), reads it back and drops the pending blob.
+
+    Usage:
+        writer = TextWriter(head_chars=1000)
+        for piece in pieces:
+            writer.write(piece)
+        values = await writer.finish()
+    """
+
+    def __init__(self, store: Optional[BlobStore] = None, head_chars: int = 0):
+        """
+        Initialize writer.
+
+        Args:
+            store: Blob store (default: the process-wide one)
+            head_chars: Characters kept in memory from the start of the text (head)
+        """
+        self.store = store or get_blob_store()
+        self.head_chars = head_chars
+        self.head = ""
+        self.length = 0  # Characters written
+        self.size = 0  # UTF-8 bytes written
+        self._hash = hashlib.sha256()
+        self.store.directory.mkdir(parents=True, exist_ok=True)
+        self._partial = self.store.directory / f"{uuid.uuid4().hex}.part"
+        self._file = gzip.open(self._partial, "wb", compresslevel=6)
+
+    def write(self, text: str):
+        data = text.encode("utf-8")
+        self._hash.update(data)
+        self._file.write(data)
+        self.length += len(text)
+        self.size += len(data)
+        if len(self.head) < self.head_chars:
+            self.head += text[:self.head_chars - len(self.head)]
+
+    async def finish(self) -> Dict[str, Any]:
+        """
+        Store the written text.
+
+        Returns:
+            Column values, as returned by store_text()
+        """
+        threshold = settings.CONTENT_BLOB_THRESHOLD_KB * 1024
+        try:
+            if threshold > 0 and self.size > threshold:
+                key = await asyncio.to_thread(self._publish)
+                return {"content": None, "content_blob": key}
+            return {"content": await asyncio.to_thread(self._read), "content_blob": None}
+        finally:
+            self.discard()
+
+    def discard(self):
+        """Drop the pending blob"""
+        self._file.close()
+        try:
+            os.unlink(self._partial)
+        except FileNotFoundError:
+            pass
+
+    def _publish(self) -> str:
+        self._file.close()
+        key = self._hash.hexdigest()
+        path = self.store._path(key)
+        if path.exists():
+            try:
+                os.utime(path)
+                return key
+            except FileNotFoundError:
+                pass
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self._partial, path)
+        return key
+
+    def _read(self) -> str:
+        self._file.close()
+        with gzip.open(self._partial, "rt", encoding="utf-8") as handle:
+            return handle.read()
+
+
+_store: Optional[BlobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """Get the process-wide blob store"""
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = BlobStore(settings.BLOB_STORE_DIRECTORY)
+
+    return _store
+
+
+async def store_text(text: str) -> Dict[str, Any]:
+    """
+    Column values storing a text inline or, when large, in the blob store.
+
+    Args:
+        text: Extracted text
+
+    Returns:
+        Dict with content and content_blob
+    """
+    threshold = settings.CONTENT_BLOB_THRESHOLD_KB * 1024
+    # The threshold is in bytes; a text has at least as many bytes as characters
+    if threshold <= 0 or (len(text) <= threshold and len(text.encode("utf-8")) <= threshold):
+        return {"content": text, "content_blob": None}
+
+    key = await asyncio.to_thread(get_blob_store().put, text)
+    return {"content": None, "content_blob": key}
+
+
+async def store_content(content: Union[str, TextWriter]) -> Tuple[Dict[str, Any], int, str]:
+    """
+    Store a text, or the text written to a TextWriter.
+
+    Returns:
+        Tuple of (column values, length in characters, text to index for
+        search: the whole text, or the writer's head)
+    """
+    if isinstance(content, TextWriter):
+        values = await content.finish()
+        return values, content.length, values["content"] or content.head
+    return await store_text(content), len(content), content
+
+
+async def load_text(content: Optional[str], content_blob: Optional[str]) -> Optional[str]:
+    """Text stored by store_text()"""
+    if content_blob:
+        return await asyncio.to_thread(get_blob_store().get, content_blob)
+    return content
@@ -2,13 +2,19 @@
 SIMBA Backend - ChromaDB Client
 
 ChromaDB client for vector embeddings and semantic search.
+
+The underlying client is created lazily on first use and reused, collection
+handles are cached, and server health is tracked by a background monitor
+so callers fail fast while ChromaDB is down instead of waiting on timeouts.
 """
 
-import chromadb
-from chromadb.config import Settings
+import asyncio
+import threading
+import time
 from typing import List, Dict, Any, Optional
 
 from app.config import settings
+from app.utils.exceptions import VectorStoreUnavailableError
 from app.utils.logger import logger
 
 
@@ -22,38 +28,199 @@ class ChromaDBClient:
     - Managing collections
     """
 
-    def __init__(self):
-        """Initialize ChromaDB client"""
-        self.client = chromadb.HttpClient(
-            host=settings.CHROMA_HOST,
-            port=settings.CHROMA_PORT,
-            settings=Settings(
-                anonymized_telemetry=False,
-                allow_reset=True,
-            )
-        )
+    def __init__(self, persistent: bool = False):
+        """
+        Initialize ChromaDB client (no connection is made until first use).
+
+        Args:
+            persistent: Run Chroma embedded in-process on
+                        CHROMA_PERSIST_DIRECTORY instead of over HTTP
+        """
+        self.persistent = persistent
+        self.location = settings.CHROMA_PERSIST_DIRECTORY if persistent else settings.chroma_url
+        self._client = None
+        self._lock = threading.RLock()
+        self._collections: Dict[str, Any] = {}
+
+        # Health state, maintained by the background monitor and by failures
+        self.healthy = True
+        self.last_health_check: Optional[float] = None
+        self._retry_after = 0.0
+        self._monitor_task: Optional[asyncio.Task] = None
 
         # Default collection name
         self.collection_name = "simba_documents"
         self.collection = None
 
-        logger.info(f"ChromaDB client initialized: {settings.chroma_url}")
+    @property
+    def client(self):
+        """Underlying chromadb client, created on first access"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._connect()
+        return self._client
+
+    def _connect(self):
+        """Create the chromadb client"""
+        import chromadb
+        from chromadb.config import Settings
+
+        chroma_settings = Settings(
+            anonymized_telemetry=False,
+            allow_reset=True,
+        )
+
+        if self.persistent:
+            client = chromadb.PersistentClient(
+                path=settings.CHROMA_PERSIST_DIRECTORY,
+                settings=chroma_settings
+            )
+        else:
+            client = chromadb.HttpClient(
+                host=settings.CHROMA_HOST,
+                port=settings.CHROMA_PORT,
+                settings=chroma_settings
+            )
+
+        logger.info(f"ChromaDB client initialized: {self.location}")
+        return client
 
-    def get_or_create_collection(self, name: Optional[str] = None):
+    # Health
+
+    def ensure_available(self):
+        """
+        Fail fast if ChromaDB is known to be down.
+
+        Raises:
+            VectorStoreUnavailableError: While marked unhealthy
+        """
+        if not self.healthy and time.monotonic() < self._retry_after:
+            raise VectorStoreUnavailableError(
+                f"ChromaDB at {self.location} is unavailable",
+                details={"last_health_check": self.last_health_check}
+            )
+
+    def mark_unhealthy(self, error: Exception):
+        """Record a connectivity failure"""
+        if self.healthy:
+            logger.error(f"ChromaDB marked unhealthy: {error}")
+        self.healthy = False
+        self._retry_after = time.monotonic() + settings.CHROMA_RETRY_AFTER_SECONDS
+        self.invalidate()
+
+    def mark_healthy(self):
+        """Record a successful contact"""
+        if not self.healthy:
+            logger.info("ChromaDB is healthy again")
+        self.healthy = True
+
+    def healthcheck(self) -> bool:
+        """Check if ChromaDB is accessible (and update health state)"""
+        self.last_health_check = time.time()
+        try:
+            self.client.heartbeat()
+            self.mark_healthy()
+            return True
+        except Exception as e:
+            logger.error(f"ChromaDB healthcheck failed: {e}")
+            self.mark_unhealthy(e)
+            return False
+
+    async def _monitor(self, interval: float):
+        """Periodically check health off the event loop"""
+        while True:
+            await asyncio.to_thread(self.healthcheck)
+            await asyncio.sleep(interval)
+
+    def start_health_monitor(self, interval: Optional[float] = None):
+        """Start the background health monitor (call from a running loop)"""
+        if self._monitor_task is None or self._monitor_task.done():
+            self._monitor_task = asyncio.create_task(
+                self._monitor(interval or settings.CHROMA_HEALTH_CHECK_INTERVAL)
+            )
+
+    async def stop_health_monitor(self):
+        """Stop the background health monitor"""
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+            self._monitor_task = None
+
+    # Collections
+
+    def invalidate(self, name: Optional[str] = None):
+        """Drop cached collection handles (one, or all)"""
+        with self._lock:
+            if name is None:
+                self._collections.clear()
+                self.collection = None
+            else:
+                self._collections.pop(name, None)
+                if name == self.collection_name:
+                    self.collection = None
+
+    def get_or_create_collection(
+        self,
+        name: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
         """Get or create a collection"""
         collection_name = name or self.collection_name
 
+        cached = self._collections.get(collection_name)
+        if cached is not None:
+            return cached
+
+        self.ensure_available()
         try:
-            self.collection = self.client.get_or_create_collection(
+            collection = self.client.get_or_create_collection(
                 name=collection_name,
-                metadata={"description": "SIMBA document embeddings"}
+                metadata=metadata or {"description": "SIMBA document embeddings"}
             )
-            logger.info(f"Collection '{collection_name}' ready")
-            return self.collection
+        except OSError as e:
+            self.mark_unhealthy(e)
+            raise
         except Exception as e:
             logger.error(f"Error getting/creating collection: {e}")
             raise
 
+        self._collections[collection_name] = collection
+        if collection_name == self.collection_name:
+            self.collection = collection
+        logger.info(f"Collection '{collection_name}' ready")
+        return collection
+
+    def get_collection(self, name: str):
+        """Get an existing collection (raises ValueError if it does not exist)"""
+        cached = self._collections.get(name)
+        if cached is not None:
+            return cached
+
+        self.ensure_available()
+        try:
+            collection = self.client.get_collection(name=name)
+        except OSError as e:
+            self.mark_unhealthy(e)
+            raise
+
+        self._collections[name] = collection
+        return collection
+
+    def delete_collection(self, name: str):
+        """Delete a collection and forget its handle"""
+        self.ensure_available()
+        self.invalidate(name)
+        self.client.delete_collection(name)
+
+    def list_collections(self) -> List[str]:
+        """Names of all collections"""
+        self.ensure_available()
+        return [c.name for c in self.client.list_collections()]
+
     def add_documents(
         self,
         ids: List[str],
@@ -145,29 +312,24 @@ class ChromaDBClient:
             self.get_or_create_collection()
 
         try:
-            self.client.delete_collection(self.collection_name)
+            self.delete_collection(self.collection_name)
             logger.warning(f"Collection '{self.collection_name}' deleted")
-            self.collection = None
             self.get_or_create_collection()
         except Exception as e:
             logger.error(f"Error resetting collection: {e}")
             raise
 
-    def healthcheck(self) -> bool:
-        """Check if ChromaDB is accessible"""
-        try:
-            self.client.heartbeat()
-            return True
-        except Exception as e:
-            logger.error(f"ChromaDB healthcheck failed: {e}")
-            return False
-
 
-# Singleton instance
-chroma_client = ChromaDBClient()
+# Global instance (created on first use, not at import)
+_chroma_client: Optional[ChromaDBClient] = None
 
 
 # Dependency for FastAPI
 def get_chroma_client() -> ChromaDBClient:
     """Dependency that provides ChromaDB client"""
-    return chroma_client
+    global _chroma_client
+
+    if _chroma_client is None:
+        _chroma_client = ChromaDBClient()
+
+    return _chroma_client
@@ -6,11 +6,12 @@ Database models using SQLAlchemy ORM.
 
 from datetime import datetime
 from sqlalchemy import (
-    Column, String, Integer, Float, Boolean, DateTime,
+    Column, String, Integer, BigInteger, Float, Boolean, DateTime,
     Text, JSON, ForeignKey, Index
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from app.db.base import Base, TimestampMixin, TableNameMixin
+from app.db.types import CompressedJSON, CompressedText
 
 
 class User(Base, TimestampMixin, TableNameMixin):
@@ -58,6 +59,12 @@ class Conversation(Base, TimestampMixin, TableNameMixin):
     device = Column(String(100))
     conv_metadata = Column(JSON, default=dict)  # Renamed from 'metadata' to avoid SQLAlchemy conflict
 
+    # Counters maintained by the repositories with each insert and delete
+    message_count = Column(Integer, default=0, nullable=False)
+    document_count = Column(Integer, default=0, nullable=False)
+    document_bytes = Column(BigInteger, default=0, nullable=False)  # Total size of the documents
+    last_message_at = Column(DateTime)
+
     # Relationships
     user = relationship("User", back_populates="conversations")
     assistant = relationship("Assistant", back_populates="conversations")
@@ -77,16 +84,16 @@ class Message(Base, TimestampMixin, TableNameMixin):
     conversation_id = Column(String(36), ForeignKey("conversations.id"), nullable=False, index=True)
     assistant_id = Column(String(36), ForeignKey("assistants.id"), index=True)
     role = Column(String(20), nullable=False)  # user, assistant, system, tool
-    content = Column(Text, nullable=False)
+    content = Column(CompressedText, nullable=False)
     msg_metadata = Column(JSON, default=dict)  # Renamed from 'metadata' to avoid SQLAlchemy conflict
 
     # RAG data (stored as JSON)
-    sources = Column(JSON, default=list)
+    sources = Column(CompressedJSON, default=list)
     references = Column(JSON, default=list)
 
     # Tools data
     tool_calls = Column(JSON, default=list)
-    tool_results = Column(JSON, default=list)
+    tool_results = Column(CompressedJSON, default=list)
 
     # Relationships
     conversation = relationship("Conversation", back_populates="messages")
@@ -142,7 +149,10 @@ class Document(Base, TimestampMixin, TableNameMixin):
     filename = Column(String(255), nullable=False)
     mime_type = Column(String(100), nullable=False)
     size_bytes = Column(Integer, nullable=False)
-    content = Column(Text)  # Extracted text content
+    # Extracted text; only loaded on request (DocumentRepository.get_content)
+    content = deferred(Column(CompressedText), raiseload=True)
+    content_blob = Column(String(64))  # Blob store key when the text is stored externally
+    content_hash = Column(String(64), index=True)  # SHA-256 of the file -> DocumentContent
     doc_metadata = Column(JSON, default=dict)  # Renamed from 'metadata' to avoid SQLAlchemy conflict
     vector_ids = Column(JSON, default=list)  # ChromaDB vector IDs
     uploaded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -152,5 +162,78 @@ class Document(Base, TimestampMixin, TableNameMixin):
 
     # Indexes
     __table_args__ = (
-        Index('idx_document_conversation', 'conversation_id'),
+        Index('idx_document_conversation_created', 'conversation_id', 'created_at'),
+    )
+
+
+class DocumentContent(Base, TimestampMixin, TableNameMixin):
+    """Deduplicated file content ORM model, shared by documents with the same hash"""
+
+    id = Column(String(64), primary_key=True)  # SHA-256 of the file
+    mime_type = Column(String(100), nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    # Extracted text (None until extracted); only loaded on request
+    content = deferred(Column(CompressedText), raiseload=True)
+    content_blob = Column(String(64))  # Blob store key when the text is stored externally
+    content_length = Column(Integer)  # Characters of extracted text (None until extracted)
+    vector_ids = Column(JSON)  # Shared chunk vectors (None until indexed)
+    ref_count = Column(Integer, default=0, nullable=False)
+
+
+class IngestionJob(Base, TimestampMixin, TableNameMixin):
+    """Background ingestion job ORM model"""
+
+    id = Column(String(36), primary_key=True)
+    document_id = Column(String(36), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True)
+    conversation_id = Column(String(36), ForeignKey("conversations.id"), nullable=False)
+    spool_path = Column(String(500))  # Uploaded bytes awaiting extraction
+    auto_index = Column(Boolean, default=True)
+    status = Column(String(20), default="queued", nullable=False)  # queued, running, completed, failed
+    stage = Column(String(20), default="extract", nullable=False)  # extract, index, done
+    progress = Column(Float, default=0.0)
+    message = Column(Text)
+    attempts = Column(Integer, default=0)  # Attempts of the current stage
+    num_chunks = Column(Integer, default=0)
+    run_after = Column(DateTime)  # Retry backoff
+    worker_id = Column(String(100))
+    heartbeat_at = Column(DateTime)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    # Relationships
+    document = relationship("Document")
+
+    # Indexes
+    __table_args__ = (
+        Index('idx_ingestion_job_status_created', 'status', 'created_at'),
+    )
+
+
+class UserStats(Base, TimestampMixin, TableNameMixin):
+    """Per-user, per-assistant usage totals ORM model (maintained incrementally)"""
+
+    user_id = Column(String(36), ForeignKey("users.id"), primary_key=True)
+    assistant_id = Column(String(36), ForeignKey("assistants.id"), primary_key=True)
+    conversation_count = Column(Integer, default=0, nullable=False)
+    message_count = Column(Integer, default=0, nullable=False)
+    document_count = Column(Integer, default=0, nullable=False)
+    document_bytes = Column(BigInteger, default=0, nullable=False)
+
+
+class SearchEntry(Base):
+    """Full-text search index entry ORM model (text is indexed per dialect, see app.db.search)"""
+
+    __tablename__ = "search_entries"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)  # FTS5 rowid on SQLite
+    kind = Column(String(20), nullable=False)  # message, document, conversation
+    ref_id = Column(String(36), nullable=False)  # ID of the indexed row
+    user_id = Column(String(36), nullable=False)
+    conversation_id = Column(String(36), nullable=False)
+
+    # Indexes
+    __table_args__ = (
+        Index('idx_search_entry_ref', 'kind', 'ref_id', unique=True),
+        Index('idx_search_entry_user', 'user_id', 'kind'),
+        Index('idx_search_entry_conversation', 'conversation_id'),
     )
@@ -0,0 +1,130 @@
+"""
+SIMBA Backend - Connection Pool Metrics
+
+Connection pools recording how long checkouts wait and how many
+connections are in use, exported per worker process (GET /metrics/db) to
+size pools: waits piling up mean the pool is too small for the worker's
+concurrency, a peak well under the pool size means it is too large.
+"""
+
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.025, 0.1, 0.5, 2.5)
+
+
+class PoolMetrics:
+    """Checkout counters of a pool"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connections_opened = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def listen(self, pool: Pool):
+        """Count connections opened and in use through the pool's events"""
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "checkin", self._on_checkin)
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        """Record one checkout (or a checkout that timed out)"""
+        if timed_out:
+            self.timeouts += 1
+        else:
+            self.checkouts += 1
+        self.wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+        bucket = next((i for i, bound in enumerate(WAIT_BUCKETS) if seconds <= bound), len(WAIT_BUCKETS))
+        self.wait_buckets[bucket] += 1
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self.connections_opened += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.in_use += 1
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        self.in_use = max(0, self.in_use - 1)
+
+
+class MeteredPool:
+    """Pool mixin keeping PoolMetrics in .metrics"""
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        # engine.dispose() recreates the pool with the same event listeners
+        # (_dispatch); recreate() hands over the metrics
+        recreated = "_dispatch" in kwargs
+        super().__init__(*args, **kwargs)
+        if not recreated:
+            self.metrics = PoolMetrics()
+            self.metrics.listen(self)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Current state and cumulative counters of the pool.
+
+        Returns:
+            Dictionary with size, in_use, idle, overflow, peak_in_use,
+            checkouts, timeouts, connections_opened and checkout wait times
+            (total, max, average and a cumulative histogram by upper bound)
+        """
+        metrics = self.metrics
+        queued = isinstance(self, QueuePool)
+        histogram, count = {}, 0
+        for bound, bucket in zip([*map(str, WAIT_BUCKETS), "+Inf"], metrics.wait_buckets):
+            count += bucket
+            histogram[bound] = count
+        attempts = metrics.checkouts + metrics.timeouts
+        return {
+            "pool": type(self).__name__,
+            "size": self.size() if queued else 0,
+            "in_use": metrics.in_use,
+            "idle": self.checkedin() if queued else 0,
+            "overflow": max(0, self.overflow()) if queued else 0,
+            "peak_in_use": metrics.peak_in_use,
+            "checkouts": metrics.checkouts,
+            "timeouts": metrics.timeouts,
+            "connections_opened": metrics.connections_opened,
+            "wait_seconds_total": round(metrics.wait_seconds, 6),
+            "wait_seconds_max": round(metrics.max_wait_seconds, 6),
+            "wait_seconds_avg": round(metrics.wait_seconds / attempts, 6) if attempts else 0.0,
+            "wait_seconds_histogram": histogram,
+        }
+
+
+class MeteredQueuePool(MeteredPool, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with metrics"""
+
+
+class MeteredNullPool(MeteredPool, NullPool):
+    """NullPool (a new connection per checkout) with metrics"""
@@ -0,0 +1,94 @@
+"""
+SIMBA Backend - Full-Text Search Index
+
+Native full-text indexes for conversation titles, messages and document
+text, so searches no longer scan every row with LIKE '%term%'.
+
+Each indexed item has a row in search_entries (kind, ref_id, owning user
+and conversation). Its text is indexed per dialect:
+
+- SQLite: an FTS5 table, search_fts, whose rowid is the search_entries ID.
+  A second FTS column, scope, holds "u<user> c<conversation>" tokens so
+  that a search restricted to a user or conversation intersects posting
+  lists inside FTS5 instead of ranking every match in the database.
+- PostgreSQL: a tsvector column of search_entries with a GIN index.
+
+Indexed columns are compressed and document text may live in the blob
+store, so the index can't be maintained by SQL triggers on the source
+tables: the repositories write the plain text to it in the same
+transaction as the source row (SearchRepository).
+"""
+
+import re
+from typing import List, Optional
+
+from sqlalchemy import Connection, text
+
+from app.utils.exceptions import ValidationError
+
+
+# Kinds of indexed items
+KINDS = ("message", "document", "conversation")
+
+# PostgreSQL text search configuration
+TS_CONFIG = "english"
+
+# Indexed prefix of long texts (PostgreSQL tsvectors are limited to 1 MB)
+MAX_BODY_CHARS = 200_000
+
+FTS_TABLE = "search_fts"
+
+SQLITE_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "body, scope, tokenize='porter unicode61 remove_diacritics 2')",
+)
+
+POSTGRESQL_DDL = (
+    "ALTER TABLE search_entries ADD COLUMN IF NOT EXISTS tsv tsvector NOT NULL DEFAULT ''::tsvector",
+    "CREATE INDEX IF NOT EXISTS idx_search_entry_tsv ON search_entries USING gin (tsv)",
+)
+
+
+def create_search_index(connection: Connection):
+    """
+    Create the dialect's text index next to search_entries.
+
+    Only for databases created with metadata.create_all(); migrated
+    databases get it from Alembic.
+    """
+    ddl = SQLITE_DDL if connection.dialect.name == "sqlite" else POSTGRESQL_DDL
+    for statement in ddl:
+        connection.execute(text(statement))
+
+
+def query_words(query: str) -> List[str]:
+    """
+    Words of a search query.
+
+    Raises:
+        ValidationError: Query without any word
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        raise ValidationError("Search query must contain at least one word", details={"query": query})
+    return words
+
+
+def scope_token(prefix: str, id: str) -> str:
+    """FTS5 token standing for a user ("u") or conversation ("c")"""
+    return prefix + id.replace("-", "")
+
+
+def fts_match(query: str, user_id: Optional[str] = None, conversation_id: Optional[str] = None) -> str:
+    """
+    FTS5 MATCH expression: every word of the query, in the given scope.
+
+    Words are quoted, so FTS5 operators typed by users are searched as text.
+    """
+    terms = " ".join(f'"{word}"' for word in query_words(query))
+    match = f"body : ({terms})"
+    if conversation_id:
+        match = f'scope : "{scope_token("c", conversation_id)}" AND {match}'
+    elif user_id:
+        match = f'scope : "{scope_token("u", user_id)}" AND {match}'
+    return match
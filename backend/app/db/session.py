@@ -4,15 +4,21 @@ SIMBA Backend - Database Session Management
 SQLAlchemy session factory and dependency injection.
 """
 
-from typing import Generator
-from sqlalchemy import create_engine
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Generator, Optional, TypeVar
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, Session
 
 from app.config import settings
+from app.db.pool import MeteredNullPool, MeteredQueuePool
+from app.db.sqlite import SQLiteSession, WriteQueue, set_sqlite_pragmas
 from app.utils.logger import logger
 
 
+T = TypeVar("T")
+
+
 # Create engine based on database URL
 if settings.DATABASE_URL.startswith("sqlite"):
     # SQLite (async)
@@ -20,32 +26,93 @@ if settings.DATABASE_URL.startswith("sqlite"):
         settings.DATABASE_URL,
         echo=settings.DEBUG,
         future=True,
+        # Keep connections (and their page caches) open: closing the last
+        # one checkpoints the WAL
+        poolclass=MeteredQueuePool,
+        pool_size=settings.SQLITE_POOL_SIZE,
     )
+    event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
 elif settings.DATABASE_URL.startswith("postgresql"):
     # PostgreSQL (async)
     # Convert sync URL to async (postgresql -> postgresql+asyncpg)
     async_url = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
+    if settings.DB_PGBOUNCER:
+        # PgBouncer pools server connections and hands them out per
+        # transaction: statements prepared on one can't be reused later
+        pool_options = {"poolclass": MeteredNullPool}
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    else:
+        pool_options = {
+            "poolclass": MeteredQueuePool,
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+        }
+        connect_args = {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
     engine = create_async_engine(
         async_url,
         echo=settings.DEBUG,
-        pool_pre_ping=True,  # Verify connections before using
-        pool_size=10,
-        max_overflow=20,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        connect_args=connect_args,
+        **pool_options,
     )
 else:
     raise ValueError(f"Unsupported database URL: {settings.DATABASE_URL}")
 
 
+# Single writer of a SQLite database (see app.db.sqlite)
+write_queue: Optional[WriteQueue] = None
+if engine.dialect.name == "sqlite":
+    write_queue = WriteQueue(
+        async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False),
+        batch_size=settings.SQLITE_WRITE_BATCH_SIZE,
+        batch_wait=settings.SQLITE_WRITE_BATCH_WAIT_MS / 1000,
+        timeout=settings.SQLITE_WRITE_TIMEOUT
+    )
+
+
 # Session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
-    class_=AsyncSession,
+    class_=SQLiteSession if write_queue else AsyncSession,
     expire_on_commit=False,
     autoflush=False,
     autocommit=False,
+    **({"write_queue": write_queue} if write_queue else {})
 )
 
 
+async def submit_write(job: Callable[[AsyncSession], Awaitable[T]]) -> T:
+    """
+    Run a short write in its own transaction.
+
+    On SQLite the job goes through the write queue and is committed
+    together with other queued jobs; elsewhere it gets a session of its own.
+
+    Args:
+        job: Async function of a session doing the writes (without committing)
+
+    Returns:
+        The job's result, once committed
+    """
+    if write_queue is not None:
+        return await write_queue.submit(job)
+    async with AsyncSessionLocal() as db:
+        result = await job(db)
+        await db.commit()
+        return result
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Connection pool metrics of this process (see app.db.pool)"""
+    return engine.sync_engine.pool.stats()
+
+
 # Dependency for FastAPI
 async def get_db() -> Generator[AsyncSession, None, None]:
     """
@@ -71,11 +138,13 @@ async def get_db() -> Generator[AsyncSession, None, None]:
 async def init_db():
     """Initialize database tables"""
     from app.db.base import Base
-    from app.db.models import User, Assistant, Conversation, Message, Tool, ToolProvider, Document
+    from app.db.models import User, Assistant, Conversation, Message, Tool, ToolProvider, Document, DocumentContent, IngestionJob, SearchEntry, UserStats
+    from app.db.search import create_search_index
 
     async with engine.begin() as conn:
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_search_index)
 
     logger.info("Database tables created successfully")
 
@@ -94,5 +163,7 @@ async def drop_db():
 # Close database connections
 async def close_db():
     """Close database connections"""
+    if write_queue is not None:
+        await write_queue.close()
     await engine.dispose()
     logger.info("Database connections closed")
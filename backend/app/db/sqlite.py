@@ -0,0 +1,373 @@
+"""
+SIMBA Backend - SQLite Profile
+
+Connection pragmas and write scheduling for deployments running on SQLite.
+
+SQLite has a single writer per database file. In WAL mode readers never
+block it (nor each other), so reads run concurrently on the pool's
+connections; writers, however, race for the file lock and the losers fail
+with "database is locked" once busy_timeout runs out. Within a process,
+writes are therefore handed to a WriteQueue, which runs them one at a time
+in arrival order:
+
+- a session (SQLiteSession) takes the writer slot before its first write
+  and holds it until its transaction ends; its transaction is opened with
+  BEGIN IMMEDIATE, so it never has to upgrade a read lock;
+- short, self-contained writes submitted with WriteQueue.submit() are run
+  back to back on the queue's own connection, each in a savepoint, and
+  committed together (group commit).
+
+Separate processes (several uvicorn workers) still contend for the file
+lock, which busy_timeout arbitrates.
+"""
+
+import asyncio
+import re
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.utils.logger import logger
+
+
+T = TypeVar("T")
+
+# Write job: runs in the given session, which it must not commit
+WriteJob = Callable[[AsyncSession], Awaitable[T]]
+
+# Raw SQL that writes (ORM/Core statements are recognized by is_dml)
+WRITE_SQL = re.compile(r"^\s*(insert|update|delete|replace)\b", re.IGNORECASE)
+
+
+def sqlite_pragmas() -> Dict[str, Union[str, int]]:
+    """Pragmas applied to every connection (from settings)"""
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+    }
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Engine "connect" listener applying sqlite_pragmas()"""
+    cursor = dbapi_connection.cursor()
+    for name, value in sqlite_pragmas().items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def is_write(statement) -> bool:
+    """Whether a statement passed to Session.execute() writes"""
+    if getattr(statement, "is_dml", False):
+        return True
+    return bool(WRITE_SQL.match(getattr(statement, "text", None) or ""))
+
+
+async def begin_immediate(session: AsyncSession):
+    """Open the session's SQLite transaction with the write lock taken up front"""
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    if not raw.driver_connection.in_transaction:
+        await connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+class _Job:
+    def __init__(self, job: WriteJob):
+        self.job = job
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.started = False
+
+
+class _Slot:
+    """Exclusive use of the writer, from grant to release"""
+
+    def __init__(self):
+        loop = asyncio.get_running_loop()
+        self.granted: asyncio.Future = loop.create_future()
+        self.released: asyncio.Future = loop.create_future()
+
+    def release(self):
+        if not self.granted.done():
+            # Given up while waiting: the writer skips it
+            self.granted.cancel()
+        if not self.released.done():
+            self.released.set_result(None)
+
+
+class WriteQueue:
+    """
+    Single writer for a SQLite database, shared by the sessions of a process.
+
+    Usage:
+        queue = WriteQueue(async_sessionmaker(engine))
+        job = await queue.submit(lambda db: IngestionJobRepository(db).update(job_id, progress=0.5))
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        batch_size: int = 200,
+        batch_wait: float = 0.0,
+        timeout: float = 30.0
+    ):
+        """
+        Initialize queue.
+
+        Args:
+            session_factory: Sessions of the queue's own connection
+            batch_size: Most submitted jobs committed together
+            batch_wait: Seconds to wait for more jobs before running a batch
+                (0: batch whatever queued up while the writer was busy)
+            timeout: Seconds a session (or a submitted job) waits for the writer
+        """
+        self._session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        self.timeout = timeout
+        self._pending: Deque[Union[_Job, _Slot]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Counters (GET /metrics/db)
+        self.sessions = 0
+        self.batches = 0
+        self.jobs = 0
+
+    async def submit(self, job: WriteJob) -> T:
+        """
+        Run a write job and commit it (possibly with other jobs).
+
+        Each job runs in a savepoint: if it raises, only its own changes are
+        rolled back and the exception is raised here.
+
+        Args:
+            job: Async function of a session doing the writes (without committing)
+
+        Returns:
+            The job's result, once committed
+
+        Raises:
+            TimeoutError: The writer stayed busy for longer than the timeout
+                (the job was not run)
+        """
+        item = _Job(job)
+        self._enqueue(item)
+        try:
+            return await asyncio.wait_for(asyncio.shield(item.future), self.timeout)
+        except asyncio.TimeoutError:
+            if item.started:
+                # Already running: jobs are short, wait for the outcome
+                return await item.future
+            item.future.cancel()
+            raise TimeoutError(f"SQLite writer busy for more than {self.timeout:g}s")
+        except BaseException:
+            if not item.started:
+                item.future.cancel()
+            raise
+
+    async def hold(self) -> _Slot:
+        """
+        Wait for exclusive use of the writer; release() the returned slot when done.
+
+        Raises:
+            TimeoutError: The writer stayed busy for longer than the timeout
+        """
+        slot = _Slot()
+        self._enqueue(slot)
+        try:
+            await asyncio.wait_for(asyncio.shield(slot.granted), self.timeout)
+        except asyncio.TimeoutError:
+            slot.release()
+            raise TimeoutError(f"SQLite writer busy for more than {self.timeout:g}s")
+        except BaseException:
+            slot.release()
+            raise
+        return slot
+
+    def stats(self) -> Dict[str, int]:
+        """Queue length and cumulative counters of the writer"""
+        return {
+            "queued_jobs": sum(isinstance(item, _Job) for item in self._pending),
+            "waiting_sessions": sum(isinstance(item, _Slot) for item in self._pending),
+            "sessions": self.sessions,
+            "batches": self.batches,
+            "jobs": self.jobs,
+        }
+
+    async def close(self):
+        """Stop the writer; jobs still queued fail"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        while self._pending:
+            item = self._pending.popleft()
+            if isinstance(item, _Job):
+                if not item.future.done():
+                    item.future.set_exception(RuntimeError("SQLite writer stopped"))
+            else:
+                item.release()
+
+    def _enqueue(self, item: Union[_Job, _Slot]):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            # First use (or a new event loop, e.g. in scripts)
+            self._loop = loop
+            self._pending = deque()
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        self._pending.append(item)
+        self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            item = self._pending.popleft()
+            if isinstance(item, _Slot):
+                if item.granted.cancelled():
+                    continue
+                item.granted.set_result(None)
+                self.sessions += 1
+                await item.released
+                continue
+
+            if self.batch_wait and not self._pending:
+                await asyncio.sleep(self.batch_wait)
+            batch = [item]
+            # Stop at a waiting session: it runs next, in order
+            while len(batch) < self.batch_size and self._pending and isinstance(self._pending[0], _Job):
+                batch.append(self._pending.popleft())
+            try:
+                await self._commit(batch)
+            except Exception as e:
+                logger.error(f"SQLite writer failed: {e}")
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+
+    async def _commit(self, batch: List[_Job]):
+        batch = [job for job in batch if not job.future.cancelled()]
+        if not batch:
+            return
+        for job in batch:
+            job.started = True
+
+        done: List[tuple] = []
+        async with self._session_factory() as db:
+            await begin_immediate(db)
+            for job in batch:
+                try:
+                    async with db.begin_nested():
+                        result = await job.job(db)
+                except Exception as e:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+                else:
+                    done.append((job, result))
+            await db.commit()
+
+        self.batches += 1
+        self.jobs += len(done)
+        for job, result in done:
+            if not job.future.done():
+                job.future.set_result(result)
+
+
+class SQLiteSession(AsyncSession):
+    """
+    AsyncSession whose writes go through a WriteQueue.
+
+    The writer slot is taken before the first write of a transaction (an
+    INSERT/UPDATE/DELETE, a flush of pending changes or a savepoint) and
+    released when the transaction ends. Keep transactions that write short:
+    commit before slow work such as LLM calls.
+    """
+
+    def __init__(self, *args: Any, write_queue: WriteQueue, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.write_queue = write_queue
+        self._writer: Optional[_Slot] = None
+
+    async def _take_writer(self):
+        if self._writer is not None:
+            return
+        self._writer = await self.write_queue.hold()
+        try:
+            await begin_immediate(self)
+        except BaseException:
+            self._release_writer()
+            raise
+
+    def _release_writer(self):
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+
+    def _has_changes(self) -> bool:
+        return bool(self.new or self.dirty or self.deleted)
+
+    async def execute(self, statement, *args, **kwargs):
+        if is_write(statement):
+            await self._take_writer()
+        return await super().execute(statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        if is_write(statement):
+            await self._take_writer()
+        return await super().scalars(statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        if is_write(statement):
+            await self._take_writer()
+        return await super().scalar(statement, *args, **kwargs)
+
+    async def flush(self, objects=None):
+        if self._has_changes():
+            await self._take_writer()
+        await super().flush(objects)
+
+    def begin_nested(self):
+        return _NestedTransaction(self, super().begin_nested())
+
+    async def commit(self):
+        try:
+            if self._has_changes():
+                await self._take_writer()
+            await super().commit()
+        finally:
+            self._release_writer()
+
+    async def rollback(self):
+        try:
+            await super().rollback()
+        finally:
+            self._release_writer()
+
+    async def close(self):
+        try:
+            await super().close()
+        finally:
+            self._release_writer()
+
+
+class _NestedTransaction:
+    """Savepoint of a SQLiteSession, taking the writer slot first"""
+
+    def __init__(self, session: SQLiteSession, transaction):
+        self.session = session
+        self.transaction = transaction
+
+    async def __aenter__(self):
+        await self.session._take_writer()
+        return await self.transaction.__aenter__()
+
+    async def __aexit__(self, *exc_info):
+        return await self.transaction.__aexit__(*exc_info)
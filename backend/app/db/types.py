@@ -0,0 +1,160 @@
+"""
+SIMBA Backend - Column Types
+
+Custom SQLAlchemy column types.
+
+CompressedText and CompressedJSON transparently compress large values:
+long assistant answers, RAG source excerpts and extracted document text
+dominate the database. Values of COLUMN_COMPRESSION_THRESHOLD_BYTES or more
+are compressed with COLUMN_COMPRESSION (zlib, or zstd when the zstandard
+package is installed) and stored as
+
+    "\\x1f" + codec + ":" + base64(compressed UTF-8)
+
+in the column's existing type, so no schema change is needed: plain values
+written before compression was enabled are read unchanged, and
+scripts/compress_columns.py compresses them in the background while the
+application runs. Compressed values can't be matched by SQL string
+functions (LIKE, length()).
+"""
+
+import base64
+import json
+import zlib
+from functools import lru_cache
+from typing import Any, Optional
+
+from sqlalchemy import JSON, Text
+from sqlalchemy.types import TypeDecorator
+
+from app.config import settings
+from app.utils.exceptions import DatabaseException
+from app.utils.logger import logger
+
+try:
+    import zstandard  # type: ignore
+except ImportError:  # Optional: zlib is used instead
+    zstandard = None
+
+
+# Prefix of compressed values (a control character no stored text starts with)
+MARKER = "\x1f"
+
+CODECS = ("zlib", "zstd")
+
+
+@lru_cache(maxsize=1)
+def active_codec() -> Optional[str]:
+    """Codec for new values (None if compression is disabled)"""
+    codec = settings.COLUMN_COMPRESSION
+    if codec == "none" or settings.COLUMN_COMPRESSION_THRESHOLD_BYTES <= 0:
+        return None
+    if codec == "zstd" and zstandard is None:
+        logger.warning("zstandard not installed, compressing columns with zlib")
+        return "zlib"
+    if codec not in CODECS:
+        raise ValueError(f"Unknown column compression: {codec}")
+    return codec
+
+
+def compress_value(text: str, codec: Optional[str] = None, force: bool = False) -> str:
+    """
+    Compress a string if it is large enough and compression pays off.
+
+    Args:
+        text: Value to store
+        codec: Codec (default: COLUMN_COMPRESSION)
+        force: Compress regardless of the size threshold
+
+    Returns:
+        Compressed representation, or the text unchanged
+    """
+    # A plain value starting with the marker would be misread: always compress it
+    force = force or text.startswith(MARKER)
+    data = text.encode("utf-8")
+    if not force and len(data) < settings.COLUMN_COMPRESSION_THRESHOLD_BYTES:
+        return text
+    codec = codec or active_codec() or ("zlib" if force else None)
+    if codec is None:
+        return text
+
+    if codec == "zstd":
+        packed = zstandard.ZstdCompressor(level=6).compress(data)
+    else:
+        packed = zlib.compress(data, 6)
+
+    compressed = f"{MARKER}{codec}:{base64.b64encode(packed).decode('ascii')}"
+    if not force and len(compressed) >= len(data):
+        return text
+    return compressed
+
+
+def compress_json(value: Any) -> Any:
+    """Stored form of a JSON document: a compressed string if large, else the document"""
+    # json.dumps escapes non-ASCII characters: its length is its size in bytes
+    serialized = json.dumps(value)
+    if len(serialized) < settings.COLUMN_COMPRESSION_THRESHOLD_BYTES:
+        return value
+    compressed = compress_value(serialized)
+    return compressed if is_compressed(compressed) else value
+
+
+def is_compressed(value: Any) -> bool:
+    """Whether a stored value is in compressed form"""
+    return isinstance(value, str) and value.startswith(MARKER)
+
+
+def decompress_value(value: str) -> str:
+    """Inverse of compress_value() (plain values are returned unchanged)"""
+    if not is_compressed(value):
+        return value
+
+    codec, _, payload = value[1:].partition(":")
+    packed = base64.b64decode(payload)
+    if codec == "zstd":
+        if zstandard is None:
+            raise DatabaseException("zstandard is required to read zstd-compressed values")
+        data = zstandard.ZstdDecompressor().decompress(packed)
+    elif codec == "zlib":
+        data = zlib.decompress(packed)
+    else:
+        raise DatabaseException(f"Unknown compression codec in stored value: {codec}")
+    return data.decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    """Text column compressing large values"""
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return compress_value(value)
+
+    def process_result_value(self, value: Optional[str], dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return decompress_value(value)
+
+    def coerce_compared_value(self, op, value):
+        # Comparison operands (LIKE patterns, equality) are bound as plain text
+        return Text()
+
+
+class CompressedJSON(TypeDecorator):
+    """JSON column compressing large documents (stored as a JSON string)"""
+
+    impl = JSON
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Any:
+        if value is None:
+            return None
+        return compress_json(value)
+
+    def process_result_value(self, value: Any, dialect) -> Any:
+        if is_compressed(value):
+            return json.loads(decompress_value(value))
+        return value
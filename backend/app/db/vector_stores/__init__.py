@@ -0,0 +1,77 @@
+"""
+SIMBA Backend - Vector Stores
+
+Pluggable vector storage backends, selected with VECTOR_STORE_BACKEND:
+
+- chroma_http:     ChromaDB server over HTTP (default)
+- chroma_embedded: ChromaDB in-process (PersistentClient on CHROMA_PERSIST_DIRECTORY)
+- flat:            Native exact-search index over memory-mapped float32 files
+"""
+
+from typing import Optional
+
+from app.config import settings
+from app.db.vector_stores.base import VectorStore, VectorHit, VectorRecord, matches_where
+from app.db.vector_stores.async_store import AsyncVectorStore
+from app.utils.exceptions import ConfigurationError
+
+
+# Global instances
+_vector_store: Optional[VectorStore] = None
+_async_vector_store: Optional[AsyncVectorStore] = None
+
+
+def create_vector_store(backend: str) -> VectorStore:
+    """Build a vector store for the given backend name"""
+    if backend == "chroma_http":
+        from app.db.chroma_client import get_chroma_client
+        from app.db.vector_stores.chroma import ChromaVectorStore
+        return ChromaVectorStore(get_chroma_client())
+
+    if backend == "chroma_embedded":
+        from app.db.chroma_client import ChromaDBClient
+        from app.db.vector_stores.chroma import ChromaVectorStore
+        return ChromaVectorStore(ChromaDBClient(persistent=True))
+
+    if backend == "flat":
+        from app.db.vector_stores.flat import FlatVectorStore
+        return FlatVectorStore(settings.VECTOR_STORE_DIRECTORY)
+
+    raise ConfigurationError(f"Unknown vector store backend: {backend}")
+
+
+def get_vector_store() -> VectorStore:
+    """Get or create the configured global vector store"""
+    global _vector_store
+
+    if _vector_store is None:
+        _vector_store = create_vector_store(settings.VECTOR_STORE_BACKEND)
+
+    return _vector_store
+
+
+def get_async_vector_store() -> AsyncVectorStore:
+    """Get or create the non-blocking facade over the global vector store"""
+    global _async_vector_store
+
+    if _async_vector_store is None:
+        _async_vector_store = AsyncVectorStore(
+            get_vector_store(),
+            max_concurrency=settings.VECTOR_STORE_MAX_CONCURRENCY,
+            timeout=settings.VECTOR_STORE_TIMEOUT,
+            write_timeout=settings.VECTOR_STORE_WRITE_TIMEOUT
+        )
+
+    return _async_vector_store
+
+
+__all__ = [
+    "VectorStore",
+    "VectorHit",
+    "VectorRecord",
+    "matches_where",
+    "AsyncVectorStore",
+    "create_vector_store",
+    "get_vector_store",
+    "get_async_vector_store",
+]
@@ -0,0 +1,174 @@
+"""
+SIMBA Backend - Async Vector Store
+
+Non-blocking access to a (synchronous) VectorStore backend.
+
+Calls run on a dedicated thread pool, bounded by a per-backend concurrency
+cap and a timeout, so a slow vector store only delays the requests that
+actually wait on it and never stalls the event loop.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from app.db.vector_stores.base import VectorStore, VectorHit, VectorRecord
+from app.utils.exceptions import VectorStoreUnavailableError
+
+T = TypeVar("T")
+
+
+class AsyncVectorStore:
+    """
+    Async facade over a VectorStore.
+
+    At most `max_concurrency` backend calls are in flight at once; a call
+    holds its slot until the backend actually returns, even if the caller
+    already gave up on it, so timeouts can never oversubscribe the backend.
+    Waiting for a slot counts against the timeout. Writes get their own,
+    longer timeout: a large indexing batch, or one queued behind searches,
+    would otherwise time out (and be retried) while still being applied.
+    """
+
+    def __init__(
+        self,
+        store: VectorStore,
+        max_concurrency: int = 8,
+        timeout: float = 10.0,
+        write_timeout: float = 120.0
+    ):
+        self.store = store
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.write_timeout = write_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix=f"vectorstore-{store.name}"
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def name(self) -> str:
+        return self.store.name
+
+    @property
+    def healthy(self) -> bool:
+        return self.store.healthy
+
+    async def start(self) -> None:
+        await self.store.start()
+
+    async def stop(self) -> None:
+        await self.store.stop()
+
+    async def _call(self, fn: Callable[..., T], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> T:
+        """Run a backend call off the event loop with concurrency cap and timeout"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        timeout = self.timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            raise VectorStoreUnavailableError(
+                f"Vector store '{self.name}' is saturated ({self.max_concurrency} calls in flight)"
+            )
+
+        try:
+            future = loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._semaphore.release()
+            raise
+        future.add_done_callback(lambda _: self._semaphore.release())
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            raise VectorStoreUnavailableError(
+                f"Vector store '{self.name}' call {fn.__name__} timed out after {timeout:.1f}s"
+            )
+
+    async def add(
+        self,
+        collection: str,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        await self._call(
+            self.store.add, collection, ids, embeddings, documents, metadatas,
+            timeout=self.write_timeout
+        )
+
+    async def upsert(
+        self,
+        collection: str,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        await self._call(
+            self.store.upsert, collection, ids, embeddings, documents, metadatas,
+            timeout=self.write_timeout
+        )
+
+    async def update_metadata(
+        self,
+        collection: str,
+        ids: List[str],
+        metadatas: List[Dict[str, Any]]
+    ) -> None:
+        await self._call(self.store.update_metadata, collection, ids, metadatas, timeout=self.write_timeout)
+
+    async def query(
+        self,
+        collection: str,
+        embedding: List[float],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[VectorHit]:
+        return await self._call(self.store.query, collection, embedding, n_results, where)
+
+    async def get(
+        self,
+        collection: str,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[VectorRecord]:
+        return await self._call(
+            self.store.get, collection,
+            ids=ids, where=where, include_embeddings=include_embeddings,
+            limit=limit, offset=offset
+        )
+
+    async def delete(
+        self,
+        collection: str,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None
+    ) -> None:
+        await self._call(self.store.delete, collection, ids=ids, where=where, timeout=self.write_timeout)
+
+    async def count(self, collection: str) -> int:
+        return await self._call(self.store.count, collection)
+
+    async def list_collections(self) -> List[str]:
+        return await self._call(self.store.list_collections)
+
+    async def drop_collection(self, collection: str) -> None:
+        await self._call(self.store.drop_collection, collection, timeout=self.write_timeout)
+
+    async def healthcheck(self) -> bool:
+        try:
+            return await self._call(self.store.healthcheck)
+        except VectorStoreUnavailableError:
+            return False
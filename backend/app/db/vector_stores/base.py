@@ -0,0 +1,185 @@
+"""
+SIMBA Backend - Vector Store Base
+
+Backend-agnostic interface for vector storage and similarity search.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional
+
+
+@dataclass
+class VectorHit:
+    """Single similarity search result"""
+    id: str
+    document: str
+    metadata: Dict[str, Any]
+    distance: float  # Cosine distance (0 = identical)
+
+    @property
+    def score(self) -> float:
+        """Similarity score clamped to 0-1"""
+        return max(0.0, min(1.0, 1.0 - self.distance))
+
+
+@dataclass
+class VectorRecord:
+    """Stored vector with its payload"""
+    id: str
+    document: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    embedding: Optional[List[float]] = None
+
+
+class VectorStore(ABC):
+    """
+    Abstract vector store.
+
+    All backends share Chroma's semantics: collections are created on
+    first write, reads from a missing collection return nothing, adding
+    an existing ID is ignored (use upsert to overwrite), and `where`
+    filters use the Chroma metadata filter syntax.
+    """
+
+    name: str = "vector_store"
+
+    @abstractmethod
+    def add(
+        self,
+        collection: str,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """Add vectors; IDs that already exist are left untouched"""
+
+    @abstractmethod
+    def upsert(
+        self,
+        collection: str,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """Add vectors, overwriting any existing IDs"""
+
+    @abstractmethod
+    def update_metadata(
+        self,
+        collection: str,
+        ids: List[str],
+        metadatas: List[Dict[str, Any]]
+    ) -> None:
+        """Replace the metadata of existing vectors (embeddings untouched)"""
+
+    @abstractmethod
+    def query(
+        self,
+        collection: str,
+        embedding: List[float],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[VectorHit]:
+        """Nearest neighbours of an embedding, closest first"""
+
+    @abstractmethod
+    def get(
+        self,
+        collection: str,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[VectorRecord]:
+        """Fetch stored records by ID and/or metadata filter"""
+
+    @abstractmethod
+    def delete(
+        self,
+        collection: str,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Delete records by ID and/or metadata filter"""
+
+    @abstractmethod
+    def count(self, collection: str) -> int:
+        """Number of records in a collection (0 if missing)"""
+
+    @abstractmethod
+    def list_collections(self) -> List[str]:
+        """Names of all collections"""
+
+    @abstractmethod
+    def drop_collection(self, collection: str) -> None:
+        """Delete a whole collection (no-op if missing)"""
+
+    def healthcheck(self) -> bool:
+        """Check if the backend is usable"""
+        return True
+
+    @property
+    def healthy(self) -> bool:
+        """Last known health state (never blocks)"""
+        return True
+
+    async def start(self) -> None:
+        """Start background tasks (called on application startup)"""
+
+    async def stop(self) -> None:
+        """Stop background tasks (called on application shutdown)"""
+
+
+def matches_where(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """
+    Evaluate a Chroma-style metadata filter against a metadata dict.
+
+    Supports field equality, $eq, $ne, $gt, $gte, $lt, $lte, $in, $nin,
+    and the $and / $or combinators.
+    """
+    if not where:
+        return True
+
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for op, operand in condition.items():
+                if not _compare(value, op, operand):
+                    return False
+        elif metadata.get(key) != condition:
+            return False
+
+    return True
+
+
+def _compare(value: Any, op: str, operand: Any) -> bool:
+    """Apply a single filter operator"""
+    if op == "$eq":
+        return value == operand
+    if op == "$ne":
+        return value != operand
+    if op == "$in":
+        return value in operand
+    if op == "$nin":
+        return value not in operand
+    if value is None:
+        return False
+    if op == "$gt":
+        return value > operand
+    if op == "$gte":
+        return value >= operand
+    if op == "$lt":
+        return value < operand
+    if op == "$lte":
+        return value <= operand
+    raise ValueError(f"Unsupported filter operator: {op}")
@@ -0,0 +1,227 @@
+"""
+SIMBA Backend - Chroma Vector Store
+
+VectorStore backend on top of ChromaDB, either over HTTP or embedded
+in-process with a PersistentClient.
+"""
+
+from typing import Callable, List, Dict, Any, Optional, TypeVar
+
+from app.db.chroma_client import ChromaDBClient
+from app.db.vector_stores.base import VectorStore, VectorHit, VectorRecord
+from app.utils.logger import logger
+
+
+T = TypeVar("T")
+
+# Collections use cosine distance so that score = 1 - distance
+COLLECTION_METADATA = {
+    "description": "SIMBA document embeddings",
+    "hnsw:space": "cosine",
+}
+
+
+def _is_stale_handle_error(error: Exception) -> bool:
+    """Whether an error means the collection behind a handle no longer exists"""
+    # InvalidCollectionException when embedded; the HTTP client re-raises
+    # the server's message
+    return type(error).__name__ == "InvalidCollectionException" or "does not exist" in str(error)
+
+
+class ChromaVectorStore(VectorStore):
+    """Vector store backed by a ChromaDB client"""
+
+    name = "chromadb"
+
+    def __init__(self, client: ChromaDBClient):
+        self.chroma = client
+
+    def _get(self, collection: str):
+        """Get an existing collection, or None if it does not exist"""
+        try:
+            return self.chroma.get_collection(collection)
+        except OSError:
+            raise
+        except Exception as e:
+            # Missing collections surface as ValueError (embedded) or a
+            # generic error carrying the server message (HTTP)
+            if isinstance(e, ValueError) or "does not exist" in str(e):
+                return None
+            raise
+
+    def _get_or_create(self, collection: str):
+        return self.chroma.get_or_create_collection(collection, metadata=COLLECTION_METADATA)
+
+    def _run(self, collection: str, operation: Callable[[Any], T], create: bool = False, default: T = None) -> T:
+        """
+        Run an operation against a cached collection handle.
+
+        A stale handle (collection dropped or recreated elsewhere) is
+        invalidated and the operation retried once with a fresh one;
+        connectivity errors mark the client unhealthy so later calls
+        fail fast. Other errors (invalid arguments, duplicate IDs) are
+        raised as is: the operation may have been applied, and add is
+        not idempotent.
+        """
+        for attempt in range(2):
+            handle = self._get_or_create(collection) if create else self._get(collection)
+            if handle is None:
+                return default
+            try:
+                result = operation(handle)
+                self.chroma.mark_healthy()
+                return result
+            except OSError as e:
+                self.chroma.mark_unhealthy(e)
+                raise
+            except Exception as e:
+                if not _is_stale_handle_error(e):
+                    raise
+                self.chroma.invalidate(collection)
+                if attempt:
+                    raise
+        return default
+
+    def add(
+        self,
+        collection: str,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        if not ids:
+            return
+        self._run(collection, lambda handle: handle.add(
+            ids=ids,
+            embeddings=embeddings,
+            documents=documents,
+            metadatas=metadatas
+        ), create=True)
+
+    def upsert(
+        self,
+        collection: str,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        if not ids:
+            return
+        self._run(collection, lambda handle: handle.upsert(
+            ids=ids,
+            embeddings=embeddings,
+            documents=documents,
+            metadatas=metadatas
+        ), create=True)
+
+    def update_metadata(
+        self,
+        collection: str,
+        ids: List[str],
+        metadatas: List[Dict[str, Any]]
+    ) -> None:
+        if not ids:
+            return
+        self._run(collection, lambda handle: handle.update(ids=ids, metadatas=metadatas))
+
+    def query(
+        self,
+        collection: str,
+        embedding: List[float],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[VectorHit]:
+        results = self._run(collection, lambda handle: handle.query(
+            query_embeddings=[embedding],
+            n_results=n_results,
+            where=where or None,
+            include=["documents", "metadatas", "distances"]
+        ))
+
+        if not results or not results["ids"]:
+            return []
+
+        return [
+            VectorHit(
+                id=vector_id,
+                document=results["documents"][0][i] or "",
+                metadata=results["metadatas"][0][i] or {},
+                distance=results["distances"][0][i],
+            )
+            for i, vector_id in enumerate(results["ids"][0])
+        ]
+
+    def get(
+        self,
+        collection: str,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[VectorRecord]:
+        include = ["documents", "metadatas"]
+        if include_embeddings:
+            include.append("embeddings")
+
+        results = self._run(collection, lambda handle: handle.get(
+            ids=ids,
+            where=where or None,
+            limit=limit,
+            offset=offset or None,
+            include=include
+        ))
+        if results is None:
+            return []
+
+        return [
+            VectorRecord(
+                id=vector_id,
+                document=results["documents"][i] or "",
+                metadata=results["metadatas"][i] or {},
+                embedding=list(results["embeddings"][i]) if include_embeddings else None,
+            )
+            for i, vector_id in enumerate(results["ids"])
+        ]
+
+    def delete(
+        self,
+        collection: str,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None
+    ) -> None:
+        if not ids and not where:
+            return
+        self._run(collection, lambda handle: handle.delete(ids=ids, where=where or None))
+
+    def count(self, collection: str) -> int:
+        return self._run(collection, lambda handle: handle.count(), default=0)
+
+    def list_collections(self) -> List[str]:
+        return self.chroma.list_collections()
+
+    def drop_collection(self, collection: str) -> None:
+        try:
+            self.chroma.delete_collection(collection)
+            logger.info(f"Dropped Chroma collection '{collection}'")
+        except OSError:
+            raise
+        except Exception as e:
+            if not isinstance(e, ValueError) and "does not exist" not in str(e):
+                raise
+
+    def healthcheck(self) -> bool:
+        return self.chroma.healthcheck()
+
+    @property
+    def healthy(self) -> bool:
+        return self.chroma.healthy
+
+    async def start(self) -> None:
+        if not self.chroma.persistent:
+            self.chroma.start_health_monitor()
+
+    async def stop(self) -> None:
+        await self.chroma.stop_health_monitor()
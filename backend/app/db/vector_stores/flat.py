@@ -0,0 +1,418 @@
+"""
+SIMBA Backend - Flat Vector Store
+
+Embedded, dependency-free vector store: exact (brute-force) cosine search
+over memory-mapped float32 files. Suited to single-node deployments and
+tests, where per-conversation collections are small enough that an exact
+scan beats maintaining an ANN graph.
+
+On-disk layout, one directory per collection:
+    vectors.f32    - append-only float32 rows, L2-normalized
+    records.jsonl  - append-only log of adds and deletes
+    .lock          - serializes writes across processes
+
+Several processes may share a directory (the API and an external
+ingestion worker): writes hold the collection's file lock, and each
+process reloads a collection when its log changed on disk.
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from app.db.vector_stores.base import VectorStore, VectorHit, VectorRecord, matches_where
+from app.utils.helpers import file_lock, file_signature
+from app.utils.logger import logger
+
+
+class _FlatCollection:
+    """In-memory view of one on-disk collection"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.vectors_path = path / "vectors.f32"
+        self.log_path = path / "records.jsonl"
+        self.lock_path = path / ".lock"
+        self.signature = None  # Log file signature when last read or written
+        self._reset()
+        self.refresh()
+
+    def _reset(self):
+        self.dim: Optional[int] = None
+        self.ids: List[Optional[str]] = []  # row -> id (None = deleted)
+        self.documents: List[Optional[str]] = []
+        self.metadatas: List[Optional[Dict[str, Any]]] = []
+        self.rows: Dict[str, int] = {}  # id -> row
+        self._matrix: Optional[np.ndarray] = None
+
+    def refresh(self):
+        """Reload if the files changed on disk since they were read (another process wrote)"""
+        if self.signature is not None and file_signature(self.log_path) == self.signature:
+            return
+        with file_lock(self.lock_path):
+            self._reload_if_changed()
+
+    def _reload_if_changed(self):
+        # Caller holds the file lock
+        signature = file_signature(self.log_path)
+        if signature == self.signature and signature is not None:
+            return
+        self._reset()
+        self._load()
+        self.signature = file_signature(self.log_path)
+
+    def _load(self):
+        if not self.log_path.exists():
+            return
+
+        with open(self.log_path, "r", encoding="utf-8") as log:
+            for line in log:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["op"] == "add":
+                    self.dim = entry.get("dim", self.dim)
+                    self._append_row(entry["id"], entry["document"], entry["metadata"])
+                elif entry["op"] == "del":
+                    self._tombstone(entry["id"])
+
+        # Vectors are written before the log, so an interrupted write can
+        # leave trailing vectors with no record; cut them off (safe: the
+        # file lock keeps other writers out)
+        if self.dim and self.vectors_path.exists():
+            expected = len(self.ids) * self.dim * 4
+            if self.vectors_path.stat().st_size > expected:
+                with open(self.vectors_path, "r+b") as vec_file:
+                    vec_file.truncate(expected)
+
+    def _append_row(self, vector_id: str, document: str, metadata: Dict[str, Any]):
+        self._tombstone(vector_id)
+        self.rows[vector_id] = len(self.ids)
+        self.ids.append(vector_id)
+        self.documents.append(document)
+        self.metadatas.append(metadata)
+
+    def _tombstone(self, vector_id: Optional[str]):
+        row = self.rows.pop(vector_id, None) if vector_id is not None else None
+        if row is not None:
+            self.ids[row] = None
+            self.documents[row] = None
+            self.metadatas[row] = None
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Memory-mapped (rows, dim) float32 matrix"""
+        if self._matrix is None:
+            if not self.dim or not self.vectors_path.exists() or not self.ids:
+                return np.empty((0, self.dim or 0), dtype=np.float32)
+            self._matrix = np.memmap(
+                self.vectors_path, dtype=np.float32, mode="r",
+                shape=(len(self.ids), self.dim)
+            )
+        return self._matrix
+
+    def write(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]]
+    ):
+        """Append rows (replacing any existing IDs)"""
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2:
+            raise ValueError("Embeddings must be a 2D array")
+
+        with file_lock(self.lock_path):
+            self._reload_if_changed()
+            self._write(ids, vectors, documents, metadatas)
+            self.signature = file_signature(self.log_path)
+
+    def _write(
+        self,
+        ids: List[str],
+        vectors: np.ndarray,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]]
+    ):
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(
+                f"Embedding dimension {vectors.shape[1]} does not match collection dimension {self.dim}"
+            )
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._matrix = None  # Re-map after the file grows
+
+        with open(self.vectors_path, "ab") as vec_file:
+            vec_file.write(vectors.astype(np.float32).tobytes())
+
+        with open(self.log_path, "a", encoding="utf-8") as log:
+            for vector_id, document, metadata in zip(ids, documents, metadatas):
+                log.write(json.dumps({
+                    "op": "add", "id": vector_id, "dim": self.dim,
+                    "document": document, "metadata": metadata,
+                }) + "\n")
+                self._append_row(vector_id, document, metadata)
+
+    def remove(self, ids: List[str]):
+        """Tombstone rows and compact when tombstones dominate"""
+        with file_lock(self.lock_path):
+            self._reload_if_changed()
+            ids = [vector_id for vector_id in ids if vector_id in self.rows]
+            if not ids:
+                return
+
+            with open(self.log_path, "a", encoding="utf-8") as log:
+                for vector_id in ids:
+                    log.write(json.dumps({"op": "del", "id": vector_id}) + "\n")
+                    self._tombstone(vector_id)
+
+            if len(self.ids) - len(self.rows) > max(256, len(self.rows)):
+                self._compact()
+            self.signature = file_signature(self.log_path)
+
+    def _compact(self):
+        # Rewrite files without tombstoned rows (caller holds the file lock)
+        live = [row for row, vector_id in enumerate(self.ids) if vector_id is not None]
+        vectors = np.array(self.matrix[live]) if live else np.empty((0, self.dim or 0), np.float32)
+        entries = [(self.ids[r], self.documents[r], self.metadatas[r]) for r in live]
+
+        self._matrix = None
+        tmp_vectors = self.vectors_path.with_suffix(".tmp")
+        tmp_log = self.log_path.with_suffix(".tmp")
+        tmp_vectors.write_bytes(vectors.astype(np.float32).tobytes())
+        with open(tmp_log, "w", encoding="utf-8") as log:
+            for vector_id, document, metadata in entries:
+                log.write(json.dumps({
+                    "op": "add", "id": vector_id, "dim": self.dim,
+                    "document": document, "metadata": metadata,
+                }) + "\n")
+        os.replace(tmp_vectors, self.vectors_path)
+        os.replace(tmp_log, self.log_path)
+
+        self.ids, self.documents, self.metadatas, self.rows = [], [], [], {}
+        for vector_id, document, metadata in entries:
+            self._append_row(vector_id, document, metadata)
+
+    def live_rows(self, where: Optional[Dict[str, Any]] = None) -> List[int]:
+        """Rows that are not deleted and match the filter"""
+        if not where:
+            return sorted(self.rows.values())
+        return [
+            row for row in sorted(self.rows.values())
+            if matches_where(self.metadatas[row], where)
+        ]
+
+
+class FlatVectorStore(VectorStore):
+    """Exact cosine-similarity vector store over memory-mapped files"""
+
+    name = "flat"
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._collections: Dict[str, _FlatCollection] = {}
+        self._lock = threading.RLock()
+        logger.info(f"Flat vector store initialized: {self.directory}")
+
+    def _path(self, collection: str) -> Path:
+        if not re.fullmatch(r"[A-Za-z0-9_.-]+", collection):
+            raise ValueError(f"Invalid collection name: {collection}")
+        return self.directory / collection
+
+    def _collection(self, collection: str, create: bool = False) -> Optional[_FlatCollection]:
+        handle = self._collections.get(collection)
+        if handle is not None and not handle.path.exists():
+            # Dropped by another process
+            del self._collections[collection]
+            handle = None
+        if handle is None:
+            path = self._path(collection)
+            if not create and not path.exists():
+                return None
+            handle = _FlatCollection(path)
+            self._collections[collection] = handle
+        else:
+            handle.refresh()
+        return handle
+
+    def add(
+        self,
+        collection: str,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        if not ids:
+            return
+        metadatas = metadatas or [{} for _ in ids]
+        with self._lock:
+            handle = self._collection(collection, create=True)
+            new = [i for i, vector_id in enumerate(ids) if vector_id not in handle.rows]
+            if len(new) < len(ids):
+                logger.warning(f"Skipping {len(ids) - len(new)} existing IDs in '{collection}'")
+            if new:
+                handle.write(
+                    [ids[i] for i in new],
+                    [embeddings[i] for i in new],
+                    [documents[i] for i in new],
+                    [metadatas[i] for i in new]
+                )
+
+    def upsert(
+        self,
+        collection: str,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        if not ids:
+            return
+        with self._lock:
+            self._collection(collection, create=True).write(
+                ids, embeddings, documents, metadatas or [{} for _ in ids]
+            )
+
+    def update_metadata(
+        self,
+        collection: str,
+        ids: List[str],
+        metadatas: List[Dict[str, Any]]
+    ) -> None:
+        if not ids:
+            return
+        with self._lock:
+            handle = self._collection(collection)
+            if handle is None:
+                return
+            existing = [(i, handle.rows[vector_id]) for i, vector_id in enumerate(ids) if vector_id in handle.rows]
+            if not existing:
+                return
+            # Rows are append-only: re-append the same vectors with new metadata
+            handle.write(
+                [ids[i] for i, _ in existing],
+                np.array(handle.matrix[[row for _, row in existing]]),
+                [handle.documents[row] for _, row in existing],
+                [metadatas[i] for i, _ in existing]
+            )
+
+    def query(
+        self,
+        collection: str,
+        embedding: List[float],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[VectorHit]:
+        with self._lock:
+            handle = self._collection(collection)
+            if handle is None or not handle.rows:
+                return []
+
+            rows = np.asarray(handle.live_rows(where), dtype=np.int64)
+            if rows.size == 0:
+                return []
+
+            query = np.asarray(embedding, dtype=np.float32)
+            norm = np.linalg.norm(query)
+            if norm > 0:
+                query = query / norm
+
+            similarities = handle.matrix[rows] @ query
+            k = min(n_results, rows.size)
+            top = np.argpartition(-similarities, k - 1)[:k]
+            top = top[np.argsort(-similarities[top])]
+
+            return [
+                VectorHit(
+                    id=handle.ids[rows[i]],
+                    document=handle.documents[rows[i]],
+                    metadata=dict(handle.metadatas[rows[i]]),
+                    distance=float(1.0 - similarities[i]),
+                )
+                for i in top
+            ]
+
+    def get(
+        self,
+        collection: str,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[VectorRecord]:
+        with self._lock:
+            handle = self._collection(collection)
+            if handle is None:
+                return []
+
+            if ids is not None:
+                rows = [handle.rows[i] for i in ids if i in handle.rows]
+                if where:
+                    rows = [r for r in rows if matches_where(handle.metadatas[r], where)]
+            else:
+                rows = handle.live_rows(where)
+
+            rows = rows[offset:offset + limit if limit is not None else None]
+            matrix = handle.matrix if include_embeddings else None
+
+            return [
+                VectorRecord(
+                    id=handle.ids[row],
+                    document=handle.documents[row],
+                    metadata=dict(handle.metadatas[row]),
+                    embedding=matrix[row].tolist() if matrix is not None else None,
+                )
+                for row in rows
+            ]
+
+    def delete(
+        self,
+        collection: str,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None
+    ) -> None:
+        if not ids and not where:
+            return
+        with self._lock:
+            handle = self._collection(collection)
+            if handle is None:
+                return
+            targets = [r.id for r in self.get(collection, ids=ids, where=where)]
+            handle.remove(targets)
+
+    def count(self, collection: str) -> int:
+        with self._lock:
+            handle = self._collection(collection)
+            return len(handle.rows) if handle is not None else 0
+
+    def list_collections(self) -> List[str]:
+        if not self.directory.exists():
+            return []
+        return sorted(p.name for p in self.directory.iterdir() if p.is_dir())
+
+    def drop_collection(self, collection: str) -> None:
+        with self._lock:
+            self._collections.pop(collection, None)
+            shutil.rmtree(self._path(collection), ignore_errors=True)
+
+    def healthcheck(self) -> bool:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            return os.access(self.directory, os.W_OK)
+        except OSError as e:
+            logger.error(f"Flat vector store healthcheck failed: {e}")
+            return False
@@ -4,10 +4,16 @@ SIMBA Backend - FastAPI Application
 Main FastAPI application with routes and middleware.
 """
 
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.api.routes import chat, rag, documents
+from app.db.session import close_db, pool_stats, write_queue
+from app.db.vector_stores import get_vector_store
+from app.services.file_processing import shutdown_extraction_pool
+from app.services.ingestion import get_ingestion_worker
 from app.utils.logger import logger
 
 
@@ -39,12 +45,24 @@ async def startup_event():
     logger.info(f"Starting {settings.APP_NAME}")
     logger.info(f"Environment: {'Development' if settings.DEBUG else 'Production'}")
     logger.info(f"Database: {settings.DATABASE_URL.split('://')[0]}")
+    logger.info(f"Vector store: {settings.VECTOR_STORE_BACKEND}")
+
+    # Connections are opened lazily; this only starts background health checks
+    await get_vector_store().start()
+
+    # Background ingestion runs here unless a separate worker process handles it
+    if settings.INGESTION_WORKER_MODE == "inprocess":
+        await get_ingestion_worker().start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown event"""
     logger.info(f"Shutting down {settings.APP_NAME}")
+    await get_ingestion_worker().stop()
+    shutdown_extraction_pool()
+    await get_vector_store().stop()
+    await close_db()
 
 
 @app.get("/")
@@ -60,4 +78,26 @@ async def root():
 @app.get("/health")
 async def health():
     """Health check endpoint"""
-    return {"status": "healthy"}
+    vector_store_ok = get_vector_store().healthy
+    return {
+        "status": "healthy" if vector_store_ok else "degraded",
+        "vector_store": "healthy" if vector_store_ok else "unavailable",
+    }
+
+
+@app.get("/metrics/db")
+async def database_metrics():
+    """
+    Database connection pool metrics of the worker process that answers.
+
+    Counters are cumulative since the process started; each worker
+    process has its own pool.
+    """
+    metrics = {
+        "pid": os.getpid(),
+        "dialect": settings.DATABASE_URL.split("://")[0],
+        "pool": pool_stats(),
+    }
+    if write_queue is not None:
+        metrics["sqlite_writer"] = write_queue.stats()
+    return metrics
@@ -5,7 +5,7 @@ Pydantic models for Conversation entity.
 """
 
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
 
 
@@ -40,7 +40,9 @@ class Conversation(ConversationBase):
     created_at: datetime
     updated_at: datetime
     conv_metadata: Dict[str, Any] = Field(default_factory=dict)
-    message_count: int = 0  # Computed field
+    message_count: int = 0
+    document_count: int = 0
+    last_message_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -62,15 +64,26 @@ class ConversationListItem(BaseModel):
     assistant_name: str
     updated_at: datetime
     message_count: int
+    last_message_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
 
+# Conversation page (keyset pagination)
+class ConversationPage(BaseModel):
+    """Page of conversations, most recently updated first"""
+    items: List[ConversationListItem]
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to get the next page
+    has_more: bool = False
+
+
 # Conversation statistics
 class ConversationStats(BaseModel):
     """Conversation statistics"""
     total_conversations: int
     total_messages: int
+    total_documents: int = 0
+    total_document_bytes: int = 0
     most_used_assistant: Optional[str] = None
     total_tokens: int = 0
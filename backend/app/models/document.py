@@ -37,7 +37,7 @@ class Document(DocumentBase):
     id: str
     conversation_id: str
     size_bytes: int
-    content: str  # Extracted text
+    content: Optional[str] = None  # Extracted text (None until extraction finishes)
     doc_metadata: Dict[str, Any] = Field(default_factory=dict)
     vector_ids: List[str] = Field(default_factory=list)  # ChromaDB IDs
     uploaded_at: datetime
@@ -60,6 +60,14 @@ class DocumentListItem(BaseModel):
         from_attributes = True
 
 
+# Document page (keyset pagination)
+class DocumentPage(BaseModel):
+    """Page of documents, newest first"""
+    items: List[DocumentListItem]
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to get the next page
+    has_more: bool = False
+
+
 # Document upload response
 class DocumentUploadResponse(BaseModel):
     """Response after uploading document"""
@@ -0,0 +1,34 @@
+"""
+SIMBA Backend - Ingestion Job Models
+
+Pydantic models for IngestionJob entity (background document processing).
+"""
+
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+# Ingestion job response
+class IngestionJob(BaseModel):
+    """Ingestion job status schema"""
+    id: str
+    document_id: str
+    conversation_id: str
+    status: str  # queued, running, completed, failed
+    stage: str  # extract, index, done
+    progress: float = Field(default=0.0, ge=0.0, le=1.0)
+    message: Optional[str] = None
+    attempts: int = 0
+    num_chunks: int = 0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job reached a terminal status"""
+        return self.status in ("completed", "failed")
@@ -5,8 +5,8 @@ Pydantic models for Message entity.
 """
 
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Literal
-from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any, Literal, Mapping
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 # Source model (RAG reference)
@@ -99,6 +99,47 @@ class MessageWithAssistant(Message):
     assistant_avatar: Optional[str] = None
 
 
+# Message page (keyset pagination)
+class MessagePage(BaseModel):
+    """Page of messages, oldest first"""
+    items: List[Message]
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to get the next page
+    has_more: bool = False
+
+
+# Fields whose stored NULL means the schema default
+_EMPTY_DEFAULTS = {
+    "msg_metadata": dict,
+    "sources": list,
+    "references": list,
+    "tool_calls": list,
+    "tool_results": list,
+}
+
+_message_page_adapter = TypeAdapter(MessagePage)
+
+
+def construct_message(row: Mapping[str, Any]) -> Message:
+    """
+    Build a Message from a database row without validating it.
+
+    Stored messages were validated when written, so listings skip
+    re-validating every nested source and tool call. Nested items stay
+    plain dicts.
+    """
+    values = dict(row)
+    for name, default in _EMPTY_DEFAULTS.items():
+        if values.get(name) is None:
+            values[name] = default()
+    return Message.model_construct(**values)
+
+
+def message_page_json(page: MessagePage) -> bytes:
+    """Serialize a page of (constructed) messages to JSON"""
+    # Nested dicts where the schema declares models are expected here
+    return _message_page_adapter.dump_json(page, warnings=False)
+
+
 # Streaming chunk
 class StreamingChunk(BaseModel):
     """Streaming message chunk"""
@@ -5,15 +5,21 @@ Repository pattern implementations for data access.
 """
 
 from app.repositories.base import BaseRepository
+from app.repositories.pagination import Page
 from app.repositories.user_repo import UserRepository
 from app.repositories.assistant_repo import AssistantRepository
 from app.repositories.conversation_repo import ConversationRepository
 from app.repositories.message_repo import MessageRepository
 from app.repositories.tool_repo import ToolRepository, ToolProviderRepository
 from app.repositories.document_repo import DocumentRepository
+from app.repositories.document_content_repo import DocumentContentRepository
+from app.repositories.ingestion_job_repo import IngestionJobRepository
+from app.repositories.search_repo import SearchRepository
+from app.repositories.user_stats_repo import UserStatsRepository
 
 __all__ = [
     "BaseRepository",
+    "Page",
     "UserRepository",
     "AssistantRepository",
     "ConversationRepository",
@@ -21,4 +27,8 @@ __all__ = [
     "ToolRepository",
     "ToolProviderRepository",
     "DocumentRepository",
+    "DocumentContentRepository",
+    "IngestionJobRepository",
+    "SearchRepository",
+    "UserStatsRepository",
 ]
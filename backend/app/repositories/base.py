@@ -5,10 +5,13 @@ Base repository with common CRUD operations.
 """
 
 from typing import Generic, TypeVar, Type, Optional, List, Dict, Any
-from sqlalchemy import select, update, delete
+from sqlalchemy import Row, Select, insert, or_, select, update, delete
+from sqlalchemy.engine import Dialect
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.db.base import Base
+from app.repositories.pagination import Page, decode_cursor, encode_cursor
 
 ModelType = TypeVar("ModelType", bound=Base)
 
@@ -18,6 +21,11 @@ class BaseRepository(Generic[ModelType]):
     Base repository with CRUD operations.
 
     All repositories inherit from this class.
+
+    Writes take one round trip where the dialect supports RETURNING
+    (PostgreSQL, SQLite >= 3.35): the INSERT/UPDATE/DELETE returns the
+    row instead of being followed by a SELECT. Other dialects fall back
+    to a separate read.
     """
 
     def __init__(self, model: Type[ModelType], db: AsyncSession):
@@ -31,6 +39,10 @@ class BaseRepository(Generic[ModelType]):
         self.model = model
         self.db = db
 
+    @property
+    def _dialect(self) -> Dialect:
+        return self.db.get_bind().dialect
+
     async def create(self, **kwargs) -> ModelType:
         """
         Create a new record.
@@ -41,12 +53,46 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             Created model instance
         """
+        if self._dialect.insert_returning:
+            result = await self.db.scalars(
+                insert(self.model).values(**kwargs).returning(self.model)
+            )
+            return result.one()
+
         instance = self.model(**kwargs)
         self.db.add(instance)
         await self.db.flush()
         await self.db.refresh(instance)
         return instance
 
+    async def create_many(
+        self,
+        rows: List[Dict[str, Any]],
+        batch_size: Optional[int] = None
+    ) -> List[ModelType]:
+        """
+        Create many records with multi-row INSERT ... RETURNING statements.
+
+        Costs one statement per batch instead of an INSERT and a refresh
+        per record; for seeding and imports.
+
+        Args:
+            rows: Field values of each record
+            batch_size: Records per statement (default: DB_BULK_INSERT_BATCH_SIZE)
+
+        Returns:
+            Created model instances, in the order of rows
+        """
+        if not rows:
+            return []
+        result = await self.db.scalars(
+            insert(self.model)
+            .returning(self.model, sort_by_parameter_order=True)
+            .execution_options(insertmanyvalues_page_size=batch_size or settings.DB_BULK_INSERT_BATCH_SIZE),
+            rows
+        )
+        return list(result.all())
+
     async def get(self, id: str) -> Optional[ModelType]:
         """
         Get record by ID.
@@ -70,7 +116,9 @@ class BaseRepository(Generic[ModelType]):
         **filters
     ) -> List[ModelType]:
         """
-        Get multiple records with pagination.
+        Get multiple records with offset pagination.
+
+        Offsets get slower the deeper the page; listings use get_page().
 
         Args:
             skip: Number of records to skip
@@ -98,6 +146,91 @@ class BaseRepository(Generic[ModelType]):
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    async def get_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        order_by: str = "created_at",
+        descending: bool = True,
+        **filters
+    ) -> Page[ModelType]:
+        """
+        Get records with keyset pagination.
+
+        Args:
+            limit: Maximum number of records
+            cursor: Cursor from the previous page (None for the first page)
+            order_by: Field to order by (ties are ordered by ID)
+            descending: Newest first
+            **filters: Filter conditions
+
+        Returns:
+            Page of model instances
+        """
+        query = select(self.model)
+        for key, value in filters.items():
+            if hasattr(self.model, key):
+                query = query.where(getattr(self.model, key) == value)
+
+        return await self._paginate(
+            query, getattr(self.model, order_by), limit, cursor, descending
+        )
+
+    async def _paginate(
+        self,
+        query: Select,
+        sort_column,
+        limit: int,
+        cursor: Optional[str],
+        descending: bool = False,
+        rows: bool = False,
+        id_column=None
+    ) -> Page:
+        """
+        Run a query one keyset page at a time, ordered by (sort_column, id).
+
+        Args:
+            query: Select of the model (or of its columns, including id and
+                   sort_column), with filters but without ordering
+            sort_column: Model column to order by
+            limit: Maximum number of records
+            cursor: Cursor from the previous page
+            descending: Order direction
+            rows: Return result rows instead of model instances
+            id_column: Unique tie-breaker column named "id" (default: the
+                       model's ID)
+
+        Returns:
+            Page of model instances (or rows)
+        """
+        if id_column is None:
+            id_column = self.model.id
+        if cursor:
+            value, last_id = decode_cursor(cursor)
+            # The first condition is an index range; the second only breaks
+            # ties on the boundary value
+            if descending:
+                query = query.where(sort_column <= value, or_(sort_column < value, id_column < last_id))
+            else:
+                query = query.where(sort_column >= value, or_(sort_column > value, id_column > last_id))
+
+        if descending:
+            query = query.order_by(sort_column.desc(), id_column.desc())
+        else:
+            query = query.order_by(sort_column.asc(), id_column.asc())
+
+        # One extra row tells whether there is a next page
+        result = await self.db.execute(query.limit(limit + 1))
+        items = list(result.all() if rows else result.scalars().all())
+        has_more = len(items) > limit
+        items = items[:limit]
+
+        next_cursor = None
+        if has_more:
+            last = items[-1]
+            next_cursor = encode_cursor(getattr(last, sort_column.key), last.id)
+        return Page(items=items, next_cursor=next_cursor, has_more=has_more)
+
     async def update(self, id: str, **kwargs) -> Optional[ModelType]:
         """
         Update a record.
@@ -115,14 +248,22 @@ class BaseRepository(Generic[ModelType]):
         if not update_data:
             return await self.get(id)
 
-        await self.db.execute(
-            update(self.model)
-            .where(self.model.id == id)
-            .values(**update_data)
-        )
+        statement = update(self.model).where(self.model.id == id).values(**update_data)
+        if self._dialect.update_returning:
+            # Returned values overwrite loaded instances (e.g. counter expressions)
+            result = await self.db.scalars(
+                statement.returning(self.model).execution_options(populate_existing=True)
+            )
+            return result.one_or_none()
 
+        await self.db.execute(statement)
         await self.db.flush()
-        return await self.get(id)
+        result = await self.db.execute(
+            select(self.model)
+            .where(self.model.id == id)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
 
     async def delete(self, id: str) -> bool:
         """
@@ -141,6 +282,28 @@ class BaseRepository(Generic[ModelType]):
         await self.db.flush()
         return result.rowcount > 0
 
+    async def _delete_returning(self, id: str, *columns) -> Optional[Row]:
+        """
+        Delete a record and return some of its columns.
+
+        Args:
+            id: Record ID
+            *columns: Model columns to return
+
+        Returns:
+            Row of the deleted record's values, or None if not found
+        """
+        statement = delete(self.model).where(self.model.id == id)
+        if self._dialect.delete_returning:
+            result = await self.db.execute(statement.returning(*columns))
+            return result.one_or_none()
+
+        result = await self.db.execute(select(*columns).where(self.model.id == id))
+        row = result.one_or_none()
+        if row is not None:
+            await self.db.execute(statement)
+        return row
+
     async def count(self, **filters) -> int:
         """
         Count records.
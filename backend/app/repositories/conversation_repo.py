@@ -4,13 +4,18 @@ SIMBA Backend - Conversation Repository
 Repository for Conversation model with custom queries.
 """
 
-from typing import List, Optional
-from sqlalchemy import select, func
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import case, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.db.models import Conversation, Message, Assistant
+from app.db.models import Conversation, Message, Assistant, UserStats
 from app.repositories.base import BaseRepository
+from app.repositories.pagination import Page
+from app.repositories.search_repo import SearchRepository, order_by_ids
+from app.repositories.user_stats_repo import UserStatsRepository
 
 
 class ConversationRepository(BaseRepository[Conversation]):
@@ -19,6 +24,109 @@ class ConversationRepository(BaseRepository[Conversation]):
     def __init__(self, db: AsyncSession):
         super().__init__(Conversation, db)
 
+    async def create(self, **kwargs) -> Conversation:
+        """Create a conversation and add its title to the search index"""
+        conversation = await super().create(**kwargs)
+        await SearchRepository(self.db).index("conversation", [conversation.id], conversation.title, replace=False)
+        await UserStatsRepository(self.db).add(conversation.user_id, conversation.assistant_id, conversation_count=1)
+        return conversation
+
+    async def create_many(self, rows: List[Dict[str, Any]], batch_size: Optional[int] = None) -> List[Conversation]:
+        """Create many conversations, counting them in the user stats and indexing their titles"""
+        conversations = await super().create_many(rows, batch_size)
+        await SearchRepository(self.db).index_many(
+            "conversation", {conversation.id: conversation.title for conversation in conversations}, batch_size
+        )
+        owners = Counter((conversation.user_id, conversation.assistant_id) for conversation in conversations)
+        for (user_id, assistant_id), count in owners.items():
+            await UserStatsRepository(self.db).add(user_id, assistant_id, conversation_count=count)
+        return conversations
+
+    async def update(self, id: str, **kwargs) -> Optional[Conversation]:
+        """Update a conversation, re-indexing a changed title"""
+        conversation = await super().update(id, **kwargs)
+        if conversation is not None and kwargs.get("title") is not None:
+            await SearchRepository(self.db).index("conversation", [id], conversation.title)
+        return conversation
+
+    async def delete(self, id: str) -> bool:
+        """Delete a conversation, its search index entries and its share of the user's stats"""
+        deleted = await self._delete_returning(
+            id,
+            Conversation.user_id,
+            Conversation.assistant_id,
+            Conversation.message_count,
+            Conversation.document_count,
+            Conversation.document_bytes
+        )
+        if deleted is None:
+            return False
+        await SearchRepository(self.db).remove_conversation(id)
+        await UserStatsRepository(self.db).add(
+            deleted.user_id,
+            deleted.assistant_id,
+            conversation_count=-1,
+            message_count=-deleted.message_count,
+            document_count=-deleted.document_count,
+            document_bytes=-deleted.document_bytes
+        )
+        return True
+
+    async def add_counts(
+        self,
+        conversation_id: str,
+        messages: int = 0,
+        documents: int = 0,
+        document_bytes: int = 0,
+        last_message_at: Optional[datetime] = None
+    ):
+        """
+        Adjust a conversation's counters and its user's stats.
+
+        Called by the message and document repositories in the transaction
+        inserting or deleting the rows.
+
+        Args:
+            conversation_id: Conversation ID
+            messages: Messages added (negative: deleted)
+            documents: Documents added (negative: deleted)
+            document_bytes: Document bytes added (negative: deleted)
+            last_message_at: Creation time of an added message
+        """
+        values = {}
+        if messages:
+            values["message_count"] = Conversation.message_count + messages
+        if documents:
+            values["document_count"] = Conversation.document_count + documents
+        if document_bytes:
+            values["document_bytes"] = Conversation.document_bytes + document_bytes
+        if last_message_at is not None:
+            # Messages can be inserted out of order (imports)
+            values["last_message_at"] = case(
+                (Conversation.last_message_at > last_message_at, Conversation.last_message_at),
+                else_=last_message_at
+            )
+        elif messages < 0:
+            values["last_message_at"] = (
+                select(func.max(Message.created_at))
+                .where(Message.conversation_id == conversation_id)
+                .scalar_subquery()
+            )
+        if not values:
+            return
+
+        await self.db.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(**values)
+        )
+        await UserStatsRepository(self.db).add_for_conversation(
+            conversation_id,
+            message_count=messages,
+            document_count=documents,
+            document_bytes=document_bytes
+        )
+
     async def get_with_assistant(self, id: str) -> Optional[Conversation]:
         """Get conversation with assistant details"""
         result = await self.db.execute(
@@ -31,26 +139,24 @@ class ConversationRepository(BaseRepository[Conversation]):
     async def get_by_user(
         self,
         user_id: str,
-        skip: int = 0,
-        limit: int = 50
-    ) -> List[Conversation]:
-        """Get conversations for a user"""
-        result = await self.db.execute(
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Page[Conversation]:
+        """Get a page of conversations for a user, most recently updated first"""
+        return await self._paginate(
             select(Conversation)
             .options(selectinload(Conversation.assistant))
-            .where(Conversation.user_id == user_id)
-            .order_by(Conversation.updated_at.desc())
-            .offset(skip)
-            .limit(limit)
+            .where(Conversation.user_id == user_id),
+            Conversation.updated_at,
+            limit,
+            cursor,
+            descending=True
         )
-        return list(result.scalars().all())
 
     async def get_message_count(self, conversation_id: str) -> int:
         """Get count of messages in conversation"""
         result = await self.db.execute(
-            select(func.count())
-            .select_from(Message)
-            .where(Message.conversation_id == conversation_id)
+            select(Conversation.message_count).where(Conversation.id == conversation_id)
         )
         return result.scalar() or 0
 
@@ -58,52 +164,44 @@ class ConversationRepository(BaseRepository[Conversation]):
         self,
         user_id: str,
         query: str,
-        limit: int = 20
-    ) -> List[Conversation]:
-        """Search conversations by title"""
-        result = await self.db.execute(
-            select(Conversation)
-            .options(selectinload(Conversation.assistant))
-            .where(
-                Conversation.user_id == user_id,
-                Conversation.title.ilike(f"%{query}%")
-            )
-            .order_by(Conversation.updated_at.desc())
-            .limit(limit)
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Page[Conversation]:
+        """Full-text search of a user's conversation titles, best matches first"""
+        hits = await SearchRepository(self.db).search(
+            "conversation", query, user_id=user_id, limit=limit, cursor=cursor
         )
-        return list(result.scalars().all())
+        ids = [hit.id for hit in hits.items]
+        conversations = []
+        if ids:
+            result = await self.db.execute(
+                select(Conversation)
+                .options(selectinload(Conversation.assistant))
+                .where(Conversation.id.in_(ids))
+            )
+            conversations = order_by_ids(result.scalars().all(), ids)
+        return Page(items=conversations, next_cursor=hits.next_cursor, has_more=hits.has_more)
 
     async def get_stats(self, user_id: str) -> dict:
         """Get conversation statistics for user"""
-        # Total conversations
-        total_convs = await self.count(user_id=user_id)
-
-        # Total messages
         result = await self.db.execute(
-            select(func.count())
-            .select_from(Message)
-            .join(Conversation)
-            .where(Conversation.user_id == user_id)
+            select(UserStats, Assistant.name)
+            .join(Assistant, Assistant.id == UserStats.assistant_id)
+            .where(UserStats.user_id == user_id)
         )
-        total_messages = result.scalar() or 0
+        rows = result.all()
 
         # Most used assistant
-        result = await self.db.execute(
-            select(
-                Assistant.name,
-                func.count(Conversation.id).label("count")
-            )
-            .select_from(Conversation)
-            .join(Assistant)
-            .where(Conversation.user_id == user_id)
-            .group_by(Assistant.name)
-            .order_by(func.count(Conversation.id).desc())
-            .limit(1)
+        most_used = max(
+            (row for row in rows if row.UserStats.conversation_count > 0),
+            key=lambda row: row.UserStats.conversation_count,
+            default=None
         )
-        most_used = result.first()
 
         return {
-            "total_conversations": total_convs,
-            "total_messages": total_messages,
-            "most_used_assistant": most_used[0] if most_used else None,
+            "total_conversations": sum(row.UserStats.conversation_count for row in rows),
+            "total_messages": sum(row.UserStats.message_count for row in rows),
+            "total_documents": sum(row.UserStats.document_count for row in rows),
+            "total_document_bytes": sum(row.UserStats.document_bytes for row in rows),
+            "most_used_assistant": most_used.name if most_used else None,
         }
@@ -0,0 +1,129 @@
+"""
+SIMBA Backend - Document Content Repository
+
+Repository for DocumentContent model with reference counting.
+"""
+
+from datetime import datetime
+from typing import Optional, Union
+from sqlalchemy import select, update, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.blob_store import TextWriter, load_text, store_content
+from app.db.models import Document, DocumentContent
+from app.repositories.base import BaseRepository
+from app.repositories.search_repo import SearchRepository
+
+
+class DocumentContentRepository(BaseRepository[DocumentContent]):
+    """Repository for DocumentContent operations"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(DocumentContent, db)
+
+    async def acquire(self, content_hash: str, mime_type: str, size_bytes: int) -> DocumentContent:
+        """
+        Take a reference to content, creating the record on first use.
+
+        Args:
+            content_hash: SHA-256 of the file
+            mime_type: MIME type of the file
+            size_bytes: File size
+
+        Returns:
+            Content record (with the new reference counted)
+        """
+        while True:
+            content = await self._add_ref(content_hash, 1)
+            if content is not None:
+                return content
+
+            try:
+                content = DocumentContent(
+                    id=content_hash,
+                    mime_type=mime_type,
+                    size_bytes=size_bytes,
+                    ref_count=1
+                )
+                async with self.db.begin_nested():
+                    self.db.add(content)
+                return content
+            except IntegrityError:
+                # Created concurrently by another upload: count our reference on it
+                continue
+
+    async def release(self, content_hash: str) -> bool:
+        """
+        Drop a reference to content; the record is deleted with the last one.
+
+        Args:
+            content_hash: SHA-256 of the file
+
+        Returns:
+            True if this was the last reference (shared vectors can be deleted)
+        """
+        content = await self._add_ref(content_hash, -1)
+        if content is None or content.ref_count > 0:
+            return False
+
+        result = await self.db.execute(
+            delete(DocumentContent)
+            .where(DocumentContent.id == content_hash, DocumentContent.ref_count <= 0)
+        )
+        await self.db.flush()
+        return result.rowcount > 0
+
+    async def get_content(self, content_hash: str) -> Optional[str]:
+        """
+        Load the extracted text of shared content.
+
+        Args:
+            content_hash: SHA-256 of the file
+
+        Returns:
+            Extracted text, or None if not extracted
+        """
+        result = await self.db.execute(
+            select(DocumentContent.content, DocumentContent.content_blob)
+            .where(DocumentContent.id == content_hash)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return await load_text(row.content, row.content_blob)
+
+    async def set_content(self, content_hash: str, content: Union[str, TextWriter]):
+        """
+        Store the extracted text of shared content.
+
+        Args:
+            content_hash: SHA-256 of the file
+            content: Extracted text, or a TextWriter it was streamed to
+                (large texts go to the blob store)
+        """
+        values, length, content = await store_content(content)
+        await self.db.execute(
+            update(DocumentContent)
+            .where(DocumentContent.id == content_hash)
+            .values(
+                content_length=length,
+                updated_at=datetime.utcnow(),
+                **values
+            )
+        )
+        await self.db.flush()
+
+        # Each referencing document is searchable in its own conversation
+        result = await self.db.execute(
+            select(Document.id).where(Document.content_hash == content_hash)
+        )
+        await SearchRepository(self.db).index("document", result.scalars().all(), content)
+
+    async def _add_ref(self, content_hash: str, delta: int) -> Optional[DocumentContent]:
+        """Adjust the reference count; returns the updated record (None if missing)"""
+        return await self.update(
+            content_hash,
+            ref_count=DocumentContent.ref_count + delta,
+            updated_at=datetime.utcnow()
+        )
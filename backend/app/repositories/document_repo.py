@@ -4,12 +4,19 @@ SIMBA Backend - Document Repository
 Repository for Document model with custom queries.
 """
 
-from typing import List, Optional
-from sqlalchemy import select
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Union
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.db.models import Document
+from app.db.blob_store import TextWriter, load_text, store_content, store_text
+from app.db.models import Conversation, Document
 from app.repositories.base import BaseRepository
+from app.repositories.conversation_repo import ConversationRepository
+from app.repositories.document_content_repo import DocumentContentRepository
+from app.repositories.pagination import Page
+from app.repositories.search_repo import SearchRepository, order_by_ids
 
 
 class DocumentRepository(BaseRepository[Document]):
@@ -18,21 +25,116 @@ class DocumentRepository(BaseRepository[Document]):
     def __init__(self, db: AsyncSession):
         super().__init__(Document, db)
 
+    async def create(self, **kwargs) -> Document:
+        """Create a document, counting it in its conversation and indexing its content (inline or shared)"""
+        content = kwargs.pop("content", None)
+        if content is not None:
+            kwargs.update(await store_text(content))
+
+        document = await super().create(**kwargs)
+        await ConversationRepository(self.db).add_counts(
+            document.conversation_id, documents=1, document_bytes=document.size_bytes
+        )
+        if document.content_hash:
+            await self._index_shared_content(document)
+        elif content:
+            await SearchRepository(self.db).index("document", [document.id], content, replace=False)
+        return document
+
+    async def create_many(self, rows: List[Dict[str, Any]], batch_size: Optional[int] = None) -> List[Document]:
+        """Create many documents, counting them in their conversations and indexing their content (inline or shared)"""
+        rows = [dict(row) for row in rows]
+        texts = []
+        for row in rows:
+            content = row.pop("content", None)
+            if content is not None:
+                row.update(await store_text(content))
+            texts.append(content)
+
+        documents = await super().create_many(rows, batch_size)
+
+        totals = defaultdict(lambda: [0, 0])
+        shared = defaultdict(list)
+        for document in documents:
+            totals[document.conversation_id][0] += 1
+            totals[document.conversation_id][1] += document.size_bytes
+            if document.content_hash:
+                shared[document.content_hash].append(document.id)
+
+        conversation_repo = ConversationRepository(self.db)
+        for conversation_id, (count, size) in totals.items():
+            await conversation_repo.add_counts(conversation_id, documents=count, document_bytes=size)
+
+        search_repo = SearchRepository(self.db)
+        await search_repo.index_many("document", {
+            document.id: text
+            for document, text in zip(documents, texts)
+            if not document.content_hash
+        }, batch_size)
+        content_repo = DocumentContentRepository(self.db)
+        for content_hash, ids in shared.items():
+            await search_repo.index(
+                "document", ids, await content_repo.get_content(content_hash), replace=False
+            )
+        return documents
+
+    async def update(self, id: str, **kwargs) -> Optional[Document]:
+        """Update a document, re-counting a changed size and re-indexing changed content (inline or shared)"""
+        inline = "content" in kwargs
+        content = kwargs.pop("content", None)
+        if inline:
+            kwargs.update(
+                await store_text(content) if content is not None
+                else {"content": None, "content_blob": None}
+            )
+
+        old_size = None
+        if kwargs.get("size_bytes") is not None:
+            result = await self.db.execute(select(Document.size_bytes).where(Document.id == id))
+            old_size = result.scalar_one_or_none()
+
+        document = await super().update(id, **kwargs)
+        if document is None:
+            return None
+        if old_size is not None and document.size_bytes != old_size:
+            await ConversationRepository(self.db).add_counts(
+                document.conversation_id, document_bytes=document.size_bytes - old_size
+            )
+        if kwargs.get("content_hash") is not None:
+            await self._index_shared_content(document)
+        elif inline and not document.content_hash:
+            await SearchRepository(self.db).index("document", [id], content)
+        return document
+
+    async def delete(self, id: str) -> bool:
+        """Delete a document, updating its conversation's counters and the search index"""
+        deleted = await self._delete_returning(id, Document.conversation_id, Document.size_bytes)
+        if deleted is None:
+            return False
+        await ConversationRepository(self.db).add_counts(
+            deleted.conversation_id, documents=-1, document_bytes=-deleted.size_bytes
+        )
+        await SearchRepository(self.db).remove("document", [id])
+        return True
+
+    async def _index_shared_content(self, document: Document):
+        content = await DocumentContentRepository(self.db).get_content(document.content_hash)
+        await SearchRepository(self.db).index("document", [document.id], content)
+
     async def get_by_conversation(
         self,
         conversation_id: str,
-        skip: int = 0,
-        limit: int = 50
-    ) -> List[Document]:
-        """Get documents for a conversation"""
-        result = await self.db.execute(
-            select(Document)
-            .where(Document.conversation_id == conversation_id)
-            .order_by(Document.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Page[Document]:
+        """Get a page of documents for a conversation, newest first"""
+        return await self._paginate(
+            select(Document).where(Document.conversation_id == conversation_id),
+            Document.created_at,
+            limit,
+            cursor,
+            descending=True
         )
-        return list(result.scalars().all())
 
     async def get_by_type(
         self,
@@ -65,24 +167,115 @@ class DocumentRepository(BaseRepository[Document]):
         )
         return result.scalar_one_or_none()
 
+    async def get_indexed_content(self, conversation_id: str) -> Dict[str, Any]:
+        """
+        Shared content referenced by a conversation's indexed documents.
+
+        Returns:
+            Dict of content hash -> row with id, conversation_id and filename
+        """
+        result = await self.db.execute(
+            select(
+                Document.id,
+                Document.conversation_id,
+                Document.filename,
+                Document.content_hash,
+                Document.vector_ids
+            )
+            .where(
+                Document.conversation_id == conversation_id,
+                Document.content_hash.is_not(None)
+            )
+            .order_by(Document.created_at)
+        )
+        contents: Dict[str, Any] = {}
+        for row in result.all():
+            # Uploads with auto_index=False share the content but are not searchable
+            if row.vector_ids and row.content_hash not in contents:
+                contents[row.content_hash] = row
+        return contents
+
+    async def set_content_vectors(self, content_hash: str, vector_ids: List[str]) -> int:
+        """Point every indexed document referencing the given content at new vectors"""
+        result = await self.db.execute(
+            select(Document.id, Document.vector_ids)
+            .where(Document.content_hash == content_hash)
+        )
+        ids = [row.id for row in result.all() if row.vector_ids]
+        if not ids:
+            return 0
+
+        await self.db.execute(
+            update(Document)
+            .where(Document.id.in_(ids))
+            .values(vector_ids=vector_ids)
+        )
+        await self.db.flush()
+        return len(ids)
+
+    async def get_content(self, document: Document) -> Optional[str]:
+        """
+        Load a document's extracted text.
+
+        Content is deferred: list and metadata queries never read it, so
+        endpoints that need the text fetch it with this method.
+
+        Args:
+            document: Document
+
+        Returns:
+            Extracted text (the shared content's for deduplicated uploads),
+            or None if not extracted
+        """
+        if document.content_hash:
+            return await DocumentContentRepository(self.db).get_content(document.content_hash)
+
+        result = await self.db.execute(
+            select(Document.content, Document.content_blob)
+            .where(Document.id == document.id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return await load_text(row.content, row.content_blob)
+
+    async def get_with_content(self, document_id: str) -> Optional[Document]:
+        """Get a document with its content attribute loaded"""
+        document = await self.get(document_id)
+        if document is not None:
+            # Loaded value, not a change: nothing is written back on flush
+            set_committed_value(document, "content", await self.get_content(document))
+        return document
+
+    async def set_content(self, document_id: str, content: Union[str, TextWriter]):
+        """
+        Store the extracted text of a document without shared content.
+
+        Args:
+            document_id: Document ID
+            content: Extracted text, or a TextWriter it was streamed to
+                (large texts go to the blob store)
+        """
+        values, _, content = await store_content(content)
+        await self.db.execute(
+            update(Document)
+            .where(Document.id == document_id)
+            .values(**values)
+        )
+        await self.db.flush()
+        await SearchRepository(self.db).index("document", [document_id], content)
+
     async def count_by_conversation(self, conversation_id: str) -> int:
         """Count documents in conversation"""
-        from sqlalchemy import func
-
         result = await self.db.execute(
-            select(func.count())
-            .select_from(Document)
-            .where(Document.conversation_id == conversation_id)
+            select(Conversation.document_count).where(Conversation.id == conversation_id)
         )
         return result.scalar() or 0
 
     async def get_total_size(self, conversation_id: str) -> int:
         """Get total file size for conversation documents"""
-        from sqlalchemy import func
-
         result = await self.db.execute(
-            select(func.sum(Document.size_bytes))
-            .where(Document.conversation_id == conversation_id)
+            select(Conversation.document_bytes).where(Conversation.id == conversation_id)
         )
         return result.scalar() or 0
 
@@ -90,16 +283,16 @@ class DocumentRepository(BaseRepository[Document]):
         self,
         conversation_id: str,
         search_term: str,
-        limit: int = 20
-    ) -> List[Document]:
-        """Search documents by content"""
-        result = await self.db.execute(
-            select(Document)
-            .where(
-                Document.conversation_id == conversation_id,
-                Document.content.ilike(f"%{search_term}%")
-            )
-            .order_by(Document.created_at.desc())
-            .limit(limit)
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Page[Document]:
+        """Full-text search of a conversation's document texts, best matches first"""
+        hits = await SearchRepository(self.db).search(
+            "document", search_term, conversation_id=conversation_id, limit=limit, cursor=cursor
         )
-        return list(result.scalars().all())
+        ids = [hit.id for hit in hits.items]
+        documents = []
+        if ids:
+            result = await self.db.execute(select(Document).where(Document.id.in_(ids)))
+            documents = order_by_ids(result.scalars().all(), ids)
+        return Page(items=documents, next_cursor=hits.next_cursor, has_more=hits.has_more)
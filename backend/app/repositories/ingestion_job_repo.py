@@ -0,0 +1,146 @@
+"""
+SIMBA Backend - Ingestion Job Repository
+
+Repository for IngestionJob model with queue operations.
+"""
+
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import select, update, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import IngestionJob
+from app.repositories.base import BaseRepository
+
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class IngestionJobRepository(BaseRepository[IngestionJob]):
+    """Repository for IngestionJob operations"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(IngestionJob, db)
+
+    async def count_active(self) -> int:
+        """Count jobs that are queued or running (the backlog)"""
+        result = await self.db.execute(
+            select(func.count())
+            .select_from(IngestionJob)
+            .where(IngestionJob.status.in_(ACTIVE_STATUSES))
+        )
+        return result.scalar() or 0
+
+    async def claim_next(self, worker_id: str) -> Optional[IngestionJob]:
+        """
+        Claim the oldest runnable queued job.
+
+        The claim is a conditional UPDATE on status, so concurrent workers
+        (in this process or another one) never pick up the same job.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+
+        Returns:
+            Claimed job or None if the queue is empty
+        """
+        now = datetime.utcnow()
+
+        while True:
+            result = await self.db.execute(
+                select(IngestionJob.id)
+                .where(
+                    IngestionJob.status == "queued",
+                    or_(IngestionJob.run_after.is_(None), IngestionJob.run_after <= now)
+                )
+                .order_by(IngestionJob.created_at)
+                .limit(1)
+            )
+            job_id = result.scalar_one_or_none()
+            if job_id is None:
+                return None
+
+            claimed = await self.db.execute(
+                update(IngestionJob)
+                .where(IngestionJob.id == job_id, IngestionJob.status == "queued")
+                .values(
+                    status="running",
+                    worker_id=worker_id,
+                    heartbeat_at=now,
+                    started_at=func.coalesce(IngestionJob.started_at, now)
+                )
+            )
+            await self.db.flush()
+
+            # Lost the race to another worker: try the next one
+            if claimed.rowcount:
+                return await self.get(job_id)
+
+    async def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Refresh a running job's lease; False if the job is no longer ours"""
+        result = await self.db.execute(
+            update(IngestionJob)
+            .where(
+                IngestionJob.id == job_id,
+                IngestionJob.worker_id == worker_id,
+                IngestionJob.status == "running"
+            )
+            .values(heartbeat_at=datetime.utcnow())
+        )
+        await self.db.flush()
+        return result.rowcount > 0
+
+    async def requeue_stale(self, lease_seconds: int, max_attempts: int) -> int:
+        """
+        Requeue running jobs whose worker stopped sending heartbeats.
+
+        A lost worker counts as a failed attempt, so a job that keeps
+        crashing its worker is eventually failed instead of looping.
+
+        Args:
+            lease_seconds: Heartbeat age after which a job is considered orphaned
+            max_attempts: Attempts after which an orphaned job is failed
+
+        Returns:
+            Number of jobs requeued
+        """
+        now = datetime.utcnow()
+        stale = (
+            IngestionJob.status == "running",
+            or_(
+                IngestionJob.heartbeat_at.is_(None),
+                IngestionJob.heartbeat_at < now - timedelta(seconds=lease_seconds)
+            )
+        )
+
+        await self.db.execute(
+            update(IngestionJob)
+            .where(*stale, IngestionJob.attempts + 1 >= max_attempts)
+            .values(
+                status="failed",
+                attempts=IngestionJob.attempts + 1,
+                message="Worker stopped responding",
+                finished_at=now
+            )
+        )
+        result = await self.db.execute(
+            update(IngestionJob)
+            .where(*stale)
+            .values(
+                status="queued",
+                attempts=IngestionJob.attempts + 1,
+                worker_id=None,
+                message="Requeued after worker timeout"
+            )
+        )
+        await self.db.flush()
+        return result.rowcount
+
+    async def get_by_document(self, document_id: str) -> List[IngestionJob]:
+        """Get jobs for a document, newest first"""
+        result = await self.db.execute(
+            select(IngestionJob)
+            .where(IngestionJob.document_id == document_id)
+            .order_by(IngestionJob.created_at.desc())
+        )
+        return list(result.scalars().all())
@@ -4,13 +4,32 @@ SIMBA Backend - Message Repository
 Repository for Message model with custom queries.
 """
 
-from typing import List, Optional
-from sqlalchemy import select
+from typing import Any, Dict, List, Optional
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.db.models import Message, Assistant
 from app.repositories.base import BaseRepository
+from app.repositories.conversation_repo import ConversationRepository
+from app.repositories.pagination import Page
+from app.repositories.search_repo import SearchRepository, order_by_ids
+
+
+# Columns of the Message API schema (app.models.message.Message)
+API_COLUMNS = (
+    Message.id,
+    Message.conversation_id,
+    Message.assistant_id,
+    Message.role,
+    Message.content,
+    Message.created_at,
+    Message.msg_metadata,
+    Message.sources,
+    Message.references,
+    Message.tool_calls,
+    Message.tool_results,
+)
 
 
 class MessageRepository(BaseRepository[Message]):
@@ -19,6 +38,51 @@ class MessageRepository(BaseRepository[Message]):
     def __init__(self, db: AsyncSession):
         super().__init__(Message, db)
 
+    async def create(self, **kwargs) -> Message:
+        """Create a message, counting it in its conversation and adding it to the search index"""
+        message = await super().create(**kwargs)
+        await ConversationRepository(self.db).add_counts(
+            message.conversation_id, messages=1, last_message_at=message.created_at
+        )
+        await SearchRepository(self.db).index("message", [message.id], message.content, replace=False)
+        return message
+
+    async def create_many(self, rows: List[Dict[str, Any]], batch_size: Optional[int] = None) -> List[Message]:
+        """Create many messages, counting them in their conversations and adding them to the search index"""
+        messages = await super().create_many(rows, batch_size)
+
+        conversations: Dict[str, List[Message]] = {}
+        for message in messages:
+            conversations.setdefault(message.conversation_id, []).append(message)
+        conversation_repo = ConversationRepository(self.db)
+        for conversation_id, added in conversations.items():
+            await conversation_repo.add_counts(
+                conversation_id,
+                messages=len(added),
+                last_message_at=max(message.created_at for message in added)
+            )
+
+        await SearchRepository(self.db).index_many(
+            "message", {message.id: message.content for message in messages}, batch_size
+        )
+        return messages
+
+    async def update(self, id: str, **kwargs) -> Optional[Message]:
+        """Update a message, re-indexing changed content"""
+        message = await super().update(id, **kwargs)
+        if message is not None and kwargs.get("content") is not None:
+            await SearchRepository(self.db).index("message", [id], message.content)
+        return message
+
+    async def delete(self, id: str) -> bool:
+        """Delete a message, updating its conversation's counters and the search index"""
+        deleted = await self._delete_returning(id, Message.conversation_id)
+        if deleted is None:
+            return False
+        await ConversationRepository(self.db).add_counts(deleted.conversation_id, messages=-1)
+        await SearchRepository(self.db).remove("message", [id])
+        return True
+
     async def get_with_assistant(self, id: str) -> Optional[Message]:
         """Get message with assistant details"""
         result = await self.db.execute(
@@ -31,19 +95,86 @@ class MessageRepository(BaseRepository[Message]):
     async def get_by_conversation(
         self,
         conversation_id: str,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[Message]:
-        """Get messages for a conversation"""
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page[Message]:
+        """Get a page of messages for a conversation, oldest first"""
+        return await self._paginate(
+            select(Message).where(Message.conversation_id == conversation_id),
+            Message.created_at,
+            limit,
+            cursor
+        )
+
+    async def get_rows_by_conversation(
+        self,
+        conversation_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page[Row]:
+        """
+        Get a page of messages as plain rows, oldest first.
+
+        Reads only the columns of the API schema and skips ORM object
+        construction; for read-only listings.
+        """
+        return await self._paginate(
+            select(*API_COLUMNS).where(Message.conversation_id == conversation_id),
+            Message.created_at,
+            limit,
+            cursor,
+            rows=True
+        )
+
+    async def get_context_rows(self, conversation_id: str, limit: int = 50) -> List[Row]:
+        """
+        Get the latest (role, content) pairs of a conversation, oldest first.
+
+        Args:
+            conversation_id: Conversation ID
+            limit: Maximum number of messages
+
+        Returns:
+            Rows with role and content, for building LLM context
+        """
         result = await self.db.execute(
-            select(Message)
-            .options(selectinload(Message.assistant))
+            select(Message.role, Message.content)
             .where(Message.conversation_id == conversation_id)
-            .order_by(Message.created_at.asc())
-            .offset(skip)
+            .order_by(Message.created_at.desc(), Message.id.desc())
             .limit(limit)
         )
-        return list(result.scalars().all())
+        return list(reversed(result.all()))
+
+    async def search(
+        self,
+        user_id: str,
+        query: str,
+        conversation_id: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Page[Row]:
+        """
+        Full-text search of a user's messages, best matches first.
+
+        Args:
+            user_id: User ID
+            query: Search words
+            conversation_id: Only messages of this conversation
+            limit: Maximum number of messages
+            cursor: Cursor from the previous page
+
+        Returns:
+            Page of rows with the columns of the API schema
+        """
+        hits = await SearchRepository(self.db).search(
+            "message", query, user_id=user_id, conversation_id=conversation_id, limit=limit, cursor=cursor
+        )
+        ids = [hit.id for hit in hits.items]
+        rows = []
+        if ids:
+            result = await self.db.execute(select(*API_COLUMNS).where(Message.id.in_(ids)))
+            rows = order_by_ids(result.all(), ids)
+        return Page(items=rows, next_cursor=hits.next_cursor, has_more=hits.has_more)
 
     async def get_latest_by_conversation(
         self,
@@ -53,7 +184,6 @@ class MessageRepository(BaseRepository[Message]):
         """Get latest messages from conversation"""
         result = await self.db.execute(
             select(Message)
-            .options(selectinload(Message.assistant))
             .where(Message.conversation_id == conversation_id)
             .order_by(Message.created_at.desc())
             .limit(limit)
@@ -0,0 +1,74 @@
+"""
+SIMBA Backend - Keyset Pagination
+
+Cursor-based pagination for list queries.
+
+OFFSET pagination reads and discards every row before the requested page,
+so deep pages of a long conversation get linearly slower. Keyset
+pagination instead orders by (sort column, id) and continues after the
+last row of the previous page, which is an index range scan whatever the
+depth (e.g. idx_message_conversation_created for messages).
+
+The position is handed to clients as an opaque cursor: URL-safe base64 of
+the last row's sort value and ID.
+"""
+
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Tuple, TypeVar
+
+from app.utils.exceptions import ValidationError
+
+T = TypeVar("T")
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of a keyset-paginated query"""
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None  # Pass back to get the next page
+    has_more: bool = False
+
+
+def encode_cursor(sort_value: Any, id: str) -> str:
+    """
+    Build the cursor pointing after a row.
+
+    Args:
+        sort_value: Row's value of the sort column
+        id: Row ID (tie-breaker for equal sort values)
+
+    Returns:
+        Opaque cursor string
+    """
+    if isinstance(sort_value, datetime):
+        sort_value = {"dt": sort_value.isoformat()}
+    payload = json.dumps([sort_value, id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    """
+    Read a cursor built by encode_cursor().
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        (sort value, id)
+
+    Raises:
+        ValidationError: Malformed cursor
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, id = json.loads(payload)
+        if isinstance(sort_value, dict):
+            sort_value = datetime.fromisoformat(sort_value["dt"])
+        if not isinstance(id, str):
+            raise ValueError("cursor ID must be a string")
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValidationError("Invalid pagination cursor", details={"cursor": cursor}) from e
+    return sort_value, id
@@ -0,0 +1,226 @@
+"""
+SIMBA Backend - Search Repository
+
+Maintenance and ranked queries of the full-text search index
+(app.db.search).
+"""
+
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import bindparam, column, delete, func, insert, literal, literal_column, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.models import Conversation, Document, Message, SearchEntry
+from app.db.search import FTS_TABLE, MAX_BODY_CHARS, TS_CONFIG, fts_match, query_words, scope_token
+from app.repositories.base import BaseRepository
+from app.repositories.pagination import Page
+
+
+# Indexed kind -> (source model, its conversation ID column)
+SOURCES = {
+    "message": (Message, Message.conversation_id),
+    "document": (Document, Document.conversation_id),
+    "conversation": (Conversation, Conversation.id),
+}
+
+# Dialect-specific parts of the index, outside the ORM model
+fts = table(FTS_TABLE, column("rowid"), column("body"), column("scope"))
+entries = table(
+    "search_entries",
+    column("id"), column("kind"), column("ref_id"), column("user_id"), column("conversation_id"), column("tsv")
+)
+
+
+class SearchRepository(BaseRepository[SearchEntry]):
+    """Repository for full-text search index operations"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(SearchEntry, db)
+
+    @property
+    def _sqlite(self) -> bool:
+        return self._dialect.name == "sqlite"
+
+    async def index(self, kind: str, ref_ids: Iterable[str], text: Optional[str], replace: bool = True):
+        """
+        Index the text of rows (replacing their previous text).
+
+        The owning user and conversation are read from the source rows,
+        which must already be flushed.
+
+        Args:
+            kind: message, document or conversation
+            ref_ids: IDs of the rows
+            text: Text to index (None or empty only removes the rows)
+            replace: Remove existing entries first (False for new rows)
+        """
+        ref_ids = list(ref_ids)
+        if not ref_ids:
+            return
+        if replace:
+            await self.remove(kind, ref_ids)
+        if not text:
+            return
+        body = text[:MAX_BODY_CHARS]
+
+        model, conversation_id = SOURCES[kind]
+        source = select(literal(kind), model.id, Conversation.user_id, Conversation.id)
+        if model is not Conversation:
+            source = source.join_from(model, Conversation, conversation_id == Conversation.id)
+        source = source.where(model.id.in_(ref_ids))
+
+        names = ["kind", "ref_id", "user_id", "conversation_id"]
+        if self._sqlite:
+            await self.db.execute(insert(entries).from_select(names, source))
+            scope = (
+                literal("u") + func.replace(entries.c.user_id, "-", "")
+                + literal(" c") + func.replace(entries.c.conversation_id, "-", "")
+            )
+            await self.db.execute(
+                insert(fts).from_select(
+                    ["rowid", "body", "scope"],
+                    select(entries.c.id, literal(body), scope)
+                    .where(entries.c.kind == kind, entries.c.ref_id.in_(ref_ids))
+                )
+            )
+        else:
+            source = source.add_columns(func.to_tsvector(literal_column(f"'{TS_CONFIG}'::regconfig"), body))
+            await self.db.execute(insert(entries).from_select(names + ["tsv"], source))
+
+    async def index_many(self, kind: str, texts: Dict[str, Optional[str]], batch_size: Optional[int] = None):
+        """
+        Index new rows, each with its own text, in a few statements per batch.
+
+        Batches keep every statement's parameters under the drivers' limits
+        (asyncpg: 32767) for large imports.
+
+        Args:
+            kind: message, document or conversation
+            texts: Row ID -> text to index (rows without text are skipped)
+            batch_size: Rows per batch (default: DB_BULK_INSERT_BATCH_SIZE)
+        """
+        texts = {ref_id: text[:MAX_BODY_CHARS] for ref_id, text in texts.items() if text}
+        ref_ids = list(texts)
+        batch_size = batch_size or settings.DB_BULK_INSERT_BATCH_SIZE
+        for start in range(0, len(ref_ids), batch_size):
+            await self._index_batch(kind, {
+                ref_id: texts[ref_id] for ref_id in ref_ids[start:start + batch_size]
+            })
+
+    async def _index_batch(self, kind: str, texts: Dict[str, str]):
+        model, conversation_id = SOURCES[kind]
+        owners = select(model.id, Conversation.user_id, Conversation.id.label("conversation_id"))
+        if model is not Conversation:
+            owners = owners.join_from(model, Conversation, conversation_id == Conversation.id)
+        result = await self.db.execute(owners.where(model.id.in_(list(texts))))
+        rows = [
+            {"kind": kind, "ref_id": row.id, "user_id": row.user_id, "conversation_id": row.conversation_id}
+            for row in result.all()
+        ]
+        if not rows:
+            return
+
+        if self._sqlite:
+            await self.db.execute(insert(entries), rows)
+            result = await self.db.execute(
+                select(entries.c.id, entries.c.ref_id, entries.c.user_id, entries.c.conversation_id)
+                .where(entries.c.kind == kind, entries.c.ref_id.in_([row["ref_id"] for row in rows]))
+            )
+            await self.db.execute(insert(fts), [
+                {
+                    "rowid": entry.id,
+                    "body": texts[entry.ref_id],
+                    "scope": f"{scope_token('u', entry.user_id)} {scope_token('c', entry.conversation_id)}",
+                }
+                for entry in result.all()
+            ])
+        else:
+            await self.db.execute(
+                insert(entries).values(
+                    tsv=func.to_tsvector(literal_column(f"'{TS_CONFIG}'::regconfig"), bindparam("body"))
+                ),
+                [{**row, "body": texts[row["ref_id"]]} for row in rows]
+            )
+
+    async def remove(self, kind: str, ref_ids: Iterable[str]):
+        """Remove rows from the index"""
+        ref_ids = list(ref_ids)
+        if ref_ids:
+            await self._remove(entries.c.kind == kind, entries.c.ref_id.in_(ref_ids))
+
+    async def remove_conversation(self, conversation_id: str):
+        """Remove a conversation, its messages and its documents from the index"""
+        await self._remove(entries.c.conversation_id == conversation_id)
+
+    async def _remove(self, *criteria):
+        if self._sqlite:
+            await self.db.execute(
+                delete(fts).where(fts.c.rowid.in_(select(entries.c.id).where(*criteria)))
+            )
+        await self.db.execute(delete(entries).where(*criteria))
+
+    async def search(
+        self,
+        kind: str,
+        query: str,
+        user_id: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """
+        Search the index, best matches first.
+
+        Every word of the query must match (after stemming). Results are
+        ranked with BM25 on SQLite and ts_rank on PostgreSQL.
+
+        Args:
+            kind: message, document or conversation
+            query: Search words
+            user_id: Only rows of this user
+            conversation_id: Only rows of this conversation
+            limit: Maximum number of results
+            cursor: Cursor from the previous page
+
+        Returns:
+            Page of rows with id (of the matching row) and score (lower is better)
+
+        Raises:
+            ValidationError: Query without any word, or malformed cursor
+        """
+        criteria = [entries.c.kind == kind]
+        if user_id:
+            criteria.append(entries.c.user_id == user_id)
+        if conversation_id:
+            criteria.append(entries.c.conversation_id == conversation_id)
+
+        if self._sqlite:
+            # Column weights: the scope tokens don't count towards the rank
+            score = func.bm25(literal_column(FTS_TABLE), 1.0, 0.0)
+            ranked = (
+                select(entries.c.ref_id.label("id"), score.label("score"))
+                .join_from(entries, fts, fts.c.rowid == entries.c.id)
+                .where(literal_column(FTS_TABLE).op("MATCH")(fts_match(query, user_id, conversation_id)), *criteria)
+            )
+        else:
+            tsquery = func.plainto_tsquery(literal_column(f"'{TS_CONFIG}'::regconfig"), " ".join(query_words(query)))
+            ranked = (
+                select(entries.c.ref_id.label("id"), (-func.ts_rank(entries.c.tsv, tsquery)).label("score"))
+                .where(entries.c.tsv.op("@@")(tsquery), *criteria)
+            )
+
+        ranked = ranked.subquery("ranked")
+        return await self._paginate(
+            select(ranked.c.id, ranked.c.score),
+            ranked.c.score,
+            limit,
+            cursor,
+            rows=True,
+            id_column=ranked.c.id
+        )
+
+
+def order_by_ids(items: List, ids: List[str]) -> List:
+    """Put items loaded with id IN (...) back in the order of the IDs"""
+    by_id = {item.id: item for item in items}
+    return [by_id[id] for id in ids if id in by_id]
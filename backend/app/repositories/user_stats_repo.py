@@ -0,0 +1,78 @@
+"""
+SIMBA Backend - User Stats Repository
+
+Repository for UserStats model: per-user, per-assistant totals kept up to
+date incrementally as conversations, messages and documents are created
+and deleted, so statistics are read from a few rows instead of being
+recomputed with COUNT/SUM scans.
+"""
+
+from datetime import datetime
+from typing import List
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Conversation, UserStats
+from app.repositories.base import BaseRepository
+
+
+class UserStatsRepository(BaseRepository[UserStats]):
+    """Repository for UserStats operations"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(UserStats, db)
+
+    async def add(self, user_id: str, assistant_id: str, **deltas: int):
+        """
+        Add to a user's totals for an assistant, creating the row on first use.
+
+        Args:
+            user_id: User ID
+            assistant_id: Assistant ID
+            **deltas: Column name -> amount (e.g. conversation_count=1)
+        """
+        while True:
+            if await self._add(
+                (UserStats.user_id == user_id, UserStats.assistant_id == assistant_id), deltas
+            ):
+                return
+
+            try:
+                async with self.db.begin_nested():
+                    self.db.add(UserStats(user_id=user_id, assistant_id=assistant_id, **deltas))
+                return
+            except IntegrityError:
+                # Created concurrently: add to that row
+                continue
+
+    async def add_for_conversation(self, conversation_id: str, **deltas: int):
+        """
+        Add to the totals of a conversation's user and assistant.
+
+        Args:
+            conversation_id: Conversation ID
+            **deltas: Column name -> amount (e.g. message_count=1)
+        """
+        owner = select(Conversation.user_id, Conversation.assistant_id).where(Conversation.id == conversation_id)
+        await self._add((tuple_(UserStats.user_id, UserStats.assistant_id).in_(owner),), deltas)
+
+    async def get_by_user(self, user_id: str) -> List[UserStats]:
+        """Get a user's totals, one row per assistant used"""
+        result = await self.db.execute(
+            select(UserStats).where(UserStats.user_id == user_id)
+        )
+        return list(result.scalars().all())
+
+    async def _add(self, criteria, deltas) -> bool:
+        values = {name: getattr(UserStats, name) + delta for name, delta in deltas.items() if delta}
+        if not values:
+            return True
+        # Stats rows are not kept loaded: skip synchronizing the session
+        result = await self.db.execute(
+            update(UserStats)
+            .where(*criteria)
+            .values(updated_at=datetime.utcnow(), **values)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
@@ -6,13 +6,13 @@ Core chat service orchestrating LLM interactions, message management, and conver
 
 import uuid
 from typing import List, AsyncGenerator, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.llm import OpenAIClient, AnthropicClient, BaseLLMClient
 from app.repositories import ConversationRepository, MessageRepository, AssistantRepository
-from app.models.message import Message, MessageCreate, StreamingChunk, Source
-from app.models.conversation import Conversation
+from app.models.message import Message, MessageCreate, MessagePage, StreamingChunk, Source, construct_message
+from app.models.conversation import Conversation, ConversationListItem, ConversationPage
 from app.config import settings
 from app.utils.logger import logger
 from app.utils.exceptions import ChatException
@@ -79,8 +79,8 @@ class ChatService:
         if not conversation:
             raise ChatException(f"Conversation {conversation_id} not found")
 
-        # Get messages
-        messages = await self.message_repo.get_by_conversation(conversation_id, limit=limit)
+        # Get the latest messages (plain rows: only role and content are needed)
+        messages = await self.message_repo.get_context_rows(conversation_id, limit=limit)
 
         # Build context
         context = []
@@ -144,6 +144,9 @@ class ChatService:
 
             logger.info(f"Created user message: {user_msg.id}")
 
+            # Don't keep the transaction (and SQLite's writer) open while the LLM answers
+            await self.db.commit()
+
             # Build context
             context = await self._build_context(conversation_id)
 
@@ -224,6 +227,9 @@ class ChatService:
 
             logger.info(f"Created user message: {user_msg.id}")
 
+            # Don't keep the transaction (and SQLite's writer) open while the LLM answers
+            await self.db.commit()
+
             # Build context
             context = await self._build_context(conversation_id)
 
@@ -321,27 +327,202 @@ class ChatService:
             logger.error(f"Create conversation error: {e}")
             raise ChatException(f"Failed to create conversation: {str(e)}")
 
+    async def import_conversation(
+        self,
+        user_id: str,
+        assistant_id: str,
+        messages: List[Dict[str, Any]],
+        title: Optional[str] = None
+    ) -> Conversation:
+        """
+        Create a conversation with existing history (e.g. exported from
+        another system).
+
+        Messages are inserted in batches (create_many), not one by one.
+
+        Args:
+            user_id: User ID
+            assistant_id: Assistant ID
+            messages: Messages in chronological order, with role, content
+                      and optionally created_at and msg_metadata
+            title: Optional conversation title
+
+        Returns:
+            Created conversation
+
+        Raises:
+            ChatException: If assistant not found
+        """
+        try:
+            assistant = await self.assistant_repo.get(assistant_id)
+            if not assistant:
+                raise ChatException(f"Assistant {assistant_id} not found")
+
+            conversation = await self.conversation_repo.create(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                assistant_id=assistant_id,
+                title=title or f"Conversation with {assistant.name}",
+                conv_metadata={"imported": True}
+            )
+
+            # Messages without a timestamp keep their order (history is
+            # ordered by created_at)
+            start = datetime.utcnow()
+            await self.message_repo.create_many([
+                {
+                    "id": str(uuid.uuid4()),
+                    "conversation_id": conversation.id,
+                    "assistant_id": assistant.id if message["role"] == "assistant" else None,
+                    "role": message["role"],
+                    "content": message["content"],
+                    "msg_metadata": message.get("msg_metadata") or {},
+                    "created_at": message.get("created_at") or start + timedelta(microseconds=index),
+                }
+                for index, message in enumerate(messages)
+            ])
+
+            conversation = await self.conversation_repo.get(conversation.id)
+            logger.info(f"Imported conversation {conversation.id} with {len(messages)} messages")
+
+            return Conversation.model_validate(conversation)
+
+        except Exception as e:
+            logger.error(f"Import conversation error: {e}")
+            raise ChatException(f"Failed to import conversation: {str(e)}")
+
     async def get_conversation_messages(
         self,
         conversation_id: str,
         limit: int = 50,
-        offset: int = 0
-    ) -> List[Message]:
+        cursor: Optional[str] = None
+    ) -> MessagePage:
         """
-        Get messages from a conversation.
+        Get a page of messages from a conversation, oldest first.
 
         Args:
             conversation_id: Conversation ID
             limit: Maximum number of messages
-            offset: Offset for pagination
+            cursor: next_cursor of the previous page
 
         Returns:
-            List of messages
+            Page of messages
         """
-        messages = await self.message_repo.get_by_conversation(
+        page = await self.message_repo.get_rows_by_conversation(
             conversation_id,
-            skip=offset,
-            limit=limit
+            limit=limit,
+            cursor=cursor
+        )
+
+        return MessagePage.model_construct(
+            items=[construct_message(row._mapping) for row in page.items],
+            next_cursor=page.next_cursor,
+            has_more=page.has_more
         )
 
-        return [Message.model_validate(msg) for msg in messages]
+    async def list_conversations(
+        self,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> ConversationPage:
+        """
+        Get a page of a user's conversations, most recently updated first.
+
+        Args:
+            user_id: User ID
+            limit: Maximum number of conversations
+            cursor: next_cursor of the previous page
+
+        Returns:
+            Page of conversations
+        """
+        page = await self.conversation_repo.get_by_user(user_id, limit=limit, cursor=cursor)
+        return ConversationPage(
+            items=[
+                ConversationListItem(
+                    id=conv.id,
+                    title=conv.title,
+                    assistant_id=conv.assistant_id,
+                    assistant_name=conv.assistant.name,
+                    updated_at=conv.updated_at,
+                    message_count=conv.message_count,
+                    last_message_at=conv.last_message_at
+                )
+                for conv in page.items
+            ],
+            next_cursor=page.next_cursor,
+            has_more=page.has_more
+        )
+
+    async def search_messages(
+        self,
+        user_id: str,
+        query: str,
+        conversation_id: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> MessagePage:
+        """
+        Full-text search of a user's messages, best matches first.
+
+        Args:
+            user_id: User ID
+            query: Search words
+            conversation_id: Only messages of this conversation
+            limit: Maximum number of messages
+            cursor: next_cursor of the previous page
+
+        Returns:
+            Page of matching messages
+        """
+        page = await self.message_repo.search(
+            user_id,
+            query,
+            conversation_id=conversation_id,
+            limit=limit,
+            cursor=cursor
+        )
+
+        return MessagePage.model_construct(
+            items=[construct_message(row._mapping) for row in page.items],
+            next_cursor=page.next_cursor,
+            has_more=page.has_more
+        )
+
+    async def search_conversations(
+        self,
+        user_id: str,
+        query: str,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> ConversationPage:
+        """
+        Full-text search of a user's conversation titles, best matches first.
+
+        Args:
+            user_id: User ID
+            query: Search words
+            limit: Maximum number of conversations
+            cursor: next_cursor of the previous page
+
+        Returns:
+            Page of matching conversations
+        """
+        page = await self.conversation_repo.search_by_title(user_id, query, limit=limit, cursor=cursor)
+        return ConversationPage(
+            items=[
+                ConversationListItem(
+                    id=conv.id,
+                    title=conv.title,
+                    assistant_id=conv.assistant_id,
+                    assistant_name=conv.assistant.name,
+                    updated_at=conv.updated_at,
+                    message_count=conv.message_count,
+                    last_message_at=conv.last_message_at
+                )
+                for conv in page.items
+            ],
+            next_cursor=page.next_cursor,
+            has_more=page.has_more
+        )
@@ -5,15 +5,41 @@ File upload and content extraction services.
 """
 
 from app.services.file_processing.extractors import (
+    ExtractionResult,
     FileExtractorFactory,
     PDFExtractor,
     DocxExtractor,
     TxtExtractor
 )
+from app.services.file_processing.cache import (
+    ExtractionCache,
+    get_extraction_cache,
+)
+from app.services.file_processing.pool import (
+    ExtractionPool,
+    get_extraction_pool,
+    shutdown_extraction_pool,
+)
+from app.services.file_processing.upload import (
+    SpooledUpload,
+    receive_upload,
+    spool_path,
+    discard_spool,
+)
 
 __all__ = [
+    "ExtractionResult",
     "FileExtractorFactory",
     "PDFExtractor",
     "DocxExtractor",
     "TxtExtractor",
+    "ExtractionCache",
+    "get_extraction_cache",
+    "ExtractionPool",
+    "get_extraction_pool",
+    "shutdown_extraction_pool",
+    "SpooledUpload",
+    "receive_upload",
+    "spool_path",
+    "discard_spool",
 ]
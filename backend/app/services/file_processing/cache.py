@@ -0,0 +1,239 @@
+"""
+SIMBA Backend - Extraction Cache
+
+On-disk cache of extracted text.
+
+Entries are gzip-compressed text files keyed by the file's SHA-256 plus
+the extractor's name and VERSION, so the same file is never extracted
+twice by the same extractor (re-index, chunker changes, re-uploads),
+and bumping an extractor's VERSION invalidates its old results.
+
+Entries are written to a temporary file and renamed into place once the
+extraction completed, so readers never see partial text. The cache is
+bounded by EXTRACTION_CACHE_MAX_MB: when a write takes it over the limit,
+the least recently used entries are evicted.
+"""
+
+import gzip
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.logger import logger
+
+
+# Characters per piece when streaming a cached entry
+READ_CHARS = 64 * 1024
+
+# Evict down to this fraction of the limit, so eviction doesn't run on every write
+EVICT_TO = 0.9
+
+
+class CacheWriter:
+    """Accumulates extracted text into a pending cache entry"""
+
+    def __init__(self, cache: "ExtractionCache", path: Path):
+        self.cache = cache
+        self.path = path
+        self.partial = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.part")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = gzip.open(self.partial, "wt", encoding="utf-8", compresslevel=6)
+        self._done = False
+
+    def write(self, text: str):
+        self._file.write(text)
+
+    def commit(self):
+        """Publish the entry"""
+        if self._done:
+            return
+        self._done = True
+        self._file.close()
+        os.replace(self.partial, self.path)
+        self.cache._added(self.path.stat().st_size)
+
+    def discard(self):
+        """Drop the pending entry (extraction failed or was abandoned)"""
+        if self._done:
+            return
+        self._done = True
+        self._file.close()
+        try:
+            os.unlink(self.partial)
+        except FileNotFoundError:
+            pass
+
+
+class ExtractionCache:
+    """
+    Size-bounded on-disk extraction cache.
+
+    Usage:
+        cache = ExtractionCache("./extraction_cache", max_bytes=2 * 1024 ** 3)
+        key = cache.key(sha256, PDFExtractor)
+        pieces = cache.read(key)
+        if pieces is None:
+            writer = cache.writer(key)
+            ...
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        """
+        Initialize cache.
+
+        Args:
+            directory: Cache directory
+            max_bytes: Size bound for the compressed entries
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(content_hash: str, extractor, variant: str = "") -> str:
+        """
+        Cache key for a file and the extractor that processes it.
+
+        Args:
+            content_hash: SHA-256 of the file
+            extractor: Extractor class (name and VERSION are part of the key)
+            variant: Settings that change the extractor's output (e.g. OCR languages)
+        """
+        key = f"{content_hash}_{extractor.__name__}_v{getattr(extractor, 'VERSION', 1)}"
+        if variant:
+            key += "_" + "".join(c if c.isalnum() else "-" for c in variant)
+        return key
+
+    def _path(self, key: str) -> Path:
+        # Fan out by hash prefix to keep directories small
+        return self.directory / key[:2] / f"{key}.txt.gz"
+
+    def read(self, key: str) -> Optional[Iterator[str]]:
+        """
+        Stream a cached entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Iterator over text pieces, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            handle = gzip.open(path, "rt", encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+        # Mark as recently used for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return self._iter_entry(handle, path)
+
+    @staticmethod
+    def _iter_entry(handle, path: Path) -> Iterator[str]:
+        with handle:
+            try:
+                while piece := handle.read(READ_CHARS):
+                    yield piece
+            except (OSError, EOFError) as e:
+                # Corrupt entry: drop it so the next extraction rewrites it
+                logger.warning(f"Discarding corrupt extraction cache entry {path.name}: {e}")
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                raise
+
+    def writer(self, key: str) -> CacheWriter:
+        """Start writing an entry"""
+        return CacheWriter(self, self._path(key))
+
+    def size(self) -> int:
+        """Total size of the entries in bytes"""
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, _, size in self._entries())
+            return self._size
+
+    def clear(self):
+        """Delete all entries"""
+        with self._lock:
+            for path, _, _ in self._entries():
+                self._unlink(path)
+            self._size = 0
+
+    def _added(self, size: int):
+        current = self.size()
+        with self._lock:
+            self._size = current + size
+            over = self._size > self.max_bytes
+        if over:
+            self._evict()
+
+    def _evict(self):
+        """Delete least recently used entries until under the limit"""
+        with self._lock:
+            # Rescan: other processes (e.g. an external ingestion worker)
+            # share the directory
+            entries = sorted(self._entries(), key=lambda entry: entry[1])
+            total = sum(size for _, _, size in entries)
+            target = self.max_bytes * EVICT_TO
+            evicted = 0
+            for path, _, size in entries:
+                if total <= target:
+                    break
+                if self._unlink(path):
+                    total -= size
+                    evicted += 1
+            self._size = total
+
+        if evicted:
+            logger.info(f"Evicted {evicted} extraction cache entries ({total / 1024 / 1024:.0f} MB left)")
+
+    def _entries(self) -> List[Tuple[Path, float, int]]:
+        """(path, last use, size) of each entry"""
+        entries = []
+        for path in self.directory.glob("*/*.txt.gz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    @staticmethod
+    def _unlink(path: Path) -> bool:
+        try:
+            os.unlink(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+
+_cache: Optional[ExtractionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Get the process-wide extraction cache (None if disabled)"""
+    global _cache
+
+    if settings.EXTRACTION_CACHE_MAX_MB <= 0:
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ExtractionCache(
+                    settings.EXTRACTION_CACHE_DIRECTORY,
+                    settings.EXTRACTION_CACHE_MAX_MB * 1024 * 1024
+                )
+
+    return _cache
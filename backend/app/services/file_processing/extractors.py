@@ -2,79 +2,499 @@
 SIMBA Backend - File Content Extractors
 
 Extract text content from various file formats.
+
+The extractor classes parse files in the current process and raise on
+failure. FileExtractorFactory runs them in the extraction sandbox (see
+pool.py), with time and memory limits, and reports the outcome as an
+ExtractionResult. Its results are cached on disk (see cache.py), keyed by
+file hash and extractor VERSION: bump an extractor's VERSION whenever a
+change alters its output.
+
+Large PDFs are extracted page-parallel: page ranges are handed to the
+sandbox workers and page texts are yielded back in order as the ranges
+complete, so the chunker can start on the first pages while later ones
+are still being extracted. Spreadsheets, presentations, CSV and Markdown
+are streamed: the worker parses rows/slides/lines incrementally and sends
+the text back in pieces, so memory stays flat however large the file.
+Images and PDF pages without a text layer are OCRed page by page in
+parallel (see ocr.py).
 """
 
+import csv
 import io
-from typing import Optional
+import mmap
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, TextIO, Union
 from pathlib import Path
 
+from app.config import settings
+from app.services.file_processing.cache import get_extraction_cache
+from app.services.file_processing.ocr import OCRExtractor, needs_ocr, ocr_available
+from app.services.file_processing.pool import extraction_workers, get_extraction_pool
+from app.utils.exceptions import (
+    ExtractionMemoryError,
+    ExtractionTimeoutError,
+    ExtractionWorkerError,
+    FileException,
+    UnsupportedFileTypeError,
+)
+from app.utils.helpers import calculate_file_hash, calculate_path_hash
 from app.utils.logger import logger
 
 
+# Extractor input: raw bytes, or the path of a file on disk. Paths are
+# preferred for uploads, so large files are never loaded whole into memory.
+FileSource = Union[bytes, str, Path]
+
+
+def _is_path(source: FileSource) -> bool:
+    return isinstance(source, (str, Path))
+
+
+# Separator between pages in extracted PDF text
+PAGE_SEPARATOR = "\n\n"
+
+# Target size of the text pieces streamed back by streaming extractors
+STREAM_PIECE_CHARS = 64 * 1024
+
+# OCR task time limit on top of tesseract's own (rendering, preprocessing)
+OCR_TASK_GRACE_SECONDS = 15.0
+
+
+def _ocr_result(future, where: str) -> str:
+    """Text of an OCR task; a page that can't be recognized contributes none"""
+    try:
+        return future.result()
+    except FileException as e:
+        logger.warning(f"OCR failed for {where}: {e.message}")
+        return ""
+
+
+def _open_text(source: FileSource, newline: Optional[str] = None) -> TextIO:
+    """Open a text file (or bytes) for incremental reading"""
+    if _is_path(source):
+        return open(source, "r", encoding="utf-8-sig", errors="replace", newline=newline)
+    return io.TextIOWrapper(io.BytesIO(source), encoding="utf-8-sig", errors="replace", newline=newline)
+
+
+def _batched(lines: Iterable[str], size: int = STREAM_PIECE_CHARS) -> Iterator[str]:
+    """Join lines into pieces of about size characters"""
+    batch: List[str] = []
+    batch_chars = 0
+    for line in lines:
+        batch.append(line)
+        batch_chars += len(line)
+        if batch_chars >= size:
+            yield "".join(batch)
+            batch = []
+            batch_chars = 0
+    if batch:
+        yield "".join(batch)
+
+
+def _chain_first(first: str, rest: Iterable[str]) -> Iterator[str]:
+    yield first
+    yield from rest
+
+
+def _cell_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _iter_table_lines(rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    """
+    Render table rows as "column: value; ..." lines.
+
+    The first non-empty row is taken as the header. Labelling every value
+    with its column keeps rows meaningful when a chunk holds only part of
+    a table.
+    """
+    header: Optional[List[str]] = None
+    for row in rows:
+        cells = [_cell_text(value) for value in row]
+        if not any(cells):
+            continue
+        if header is None:
+            header = cells
+            yield " | ".join(cell for cell in cells if cell) + "\n"
+            continue
+        fields = []
+        for i, cell in enumerate(cells):
+            if not cell:
+                continue
+            column = header[i] if i < len(header) and header[i] else f"column {i + 1}"
+            fields.append(f"{column}: {cell}")
+        yield "; ".join(fields) + "\n"
+
+
+@dataclass
+class ExtractionResult:
+    """Outcome of extracting text from a file"""
+    text: str = ""
+    error: Optional[str] = None
+    error_type: Optional[str] = None  # unsupported, timeout, memory, crashed, failed
+    duration_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @staticmethod
+    def error_type_of(error: Exception) -> str:
+        """Classify an extraction exception"""
+        if isinstance(error, UnsupportedFileTypeError):
+            return "unsupported"
+        if isinstance(error, ExtractionTimeoutError):
+            return "timeout"
+        if isinstance(error, ExtractionMemoryError):
+            return "memory"
+        if isinstance(error, ExtractionWorkerError):
+            return "crashed"
+        return "failed"
+
+
 class PDFExtractor:
     """Extract text from PDF files"""
 
+    VERSION = 2
+
     @staticmethod
-    def extract(file_bytes: bytes) -> str:
-        """Extract text from PDF bytes"""
-        try:
-            import PyMuPDF as fitz  # type: ignore
+    def _open(source: FileSource):
+        import fitz  # type: ignore
 
-            text_parts = []
-            pdf_document = fitz.open(stream=file_bytes, filetype="pdf")
+        if _is_path(source):
+            # PyMuPDF reads pages from the file on demand
+            return fitz.open(str(source), filetype="pdf")
+        return fitz.open(stream=source, filetype="pdf")
 
-            for page_num in range(pdf_document.page_count):
+    @staticmethod
+    def cache_variant() -> str:
+        """Cache key suffix: text extracted with OCR differs from without"""
+        return f"ocr-{settings.OCR_LANGUAGES}" if ocr_available() else ""
+
+    @staticmethod
+    def page_count(source: FileSource) -> int:
+        """Number of pages in a PDF"""
+        with PDFExtractor._open(source) as pdf_document:
+            return pdf_document.page_count
+
+    @staticmethod
+    def extract_pages(source: FileSource, start: int, stop: int, ocr: bool = False) -> List[Optional[str]]:
+        """
+        Extract the text of pages [start, stop).
+
+        Args:
+            source: PDF bytes or file path
+            start: First page (0-based)
+            stop: Page after the last one
+            ocr: Return None for scanned pages (images, no text layer), to be OCRed
+
+        Returns:
+            Page texts
+        """
+        with PDFExtractor._open(source) as pdf_document:
+            stop = min(stop, pdf_document.page_count)
+            pages: List[Optional[str]] = []
+            for page_num in range(start, stop):
                 page = pdf_document[page_num]
-                text_parts.append(page.get_text())
+                text = page.get_text()
+                if ocr and needs_ocr(text, bool(page.get_images())):
+                    text = None
+                pages.append(text)
+            return pages
 
-            pdf_document.close()
+    @staticmethod
+    def extract(source: FileSource) -> str:
+        """Extract text from PDF bytes or file path (text layer only)"""
+        return PAGE_SEPARATOR.join(PDFExtractor.extract_pages(source, 0, PDFExtractor.page_count(source)))
 
-            return "\n\n".join(text_parts)
+    @staticmethod
+    def iter_pages(source: FileSource) -> Iterator[str]:
+        """
+        Yield the text of each page, in page order, extracted in the sandbox.
 
-        except Exception as e:
-            logger.error(f"PDF extraction error: {e}")
-            return f"[Error extracting PDF: {e}]"
+        PDFs on disk with at least PDF_PARALLEL_MIN_PAGES pages are split
+        into ranges of PDF_PAGES_PER_TASK pages extracted by several
+        workers at once; smaller ones (and in-memory bytes) are a single
+        task. Scanned pages are OCRed, one task per page.
 
+        Args:
+            source: PDF bytes or file path
 
-class DocxExtractor:
-    """Extract text from DOCX files"""
+        Returns:
+            Iterator over page texts
+        """
+        pool = get_extraction_pool()
+        if _is_path(source):
+            source = str(source)
+        ocr = ocr_available()
+
+        total = pool.run(PDFExtractor.page_count, source)
+        parallel = (
+            _is_path(source)
+            and total >= settings.PDF_PARALLEL_MIN_PAGES
+            and extraction_workers() > 1
+        )
+        if not parallel:
+            pages = pool.run(PDFExtractor.extract_pages, source, 0, total, ocr)
+            yield from PDFExtractor._ocr_scanned(source, 0, pages)
+            return
+
+        step = max(1, settings.PDF_PAGES_PER_TASK)
+        ranges = deque((start, min(start + step, total)) for start in range(0, total, step))
+
+        # Bound the ranges in flight, so a slow consumer (the indexer)
+        # doesn't let extracted text pile up in memory
+        window = 2 * extraction_workers()
+        pending = deque()
+        try:
+            while ranges or pending:
+                while ranges and len(pending) < window:
+                    start, stop = ranges.popleft()
+                    pending.append((start, pool.submit(PDFExtractor.extract_pages, source, start, stop, ocr)))
+                start, future = pending.popleft()
+                yield from PDFExtractor._ocr_scanned(source, start, future.result())
+        finally:
+            for _, future in pending:
+                future.cancel()
 
     @staticmethod
-    def extract(file_bytes: bytes) -> str:
-        """Extract text from DOCX bytes"""
+    def _ocr_scanned(source: FileSource, start: int, pages: List[Optional[str]]) -> Iterator[str]:
+        """Yield page texts, OCRing the scanned pages (None) in parallel"""
+        pool = get_extraction_pool()
+        timeout = settings.OCR_PAGE_TIMEOUT_SECONDS + OCR_TASK_GRACE_SECONDS
+        ocr = {
+            start + i: pool.submit(OCRExtractor.ocr_pdf_page, source, start + i, timeout=timeout)
+            for i, text in enumerate(pages)
+            if text is None
+        }
         try:
-            from docx import Document  # type: ignore
+            for i, text in enumerate(pages):
+                if text is None:
+                    text = _ocr_result(ocr.pop(start + i), f"page {start + i + 1}")
+                yield text
+        finally:
+            for future in ocr.values():
+                future.cancel()
 
-            doc = Document(io.BytesIO(file_bytes))
 
-            text_parts = []
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_parts.append(paragraph.text)
+class DocxExtractor:
+    """Extract text from DOCX files"""
 
-            return "\n\n".join(text_parts)
+    VERSION = 1
+
+    @staticmethod
+    def extract(source: FileSource) -> str:
+        """Extract text from DOCX bytes or file path"""
+        from docx import Document  # type: ignore
 
-        except Exception as e:
-            logger.error(f"DOCX extraction error: {e}")
-            return f"[Error extracting DOCX: {e}]"
+        doc = Document(str(source) if _is_path(source) else io.BytesIO(source))
+
+        text_parts = []
+        for paragraph in doc.paragraphs:
+            if paragraph.text.strip():
+                text_parts.append(paragraph.text)
+
+        return "\n\n".join(text_parts)
 
 
 class TxtExtractor:
     """Extract text from TXT files"""
 
+    VERSION = 1
+    # Decoding is cheaper than reading back a compressed copy
+    CACHE = False
+
     @staticmethod
-    def extract(file_bytes: bytes) -> str:
-        """Extract text from TXT bytes"""
+    def extract(source: FileSource) -> str:
+        """Extract text from TXT bytes or file path"""
+        if _is_path(source):
+            with open(source, "rb") as f:
+                if f.seek(0, io.SEEK_END) == 0:
+                    return ""
+                # Decode straight from the page cache, without a bytes copy
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    with memoryview(mapped) as view:
+                        return TxtExtractor._decode(view)
+        return TxtExtractor._decode(source)
+
+    @staticmethod
+    def _decode(data) -> str:
+        """Try UTF-8 first, fall back to latin-1"""
         try:
-            # Try UTF-8 first, fall back to latin-1
+            return str(data, 'utf-8')
+        except UnicodeDecodeError:
+            return str(data, 'latin-1', errors='replace')
+
+
+class CsvExtractor:
+    """Extract text from CSV files (streamed)"""
+
+    VERSION = 1
+    # Parsing is about as cheap as reading back a compressed copy
+    CACHE = False
+
+    @staticmethod
+    def iter_text(source: FileSource) -> Iterator[str]:
+        """Yield the rows of a CSV file as text pieces, reading incrementally"""
+        with _open_text(source, newline="") as f:
+            sample = f.read(STREAM_PIECE_CHARS)
             try:
-                return file_bytes.decode('utf-8')
-            except UnicodeDecodeError:
-                return file_bytes.decode('latin-1', errors='replace')
+                dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+            except csv.Error:
+                dialect = csv.excel
+            f.seek(0)
+            # Fields can't exceed the piece size by much: a malformed file
+            # (unclosed quote) must not turn into one giant field
+            csv.field_size_limit(STREAM_PIECE_CHARS * 16)
+            yield from _batched(_iter_table_lines(csv.reader(f, dialect)))
 
-        except Exception as e:
-            logger.error(f"TXT extraction error: {e}")
-            return f"[Error extracting TXT: {e}]"
+    @staticmethod
+    def extract(source: FileSource) -> str:
+        """Extract text from CSV bytes or file path"""
+        return "".join(CsvExtractor.iter_text(source))
+
+
+class XlsxExtractor:
+    """Extract text from XLSX files (streamed)"""
+
+    VERSION = 1
+
+    @staticmethod
+    def iter_text(source: FileSource) -> Iterator[str]:
+        """Yield the rows of each sheet as text pieces, reading incrementally"""
+        from openpyxl import load_workbook  # type: ignore
+
+        # read_only parses sheets lazily from the zip, row by row
+        workbook = load_workbook(
+            str(source) if _is_path(source) else io.BytesIO(source),
+            read_only=True,
+            data_only=True
+        )
+        try:
+            for sheet_num, sheet in enumerate(workbook.worksheets):
+                lines = _iter_table_lines(sheet.iter_rows(values_only=True))
+                # Rows end with a newline: one more makes the blank line
+                prefix = "\n" if sheet_num else ""
+                heading = f"{prefix}## Sheet: {sheet.title}\n\n"
+                yield from _batched(_chain_first(heading, lines))
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def extract(source: FileSource) -> str:
+        """Extract text from XLSX bytes or file path"""
+        return "".join(XlsxExtractor.iter_text(source))
+
+
+class PptxExtractor:
+    """Extract text from PPTX files (streamed per slide)"""
+
+    VERSION = 1
+
+    @staticmethod
+    def _shape_texts(shapes) -> Iterator[str]:
+        for shape in shapes:
+            if getattr(shape, "has_text_frame", False) and shape.text_frame.text.strip():
+                yield shape.text_frame.text.strip()
+            elif getattr(shape, "has_table", False) and shape.has_table:
+                rows = ([cell.text for cell in row.cells] for row in shape.table.rows)
+                table = "".join(_iter_table_lines(rows)).strip()
+                if table:
+                    yield table
+            elif hasattr(shape, "shapes"):
+                # Group shape
+                yield from PptxExtractor._shape_texts(shape.shapes)
+
+    @staticmethod
+    def iter_text(source: FileSource) -> Iterator[str]:
+        """Yield the text of each slide (shapes, tables and notes)"""
+        from pptx import Presentation  # type: ignore
+
+        presentation = Presentation(str(source) if _is_path(source) else io.BytesIO(source))
+        for slide_num, slide in enumerate(presentation.slides, start=1):
+            parts = [f"## Slide {slide_num}"]
+            parts.extend(PptxExtractor._shape_texts(slide.shapes))
+            if slide.has_notes_slide:
+                notes = slide.notes_slide.notes_text_frame.text.strip()
+                if notes:
+                    parts.append(f"Notes: {notes}")
+            prefix = PAGE_SEPARATOR if slide_num > 1 else ""
+            yield prefix + PAGE_SEPARATOR.join(parts)
+
+    @staticmethod
+    def extract(source: FileSource) -> str:
+        """Extract text from PPTX bytes or file path"""
+        return "".join(PptxExtractor.iter_text(source))
+
+
+class MarkdownExtractor:
+    """Extract text from Markdown files (streamed)"""
+
+    VERSION = 1
+    CACHE = False
+
+    @staticmethod
+    def iter_text(source: FileSource) -> Iterator[str]:
+        """Yield the file's text in pieces, reading line by line"""
+        with _open_text(source) as f:
+            yield from _batched(f)
+
+    @staticmethod
+    def extract(source: FileSource) -> str:
+        """Extract text from Markdown bytes or file path"""
+        return "".join(MarkdownExtractor.iter_text(source))
+
+
+class ImageExtractor:
+    """Extract text from images (OCR)"""
+
+    VERSION = 1
+
+    @staticmethod
+    def cache_variant() -> str:
+        return f"ocr-{settings.OCR_LANGUAGES}"
+
+    @staticmethod
+    def frame_count(source: FileSource) -> int:
+        """Pages in an image (multi-page TIFFs; other formats count as one)"""
+        from PIL import Image  # type: ignore
+
+        with Image.open(str(source) if _is_path(source) else io.BytesIO(source)) as image:
+            if image.format == "TIFF":
+                return getattr(image, "n_frames", 1)
+            return 1
+
+    @staticmethod
+    def iter_pages(source: FileSource) -> Iterator[str]:
+        """Yield the recognized text of each page, OCRed in parallel in the sandbox"""
+        if not ocr_available():
+            raise UnsupportedFileTypeError("Image text extraction requires OCR (tesseract is not available)")
+
+        pool = get_extraction_pool()
+        if _is_path(source):
+            source = str(source)
+        timeout = settings.OCR_PAGE_TIMEOUT_SECONDS + OCR_TASK_GRACE_SECONDS
+
+        frames = pool.run(ImageExtractor.frame_count, source)
+        futures = deque(
+            pool.submit(OCRExtractor.ocr_image_frame, source, frame, timeout=timeout)
+            for frame in range(frames)
+        )
+        try:
+            frame = 0
+            while futures:
+                frame += 1
+                yield _ocr_result(futures.popleft(), f"image page {frame}")
+        finally:
+            for future in futures:
+                future.cancel()
 
 
 class FileExtractorFactory:
@@ -84,6 +504,19 @@ class FileExtractorFactory:
         'application/pdf': PDFExtractor,
         'text/plain': TxtExtractor,
         'application/vnd.openxmlformats-officedocument.wordprocessingml.document': DocxExtractor,
+        'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': XlsxExtractor,
+        'application/vnd.openxmlformats-officedocument.presentationml.presentation': PptxExtractor,
+        'text/csv': CsvExtractor,
+        'application/csv': CsvExtractor,
+        'text/markdown': MarkdownExtractor,
+        'text/x-markdown': MarkdownExtractor,
+        'image/png': ImageExtractor,
+        'image/jpeg': ImageExtractor,
+        'image/gif': ImageExtractor,
+        'image/tiff': ImageExtractor,
+        'image/bmp': ImageExtractor,
+        'image/x-ms-bmp': ImageExtractor,
+        'image/webp': ImageExtractor,
     }
 
     @classmethod
@@ -92,12 +525,128 @@ class FileExtractorFactory:
         return cls.EXTRACTORS.get(mime_type)
 
     @classmethod
-    def extract(cls, file_bytes: bytes, mime_type: str) -> str:
-        """Extract text from file bytes"""
+    def extract(
+        cls,
+        source: FileSource,
+        mime_type: str,
+        content_hash: Optional[str] = None
+    ) -> ExtractionResult:
+        """
+        Extract text from file bytes or a file path, in the sandbox.
+
+        Args:
+            source: File bytes or file path
+            mime_type: MIME type of the file
+            content_hash: SHA-256 of the file, if known (cache key)
+
+        Returns:
+            Extraction result (text, or the error that stopped extraction)
+        """
+        start = time.perf_counter()
+        try:
+            text = "".join(cls.iter_extract(source, mime_type, content_hash))
+        except FileException as e:
+            return ExtractionResult(
+                error=e.message,
+                error_type=ExtractionResult.error_type_of(e),
+                duration_ms=(time.perf_counter() - start) * 1000
+            )
+        return ExtractionResult(text=text, duration_ms=(time.perf_counter() - start) * 1000)
+
+    @classmethod
+    def page_count(cls, source: FileSource, mime_type: str) -> Optional[int]:
+        """Number of pages, for formats that have pages (None otherwise)"""
         extractor = cls.get_extractor(mime_type)
+        if extractor is None or not hasattr(extractor, "page_count"):
+            return None
+        try:
+            return get_extraction_pool().run(
+                extractor.page_count, str(source) if _is_path(source) else source
+            )
+        except FileException:
+            return None
+
+    @classmethod
+    def iter_extract(
+        cls,
+        source: FileSource,
+        mime_type: str,
+        content_hash: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Extract text as a stream of pieces, for feeding the chunker.
+
+        Cached text is streamed from the extraction cache; otherwise the
+        file is extracted in the sandbox and the text is cached as it is
+        produced. PDFs yield one piece per page (with the page separators
+        as pieces of their own), streaming extractors pieces of about
+        STREAM_PIECE_CHARS, others a single piece; joined, the pieces are
+        the extracted text.
 
+        Args:
+            source: File bytes or file path
+            mime_type: MIME type of the file
+            content_hash: SHA-256 of the file, if known (computed otherwise)
+
+        Returns:
+            Iterator over text pieces
+
+        Raises:
+            UnsupportedFileTypeError: No extractor for the MIME type
+            ExtractionTimeoutError: Extraction exceeded EXTRACTION_TIMEOUT_SECONDS
+            ExtractionMemoryError: Extraction exceeded EXTRACTION_MEMORY_LIMIT_MB
+            ExtractionWorkerError: Extraction worker crashed
+            FileProcessingError: The extractor failed (e.g. malformed file)
+        """
+        extractor = cls.get_extractor(mime_type)
         if not extractor:
             logger.warning(f"No extractor for MIME type: {mime_type}")
-            return f"[Unsupported file type: {mime_type}]"
+            raise UnsupportedFileTypeError(f"Unsupported file type: {mime_type}")
 
-        return extractor.extract(file_bytes)
+        cache = get_extraction_cache() if getattr(extractor, "CACHE", True) else None
+        if cache is None:
+            yield from cls._iter_sandboxed(extractor, source, mime_type)
+            return
+
+        if content_hash is None:
+            content_hash = (
+                calculate_path_hash(str(source)) if _is_path(source) else calculate_file_hash(source)
+            )
+        variant = extractor.cache_variant() if hasattr(extractor, "cache_variant") else ""
+        key = cache.key(content_hash, extractor, variant)
+
+        cached = cache.read(key)
+        if cached is not None:
+            yield from cached
+            return
+
+        writer = cache.writer(key)
+        try:
+            for piece in cls._iter_sandboxed(extractor, source, mime_type):
+                writer.write(piece)
+                yield piece
+            writer.commit()
+        finally:
+            # Failed, or the consumer stopped early: don't cache partial text
+            writer.discard()
+
+    @classmethod
+    def _iter_sandboxed(cls, extractor, source: FileSource, mime_type: str) -> Iterator[str]:
+        """Run an extractor in the sandbox"""
+        try:
+            if hasattr(extractor, "iter_pages"):
+                for page_num, page in enumerate(extractor.iter_pages(source)):
+                    if page_num:
+                        yield PAGE_SEPARATOR
+                    yield page
+            elif hasattr(extractor, "iter_text"):
+                yield from get_extraction_pool().iter(
+                    extractor.iter_text, str(source) if _is_path(source) else source
+                )
+            else:
+                yield get_extraction_pool().run(
+                    extractor.extract, str(source) if _is_path(source) else source
+                )
+        except FileException as e:
+            logger.error(f"Extraction error ({mime_type}): {e.message}")
+            raise
@@ -0,0 +1,175 @@
+"""
+SIMBA Backend - OCR
+
+Text recognition for images and scanned PDF pages (pytesseract + Pillow).
+
+Each page is an extraction sandbox task, so pages are recognized in
+parallel across the worker processes. A page is rendered (PDF) or loaded
+(image), preprocessed - grayscale, downscaled to OCR_MAX_DIMENSION and
+deskewed - and passed to tesseract with OCR_PAGE_TIMEOUT_SECONDS as its
+time limit.
+
+Recognized text is cached in the extraction cache keyed by the hash of the
+page image (and the OCR languages), so the same scan is only recognized
+once, even inside different files.
+"""
+
+import hashlib
+import io
+import shutil
+from functools import lru_cache
+from typing import Union
+
+from app.config import settings
+from app.services.file_processing.cache import get_extraction_cache
+from app.utils.logger import logger
+
+
+# Deskew search: angles tried (degrees) and the image size used to score them
+DESKEW_MAX_ANGLE = 5.0
+DESKEW_STEP = 0.5
+DESKEW_SAMPLE_SIZE = 800
+
+
+@lru_cache(maxsize=1)
+def ocr_available() -> bool:
+    """Whether OCR is enabled and the tesseract binary is installed"""
+    if not settings.OCR_ENABLED:
+        return False
+    try:
+        import pytesseract  # type: ignore  # noqa: F401
+    except ImportError:
+        logger.warning("pytesseract not installed, OCR disabled")
+        return False
+    if not shutil.which(settings.TESSERACT_CMD or "tesseract"):
+        logger.warning("tesseract binary not found, OCR disabled")
+        return False
+    return True
+
+
+class OCRExtractor:
+    """Recognize text in page images"""
+
+    VERSION = 1
+
+    @staticmethod
+    def preprocess(image):
+        """Grayscale, downscale and deskew an image for recognition"""
+        from PIL import Image  # type: ignore
+
+        image = image.convert("L")
+
+        longest = max(image.size)
+        if longest > settings.OCR_MAX_DIMENSION:
+            scale = settings.OCR_MAX_DIMENSION / longest
+            image = image.resize(
+                (max(1, int(image.width * scale)), max(1, int(image.height * scale))),
+                Image.LANCZOS
+            )
+
+        angle = OCRExtractor.skew_angle(image)
+        if angle:
+            image = image.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=255)
+        return image
+
+    @staticmethod
+    def skew_angle(image) -> float:
+        """
+        Estimate the skew of a text image (projection profile method).
+
+        Text lines of a correctly rotated page give row sums with sharp
+        peaks and gaps; the rotation maximizing their variance wins.
+        """
+        import numpy as np
+
+        sample = image.copy()
+        sample.thumbnail((DESKEW_SAMPLE_SIZE, DESKEW_SAMPLE_SIZE))
+        # Ink bright, paper dark: rows crossing text lines sum high
+        ink = sample.point(lambda value: 255 if value < 128 else 0)
+
+        best_angle = 0.0
+        best_score = -1.0
+        steps = int(DESKEW_MAX_ANGLE / DESKEW_STEP)
+        for step in range(-steps, steps + 1):
+            angle = step * DESKEW_STEP
+            rows = np.asarray(ink.rotate(angle, fillcolor=0), dtype=np.float32).sum(axis=1)
+            score = float(rows.var())
+            if score > best_score:
+                best_angle, best_score = angle, score
+        return best_angle
+
+    @staticmethod
+    def recognize(image, cache_key_data: bytes) -> str:
+        """
+        Recognize text in an image, using the cache.
+
+        Args:
+            image: PIL image
+            cache_key_data: Bytes identifying the image (raw pixels)
+
+        Returns:
+            Recognized text
+        """
+        import pytesseract  # type: ignore
+
+        languages = settings.OCR_LANGUAGES
+        image_hash = hashlib.sha256(cache_key_data + languages.encode()).hexdigest()
+
+        cache = get_extraction_cache()
+        key = cache.key(image_hash, OCRExtractor) if cache is not None else None
+        if cache is not None:
+            cached = cache.read(key)
+            if cached is not None:
+                return "".join(cached)
+
+        if settings.TESSERACT_CMD:
+            pytesseract.pytesseract.tesseract_cmd = settings.TESSERACT_CMD
+
+        # tesseract runs as a subprocess; its own timeout kills it, the
+        # sandbox task timeout is the backstop
+        text = pytesseract.image_to_string(
+            OCRExtractor.preprocess(image),
+            lang=languages,
+            timeout=settings.OCR_PAGE_TIMEOUT_SECONDS
+        ).strip()
+
+        if cache is not None:
+            writer = cache.writer(key)
+            try:
+                writer.write(text)
+                writer.commit()
+            finally:
+                writer.discard()
+        return text
+
+    @staticmethod
+    def ocr_pdf_page(source: Union[bytes, str], page_num: int) -> str:
+        """Render a PDF page and recognize its text (runs in a sandbox worker)"""
+        import fitz  # type: ignore
+        from PIL import Image  # type: ignore
+
+        if isinstance(source, str):
+            pdf_document = fitz.open(source, filetype="pdf")
+        else:
+            pdf_document = fitz.open(stream=source, filetype="pdf")
+        with pdf_document:
+            pixmap = pdf_document[page_num].get_pixmap(dpi=settings.OCR_DPI, colorspace=fitz.csGRAY)
+            image = Image.frombytes("L", (pixmap.width, pixmap.height), pixmap.samples)
+            key_data = pixmap.samples + f"{pixmap.width}x{pixmap.height}".encode()
+        return OCRExtractor.recognize(image, key_data)
+
+    @staticmethod
+    def ocr_image_frame(source: Union[bytes, str], frame: int) -> str:
+        """Recognize the text of an image (frame of a multi-page TIFF/GIF)"""
+        from PIL import Image  # type: ignore
+
+        with Image.open(source if isinstance(source, str) else io.BytesIO(source)) as image:
+            image.seek(frame)
+            image = image.convert("L")
+            key_data = image.tobytes() + f"{image.width}x{image.height}".encode()
+        return OCRExtractor.recognize(image, key_data)
+
+
+def needs_ocr(text: str, has_images: bool) -> bool:
+    """Whether a PDF page has no usable text layer and should be OCRed"""
+    return has_images and len(text.strip()) < settings.OCR_MIN_PAGE_CHARS
@@ -0,0 +1,355 @@
+"""
+SIMBA Backend - Extraction Sandbox
+
+Pool of worker processes for text extraction.
+
+Parsing untrusted files is the riskiest CPU work the backend does: a
+malformed or hostile PDF/DOCX can spin forever or allocate without bound.
+Extraction therefore never runs in the API process. Each task is sent to a
+worker process that:
+
+    - runs under an address-space limit (EXTRACTION_MEMORY_LIMIT_MB,
+      RLIMIT_AS), so a runaway allocation fails inside the worker;
+    - is killed if the task exceeds its wall-clock timeout
+      (EXTRACTION_TIMEOUT_SECONDS);
+    - is replaced after EXTRACTION_MAX_TASKS_PER_WORKER tasks, so leaked
+      memory or parser state doesn't accumulate.
+
+Workers are started with the "spawn" method: the API process runs an
+event loop and threads, which must not be forked.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional, Set
+
+from app.config import settings
+from app.utils.exceptions import (
+    ExtractionMemoryError,
+    ExtractionTimeoutError,
+    ExtractionWorkerError,
+    FileProcessingError,
+)
+from app.utils.logger import logger
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def _worker_main(conn, memory_limit_mb: int):
+    """Worker process loop: run tasks received on conn until told to stop"""
+    if memory_limit_mb and resource is not None:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        if task is None:
+            return
+
+        mode, fn, args = task
+        try:
+            if mode == "iter":
+                # Stream items back as they are produced; the pipe applies
+                # backpressure when the parent falls behind
+                for item in fn(*args):
+                    conn.send(("item", item))
+                reply = ("ok", None)
+            else:
+                reply = ("ok", fn(*args))
+        except MemoryError:
+            reply = ("memory", "Extraction exceeded the memory limit")
+        except Exception as e:
+            reply = ("error", f"{type(e).__name__}: {e}")
+
+        try:
+            conn.send(reply)
+        except MemoryError:
+            conn.send(("memory", "Extraction result exceeded the memory limit"))
+
+
+class _Worker:
+    """A worker process and the parent's end of its pipe"""
+
+    def __init__(self, context, memory_limit_mb: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, memory_limit_mb),
+            name="simba-extraction",
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=5)
+        self.conn.close()
+
+
+class ExtractionPool:
+    """
+    Sandboxed extraction worker pool.
+
+    Tasks are module-level functions (they are pickled by reference) and
+    their arguments/results must be picklable.
+
+    Usage:
+        pool = ExtractionPool(workers=4)
+        text = pool.run(DocxExtractor.extract, path)
+        future = pool.submit(extract_pages, path, 0, 16)
+        for piece in pool.iter(iter_text, path):
+            ...
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        timeout: Optional[float] = None,
+        memory_limit_mb: Optional[int] = None,
+        max_tasks_per_worker: Optional[int] = None
+    ):
+        """
+        Initialize pool (worker processes are started on demand).
+
+        Args:
+            workers: Maximum number of worker processes
+            timeout: Default wall-clock limit per task in seconds
+            memory_limit_mb: Address space limit per worker (0 = unlimited)
+            max_tasks_per_worker: Tasks after which a worker is replaced
+        """
+        self.workers = max(1, workers)
+        self.timeout = timeout or settings.EXTRACTION_TIMEOUT_SECONDS
+        self.memory_limit_mb = (
+            settings.EXTRACTION_MEMORY_LIMIT_MB if memory_limit_mb is None else memory_limit_mb
+        )
+        self.max_tasks_per_worker = max(
+            1, max_tasks_per_worker or settings.EXTRACTION_MAX_TASKS_PER_WORKER
+        )
+
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: "queue.SimpleQueue[_Worker]" = queue.SimpleQueue()
+        self._all: Set[_Worker] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        # One dispatcher thread per worker: a submitted task waits in the
+        # executor queue until a worker is free
+        self._dispatch = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="simba-extraction"
+        )
+
+        if self.memory_limit_mb and resource is None:
+            logger.warning("Extraction memory limit not supported on this platform")
+
+    def run(self, fn: Callable[..., Any], *args, timeout: Optional[float] = None) -> Any:
+        """
+        Run a task in a worker process and wait for its result.
+
+        Args:
+            fn: Module-level function to call
+            *args: Arguments for fn
+            timeout: Wall-clock limit in seconds (default: pool timeout)
+
+        Returns:
+            Return value of fn
+
+        Raises:
+            ExtractionTimeoutError: Task exceeded the time limit (worker killed)
+            ExtractionMemoryError: Task exceeded the memory limit
+            ExtractionWorkerError: Worker process died
+            FileProcessingError: Task raised an exception
+        """
+        timeout = timeout or self.timeout
+        worker = self._checkout()
+        try:
+            worker.tasks += 1
+            self._send(worker, ("call", fn, args))
+            status, payload = self._receive(worker, timeout)
+        finally:
+            self._checkin(worker)
+
+        return self._result(status, payload)
+
+    def iter(self, fn: Callable[..., Iterable[Any]], *args, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Run a generator task in a worker process, streaming its items.
+
+        The time limit applies to producing each item, so long streams are
+        not cut off while a stalled parser still is. A stream abandoned by
+        the consumer kills its worker.
+
+        Args:
+            fn: Module-level generator function
+            *args: Arguments for fn
+            timeout: Wall-clock limit in seconds per item (default: pool timeout)
+
+        Returns:
+            Iterator over the items fn yields
+
+        Raises:
+            Same as run()
+        """
+        timeout = timeout or self.timeout
+        worker = self._checkout()
+        finished = False
+        try:
+            worker.tasks += 1
+            self._send(worker, ("iter", fn, args))
+            while True:
+                status, payload = self._receive(worker, timeout)
+                if status != "item":
+                    finished = True
+                    self._result(status, payload)
+                    return
+                yield payload
+        finally:
+            if not finished:
+                worker.kill()
+            self._checkin(worker)
+
+    @staticmethod
+    def _send(worker: _Worker, task: tuple):
+        try:
+            worker.conn.send(task)
+        except (EOFError, OSError) as e:
+            worker.kill()
+            raise ExtractionWorkerError(
+                f"Extraction worker died (exit code {worker.process.exitcode})"
+            ) from e
+
+    @staticmethod
+    def _receive(worker: _Worker, timeout: float) -> tuple:
+        """Wait for a worker's next message, killing it on timeout or death"""
+        try:
+            if not worker.conn.poll(timeout):
+                worker.kill()
+                raise ExtractionTimeoutError(
+                    f"Extraction timed out after {timeout:.0f}s",
+                    details={"timeout": timeout}
+                )
+            return worker.conn.recv()
+        except (EOFError, OSError) as e:
+            worker.kill()
+            raise ExtractionWorkerError(
+                f"Extraction worker died (exit code {worker.process.exitcode})"
+            ) from e
+
+    def _result(self, status: str, payload: Any) -> Any:
+        if status == "ok":
+            return payload
+        if status == "memory":
+            raise ExtractionMemoryError(payload, details={"limit_mb": self.memory_limit_mb})
+        raise FileProcessingError(payload)
+
+    def submit(self, fn: Callable[..., Any], *args, timeout: Optional[float] = None) -> Future:
+        """Run a task in the background; see run()"""
+        return self._dispatch.submit(self.run, fn, *args, timeout=timeout)
+
+    def shutdown(self):
+        """Stop all worker processes"""
+        with self._lock:
+            self._closed = True
+            workers = list(self._all)
+            self._all.clear()
+        self._dispatch.shutdown(wait=False, cancel_futures=True)
+        for worker in workers:
+            worker.stop()
+        # Release checkouts blocked waiting for a worker
+        for _ in range(self.workers):
+            self._idle.put(_FREE_SLOT)
+
+    def _checkout(self) -> _Worker:
+        """Take an idle worker, starting one if the pool isn't full"""
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    if self._closed:
+                        raise ExtractionWorkerError("Extraction pool is shut down")
+                    if len(self._all) < self.workers:
+                        worker = _Worker(self._context, self.memory_limit_mb)
+                        self._all.add(worker)
+                        return worker
+                worker = self._idle.get()
+
+            if worker is _FREE_SLOT:
+                continue
+            if worker.alive:
+                return worker
+            # Died while idle
+            self._discard(worker)
+
+    def _checkin(self, worker: _Worker):
+        """Return a worker to the pool, replacing it if spent or dead"""
+        if self._closed or not worker.alive or worker.tasks >= self.max_tasks_per_worker:
+            self._discard(worker)
+            if worker.alive:
+                worker.stop()
+            return
+        self._idle.put(worker)
+
+    def _discard(self, worker: _Worker):
+        with self._lock:
+            self._all.discard(worker)
+        # Wake a checkout waiting for a free slot
+        self._idle.put(_FREE_SLOT)
+
+
+# Put on the idle queue when a worker slot frees up
+_FREE_SLOT: Any = object()
+
+
+_pool: Optional[ExtractionPool] = None
+_pool_lock = threading.Lock()
+
+
+def extraction_workers() -> int:
+    """Number of extraction processes"""
+    return settings.EXTRACTION_WORKERS or os.cpu_count() or 1
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Get the process-wide extraction pool"""
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ExtractionPool(workers=extraction_workers())
+                logger.info(f"Extraction pool ready ({extraction_workers()} processes)")
+
+    return _pool
+
+
+def shutdown_extraction_pool():
+    """Stop the extraction pool"""
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
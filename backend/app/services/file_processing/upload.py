@@ -0,0 +1,216 @@
+"""
+SIMBA Backend - Streaming File Upload
+
+Receive multipart uploads straight to the spool directory.
+
+The request body is parsed as it arrives and the file part is written to
+disk chunk by chunk, so memory use per upload is bounded by the network
+chunk size instead of the file size. The SHA-256 of the file is computed
+on the fly and the upload is aborted as soon as it exceeds
+MAX_UPLOAD_SIZE_MB.
+"""
+
+import hashlib
+import mimetypes
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from multipart.multipart import MultipartParser, parse_options_header
+from starlette.requests import Request
+
+from app.config import settings
+from app.utils.exceptions import FileUploadError, FileTooLargeError
+from app.utils.logger import logger
+from app.utils.validators import validate_file_size
+
+
+# Allowance for multipart boundaries and part headers in Content-Length
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+@dataclass
+class SpooledUpload:
+    """A file received into the spool directory"""
+    path: str
+    filename: str
+    content_type: str
+    size_bytes: int
+    sha256: str
+
+
+def spool_path(upload_id: str) -> Path:
+    """Location of a spooled upload"""
+    return Path(settings.INGESTION_SPOOL_DIRECTORY) / upload_id
+
+
+def discard_spool(path: Optional[str]):
+    """Delete a spooled upload"""
+    if path:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+class _FilePartWriter:
+    """MultipartParser callbacks that write one file field to disk"""
+
+    def __init__(self, field: str, out, max_bytes: int):
+        self.field = field
+        self.out = out
+        self.max_bytes = max_bytes
+        self.hasher = hashlib.sha256()
+        self.size = 0
+        self.found = False
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._active = False
+
+    def callbacks(self) -> Dict[str, object]:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self):
+        self._headers = {}
+        self._active = False
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("utf-8", errors="replace")
+        if name != self.field or b"filename" not in options or self.found:
+            return
+
+        self._active = True
+        self.found = True
+        self.filename = options[b"filename"].decode("utf-8", errors="replace")
+        content_type, _ = parse_options_header(
+            self._headers.get(b"content-type", b"application/octet-stream")
+        )
+        self.content_type = content_type.decode("latin-1")
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        if not self._active:
+            return
+        chunk = data[start:end]
+        self.size += len(chunk)
+        if not validate_file_size(self.size):
+            raise FileTooLargeError(
+                f"File exceeds maximum upload size of {settings.MAX_UPLOAD_SIZE_MB} MB",
+                details={"max_bytes": self.max_bytes}
+            )
+        self.hasher.update(chunk)
+        # Network chunks are small (~64KB); writing them to the page cache
+        # inline is cheaper than a thread hop per chunk
+        self.out.write(chunk)
+
+    def on_part_end(self):
+        self._active = False
+
+
+async def receive_upload(
+    request: Request,
+    destination: Path,
+    field: str = "file",
+    required: bool = True
+) -> Optional[SpooledUpload]:
+    """
+    Stream a multipart file field from the request body to disk.
+
+    Args:
+        request: Incoming request with a multipart/form-data body
+        destination: Where to store the file
+        field: Name of the form field holding the file
+        required: Raise if the request carries no such file
+
+    Returns:
+        Spooled upload, or None if the file is missing and not required
+
+    Raises:
+        FileTooLargeError: Body or file exceeds MAX_UPLOAD_SIZE_MB
+        FileUploadError: Malformed request or missing file
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in options:
+        if required:
+            raise FileUploadError("Expected a multipart/form-data upload")
+        return None
+
+    max_bytes = settings.max_upload_size_bytes
+
+    # Reject before reading anything if the client declares an oversize body
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit():
+        if int(content_length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+            raise FileTooLargeError(
+                f"File exceeds maximum upload size of {settings.MAX_UPLOAD_SIZE_MB} MB",
+                details={"max_bytes": max_bytes, "content_length": int(content_length)}
+            )
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    partial = destination.with_name(f"{destination.name}.{uuid.uuid4().hex[:8]}.part")
+
+    try:
+        with open(partial, "wb") as out:
+            writer = _FilePartWriter(field, out, max_bytes)
+            parser = MultipartParser(options[b"boundary"], writer.callbacks())
+            async for chunk in request.stream():
+                parser.write(chunk)
+            parser.finalize()
+
+        if not writer.found:
+            if required:
+                raise FileUploadError(f"Missing file field '{field}'")
+            discard_spool(str(partial))
+            return None
+
+        os.replace(partial, destination)
+
+    except FileTooLargeError:
+        logger.warning(f"Upload aborted after {writer.size} bytes: over {settings.MAX_UPLOAD_SIZE_MB} MB")
+        discard_spool(str(partial))
+        raise
+    except FileUploadError:
+        discard_spool(str(partial))
+        raise
+    except Exception as e:
+        discard_spool(str(partial))
+        raise FileUploadError(f"Upload failed: {e}") from e
+
+    filename = writer.filename or "upload"
+    content_type = writer.content_type
+    if not content_type or content_type == "application/octet-stream":
+        # Clients often send no specific type for .md/.csv files
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    return SpooledUpload(
+        path=str(destination),
+        filename=filename,
+        content_type=content_type,
+        size_bytes=writer.size,
+        sha256=writer.hasher.hexdigest(),
+    )
@@ -0,0 +1,15 @@
+"""
+SIMBA Backend - Ingestion Services
+
+Background extraction and indexing of uploaded documents.
+"""
+
+from app.services.ingestion.worker import (
+    IngestionWorker,
+    get_ingestion_worker,
+)
+
+__all__ = [
+    "IngestionWorker",
+    "get_ingestion_worker",
+]
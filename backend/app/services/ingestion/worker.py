@@ -0,0 +1,422 @@
+"""
+SIMBA Backend - Ingestion Worker
+
+Background processing of uploaded documents.
+
+Uploads are streamed to the spool directory and recorded as IngestionJob
+rows; workers claim queued jobs from the database and run them through
+two stages:
+
+    extract  - spooled file -> extracted text (DocumentContent.content)
+    index    - extracted text -> vector store (chunk, embed, insert)
+
+When the job will be indexed, the two stages run as one pipeline: pages
+are fed to the chunker as the extractor yields them, so embedding starts
+before the whole file has been extracted.
+
+A failed stage is retried with exponential backoff up to
+INGESTION_MAX_RETRIES times; completed stages are not repeated. Because the
+queue lives in the database, workers can run inside the API process
+(INGESTION_WORKER_MODE=inprocess) or in a separate process started with
+scripts/ingestion_worker.py, and a job whose worker dies is requeued once
+its heartbeat lease expires.
+
+Documents uploaded through the API reference deduplicated content
+(DocumentContent, keyed by file hash): if another upload of the same file
+has already been extracted or indexed, the stage reuses that result.
+"""
+
+import asyncio
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from app.config import settings
+from app.db.blob_store import TextWriter
+from app.db.search import MAX_BODY_CHARS
+from app.db.session import AsyncSessionLocal, submit_write
+from app.repositories import (
+    DocumentRepository,
+    DocumentContentRepository,
+    IngestionJobRepository,
+)
+from app.services.file_processing.upload import discard_spool
+from app.utils.exceptions import FileProcessingError, UnsupportedFileTypeError
+from app.utils.logger import logger
+
+
+class IngestionWorker:
+    """
+    Pool of ingestion job runners.
+
+    Usage:
+        worker = IngestionWorker()
+        await worker.start()
+        ...
+        await worker.stop()
+    """
+
+    def __init__(self, concurrency: Optional[int] = None, worker_id: Optional[str] = None):
+        """
+        Initialize worker.
+
+        Args:
+            concurrency: Jobs processed at once (default: INGESTION_CONCURRENCY)
+            worker_id: Identifier recorded on claimed jobs (default: host:pid)
+        """
+        self.concurrency = max(1, concurrency or settings.INGESTION_CONCURRENCY)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    async def start(self):
+        """Start the job runners (call from a running loop)"""
+        if self._running:
+            return
+        self._running = True
+        self._wakeup = asyncio.Event()
+
+        # Jobs left running by a previous, crashed process
+        await self.requeue_stale()
+
+        self._tasks = [
+            asyncio.create_task(self._run_loop(slot))
+            for slot in range(self.concurrency)
+        ]
+        self._tasks.append(asyncio.create_task(self._maintenance_loop()))
+        logger.info(f"Ingestion worker {self.worker_id} started ({self.concurrency} slots)")
+
+    async def stop(self):
+        """Stop the job runners; interrupted jobs are requeued"""
+        if not self._running:
+            return
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info(f"Ingestion worker {self.worker_id} stopped")
+
+    def notify(self):
+        """Wake idle runners (a job was just enqueued in this process)"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def requeue_stale(self) -> int:
+        """Requeue jobs whose worker stopped sending heartbeats"""
+        count = await submit_write(lambda db: IngestionJobRepository(db).requeue_stale(
+            settings.INGESTION_JOB_LEASE_SECONDS,
+            settings.INGESTION_MAX_RETRIES
+        ))
+        if count:
+            logger.warning(f"Requeued {count} stale ingestion jobs")
+        return count
+
+    async def _maintenance_loop(self):
+        interval = max(1.0, settings.INGESTION_JOB_LEASE_SECONDS / 2)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if await self.requeue_stale():
+                    self.notify()
+            except Exception as e:
+                logger.error(f"Ingestion maintenance error: {e}")
+
+    async def _run_loop(self, slot: int):
+        while True:
+            try:
+                job_id = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ingestion worker slot {slot} failed to claim a job: {e}")
+                job_id = None
+
+            if job_id is None:
+                # Idle: sleep until notified or the next poll
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), settings.INGESTION_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self.process(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Leave the job to the stale-lease sweep rather than lose the slot
+                logger.error(f"Ingestion job {job_id} crashed: {e}")
+
+    async def _claim(self) -> Optional[str]:
+        job = await submit_write(lambda db: IngestionJobRepository(db).claim_next(self.worker_id))
+        return job.id if job else None
+
+    async def _heartbeat(self, job_id: str):
+        interval = max(1.0, settings.INGESTION_JOB_LEASE_SECONDS / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await submit_write(lambda db: IngestionJobRepository(db).heartbeat(job_id, self.worker_id))
+            except Exception as e:
+                logger.warning(f"Ingestion job {job_id} heartbeat failed: {e}")
+
+    async def _update_job(self, job_id: str, **values):
+        await submit_write(lambda db: IngestionJobRepository(db).update(job_id, **values))
+
+    async def process(self, job_id: str):
+        """
+        Run a claimed job's remaining stages.
+
+        Args:
+            job_id: ID of a job claimed by this worker
+        """
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            async with AsyncSessionLocal() as db:
+                job = await IngestionJobRepository(db).get(job_id)
+            if job is None:
+                return
+
+            while job.stage != "done":
+                try:
+                    if job.stage == "extract":
+                        await self._extract(job)
+                    elif job.stage == "index":
+                        await self._index(job)
+                    else:
+                        raise ValueError(f"Unknown ingestion stage: {job.stage}")
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    await self._fail_stage(job, e)
+                    return
+
+                async with AsyncSessionLocal() as db:
+                    job = await IngestionJobRepository(db).get(job_id)
+
+            await self._update_job(
+                job_id,
+                status="completed",
+                progress=1.0,
+                message="Completed",
+                finished_at=datetime.utcnow()
+            )
+            discard_spool(job.spool_path)
+            logger.info(f"Ingestion job {job_id} completed ({job.num_chunks} chunks)")
+
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back to the queue
+            await asyncio.shield(self._update_job(job_id, status="queued", message="Interrupted by shutdown"))
+            raise
+        finally:
+            heartbeat.cancel()
+
+    async def _fail_stage(self, job, error: Exception):
+        attempts = (job.attempts or 0) + 1
+        logger.error(f"Ingestion job {job.id} stage '{job.stage}' failed (attempt {attempts}): {error}")
+
+        # The same file would fail extraction the same way again; only a
+        # crashed extraction worker is worth a retry
+        permanent = isinstance(error, (FileProcessingError, UnsupportedFileTypeError))
+
+        if permanent or attempts >= settings.INGESTION_MAX_RETRIES:
+            await self._update_job(
+                job.id,
+                status="failed",
+                attempts=attempts,
+                message=f"{job.stage} failed: {error}",
+                finished_at=datetime.utcnow()
+            )
+            discard_spool(job.spool_path)
+            return
+
+        backoff = settings.INGESTION_RETRY_BACKOFF * 2 ** (attempts - 1)
+        await self._update_job(
+            job.id,
+            status="queued",
+            attempts=attempts,
+            message=f"{job.stage} failed, retrying in {backoff:.0f}s: {error}",
+            run_after=datetime.utcnow() + timedelta(seconds=backoff)
+        )
+
+    async def _extract(self, job):
+        from app.services.file_processing import FileExtractorFactory
+
+        await self._update_job(job.id, message="Extracting text")
+
+        async with AsyncSessionLocal() as db:
+            document = await DocumentRepository(db).get(job.document_id)
+            if document is None:
+                raise ValueError(f"Document {job.document_id} no longer exists")
+            content = None
+            if document.content_hash:
+                content_repo = DocumentContentRepository(db)
+                shared = await content_repo.get(document.content_hash)
+                if shared is not None and shared.content_length is not None:
+                    # Same file was extracted meanwhile by another upload
+                    content = await content_repo.get_content(document.content_hash)
+
+        if content is not None:
+            next_stage = "index" if job.auto_index and content.strip() else "done"
+        elif job.auto_index:
+            # Extract and index in one pass
+            await self._index(job, stream=True)
+            return
+        else:
+            # Streamed to storage, never held in memory as a whole
+            content = TextWriter(head_chars=MAX_BODY_CHARS)
+            next_stage = "done"
+
+            def extract():
+                for piece in FileExtractorFactory.iter_extract(
+                    job.spool_path, document.mime_type, document.content_hash
+                ):
+                    content.write(piece)
+
+            try:
+                await asyncio.to_thread(extract)
+            except BaseException:
+                content.discard()
+                raise
+
+        async with AsyncSessionLocal() as db:
+            if document.content_hash:
+                await DocumentContentRepository(db).set_content(document.content_hash, content)
+            else:
+                await DocumentRepository(db).set_content(job.document_id, content)
+            await IngestionJobRepository(db).update(
+                job.id, stage=next_stage, attempts=0, progress=0.3
+            )
+            await db.commit()
+
+    async def _index(self, job, stream: bool = False):
+        """
+        Index a document's content.
+
+        Args:
+            job: Job being processed
+            stream: Extract the spooled file while indexing, instead of
+                reading the content stored by the extract stage
+        """
+        from app.services.file_processing import FileExtractorFactory
+        from app.services.rag import RAGService
+
+        await self._update_job(job.id, message="Extracting and indexing" if stream else "Indexing")
+
+        async with AsyncSessionLocal() as db:
+            document = await DocumentRepository(db).get(job.document_id)
+            if document is None:
+                raise ValueError(f"Document {job.document_id} no longer exists")
+
+            writer: Optional[TextWriter] = None
+            pieces = 0
+            if stream:
+                total_pages = await asyncio.to_thread(
+                    FileExtractorFactory.page_count, job.spool_path, document.mime_type
+                )
+                # The pieces are also streamed to storage as the extracted text
+                writer = TextWriter(head_chars=MAX_BODY_CHARS)
+
+                def extracted():
+                    nonlocal pieces
+                    stream = FileExtractorFactory.iter_extract(
+                        job.spool_path, document.mime_type, document.content_hash
+                    )
+                    for piece in stream:
+                        writer.write(piece)
+                        pieces += 1
+                        yield piece
+
+                content = extracted()
+            else:
+                content = await DocumentRepository(db).get_content(document) or ""
+                total_chars = max(1, len(content))
+
+            rag_service = RAGService(db)
+            content_repo = DocumentContentRepository(db)
+
+            async def on_progress(chunks: int, chars: int):
+                if not stream:
+                    done = chars / total_chars
+                elif total_pages:
+                    # Pieces alternate page / separator
+                    done = (pieces + 1) / 2 / total_pages
+                else:
+                    done = 0.5
+                await self._update_job(
+                    job.id,
+                    num_chunks=chunks,
+                    progress=0.3 + 0.7 * min(done, 0.99)
+                )
+
+            try:
+                # Chunk IDs are content-addressed, so a retried stage re-uses
+                # whatever a previous attempt already wrote
+                if document.content_hash:
+                    shared = await content_repo.get(document.content_hash)
+                    if shared is None:
+                        raise ValueError(f"Content {document.content_hash[:12]} is no longer referenced")
+
+                    if shared.vector_ids is not None:
+                        # Indexed meanwhile by another upload of the same file
+                        vector_ids = shared.vector_ids
+                    else:
+                        vector_ids = await rag_service.index_content(
+                            content_hash=document.content_hash,
+                            content=content,
+                            metadata={"mime_type": document.mime_type},
+                            on_progress=on_progress
+                        )
+                        if not await content_repo.exists(document.content_hash):
+                            # Last reference was deleted while indexing
+                            await rag_service.delete_content(document.content_hash)
+                            raise ValueError(f"Content {document.content_hash[:12]} is no longer referenced")
+                        if stream:
+                            await content_repo.set_content(document.content_hash, writer)
+                        await content_repo.update(document.content_hash, vector_ids=vector_ids)
+                else:
+                    vector_ids = await rag_service.index_document(
+                        document_id=document.id,
+                        conversation_id=document.conversation_id,
+                        content=content,
+                        metadata={
+                            "filename": document.filename,
+                            "mime_type": document.mime_type
+                        },
+                        on_progress=on_progress
+                    )
+
+                    if stream:
+                        await DocumentRepository(db).set_content(document.id, writer)
+
+                await DocumentRepository(db).update(document.id, vector_ids=vector_ids)
+                await IngestionJobRepository(db).update(
+                    job.id, stage="done", attempts=0, num_chunks=len(vector_ids)
+                )
+                await db.commit()
+            finally:
+                if writer is not None:
+                    # Published or no longer needed
+                    writer.discard()
+
+
+# Global instance
+_ingestion_worker: Optional[IngestionWorker] = None
+
+
+def get_ingestion_worker() -> IngestionWorker:
+    """Get the process-wide ingestion worker"""
+    global _ingestion_worker
+
+    if _ingestion_worker is None:
+        _ingestion_worker = IngestionWorker()
+
+    return _ingestion_worker
@@ -6,9 +6,15 @@ RAG (Retrieval-Augmented Generation) services.
 
 from app.services.rag.embeddings_service import EmbeddingsService, get_embeddings_service
 from app.services.rag.rag_service import RAGService
+from app.services.rag.lexical_index import BM25Index, LexicalIndexStore, get_lexical_store
+from app.services.rag.fusion import reciprocal_rank_fusion
 
 __all__ = [
     "EmbeddingsService",
     "get_embeddings_service",
     "RAGService",
+    "BM25Index",
+    "LexicalIndexStore",
+    "get_lexical_store",
+    "reciprocal_rank_fusion",
 ]
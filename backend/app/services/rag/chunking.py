@@ -0,0 +1,231 @@
+"""
+SIMBA Backend - Text Chunking
+
+Token-aware, streaming text chunker used for RAG indexing.
+
+Chunks are measured in tokens of the embedding model (so they are never
+silently truncated at embedding time) and prefer to break at headings,
+paragraphs and sentences, in that order. Input may be a string or any
+iterable of text pieces (e.g. pages as an extractor produces them); the
+text is processed in a single linear pass and chunks are yielded lazily,
+so memory use is bounded by the chunk size, not by the document size.
+"""
+
+import re
+from collections import deque
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Tuple, Union
+
+from app.config import settings
+from app.utils.logger import logger
+
+
+# Batch token counter: list of strings -> list of token counts
+TokenCounter = Callable[[List[str]], List[int]]
+
+PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n\s*")
+SENTENCE_BREAK = re.compile(r"(?<=[.!?;:])\s+|\n")
+HEADING = re.compile(r"^(#{1,6}\s+\S|(?=[^a-z]*[A-Z])[A-Z0-9][A-Z0-9 .:/&-]{2,80}$)")
+WORD_TOKEN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+# A paragraph without blank lines is force-split once it grows past this
+MAX_PARAGRAPH_CHARS = 64 * 1024
+
+
+def approximate_token_counts(texts: List[str]) -> List[int]:
+    """Rough WordPiece-like token estimate (words + punctuation, long words split)"""
+    return [
+        sum(1 + len(token) // 8 for token in WORD_TOKEN.findall(text))
+        for text in texts
+    ]
+
+
+def get_token_counter() -> Tuple[TokenCounter, Optional[int]]:
+    """
+    Token counter matching the embedding model, and the model's max tokens.
+
+    Falls back to a regex approximation if the model tokenizer is not
+    available (e.g. sentence-transformers not installed).
+    """
+    try:
+        from app.services.rag.embeddings_service import get_embeddings_service
+
+        embeddings = get_embeddings_service()
+        return embeddings.count_tokens, embeddings.get_max_tokens()
+    except Exception as e:
+        logger.warning(f"Embedding tokenizer unavailable, approximating token counts: {e}")
+        return approximate_token_counts, None
+
+
+def iter_paragraphs(source: Union[str, Iterable[str]]) -> Iterator[str]:
+    """
+    Split a text stream into paragraphs without materializing the whole text.
+
+    Args:
+        source: Text, or an iterable of text pieces
+
+    Yields:
+        Paragraph strings (stripped, non-empty)
+    """
+    pieces = [source] if isinstance(source, str) else source
+    buffer = ""
+
+    for piece in pieces:
+        if not piece:
+            continue
+        buffer += piece
+
+        last = 0
+        for match in PARAGRAPH_BREAK.finditer(buffer):
+            paragraph = buffer[last:match.start()].strip()
+            if paragraph:
+                yield paragraph
+            last = match.end()
+        buffer = buffer[last:]
+
+        # No blank line in sight: cut at the last line/sentence break
+        while len(buffer) > MAX_PARAGRAPH_CHARS:
+            window = buffer[:MAX_PARAGRAPH_CHARS]
+            cut = max(window.rfind("\n"), window.rfind(". "))
+            if cut <= 0:
+                cut = window.rfind(" ")
+            cut = cut + 1 if cut > 0 else MAX_PARAGRAPH_CHARS
+            paragraph = buffer[:cut].strip()
+            if paragraph:
+                yield paragraph
+            buffer = buffer[cut:]
+
+    paragraph = buffer.strip()
+    if paragraph:
+        yield paragraph
+
+
+class TextChunker:
+    """
+    Token-aware chunker.
+
+    Usage:
+        chunker = TextChunker()
+        for chunk in chunker.iter_chunks(pages):
+            ...
+    """
+
+    def __init__(
+        self,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        token_counter: Optional[TokenCounter] = None,
+        max_tokens: Optional[int] = None
+    ):
+        """
+        Initialize chunker.
+
+        Args:
+            chunk_size: Target chunk size in tokens (default: RAG_CHUNK_SIZE)
+            chunk_overlap: Overlap between consecutive chunks in tokens
+                           (default: RAG_CHUNK_OVERLAP)
+            token_counter: Callable returning token counts for a list of
+                           strings (default: the embedding model's tokenizer)
+            max_tokens: Hard cap on chunk size (default: the embedding
+                        model's max sequence length)
+        """
+        if token_counter is None:
+            token_counter, model_max = get_token_counter()
+            max_tokens = max_tokens or model_max
+
+        self.count_tokens = token_counter
+        self.chunk_size = chunk_size or settings.RAG_CHUNK_SIZE
+        if max_tokens and self.chunk_size > max_tokens:
+            self.chunk_size = max_tokens
+
+        overlap = settings.RAG_CHUNK_OVERLAP if chunk_overlap is None else chunk_overlap
+        self.chunk_overlap = max(0, min(overlap, self.chunk_size // 2))
+
+    def _units(self, paragraph: str) -> Iterator[Tuple[str, int, bool]]:
+        """Split a paragraph into (text, tokens, is_heading) units that fit a chunk"""
+        is_heading = bool(HEADING.match(paragraph)) and "\n" not in paragraph
+
+        sentences = [s for s in (part.strip() for part in SENTENCE_BREAK.split(paragraph)) if s]
+        if not sentences:
+            return
+
+        # One tokenizer call per paragraph
+        for sentence, tokens in zip(sentences, self.count_tokens(sentences)):
+            if tokens <= self.chunk_size:
+                yield sentence, tokens, is_heading
+            else:
+                yield from ((text, n, False) for text, n in self._split_long(sentence))
+
+    def _split_long(self, text: str) -> Iterator[Tuple[str, int]]:
+        """Split an oversize sentence into token-bounded word windows"""
+        words: List[str] = []
+        total = 0
+        all_words = text.split()
+        for word, tokens in zip(all_words, self.count_tokens(all_words)):
+            if words and total + tokens > self.chunk_size:
+                yield " ".join(words), total
+                words, total = [], 0
+            if tokens > self.chunk_size:
+                # A single unbroken "word" longer than a chunk (e.g. base64)
+                step = max(1, len(word) * self.chunk_size // tokens)
+                for start in range(0, len(word), step):
+                    part = word[start:start + step]
+                    yield part, self.count_tokens([part])[0]
+                continue
+            words.append(word)
+            total += tokens
+        if words:
+            yield " ".join(words), total
+
+    def iter_chunks(self, source: Union[str, Iterable[str]]) -> Iterator[str]:
+        """
+        Chunk a text stream.
+
+        Args:
+            source: Text, or an iterable of text pieces
+
+        Yields:
+            Chunk strings of at most chunk_size tokens
+        """
+        # Current chunk as (text, tokens, starts_paragraph) units
+        current: Deque[Tuple[str, int, bool]] = deque()
+        total = 0
+        fresh = False  # Holds units not already emitted as overlap
+
+        def emit() -> str:
+            parts = []
+            for text, _, starts_paragraph in current:
+                if parts:
+                    parts.append("\n\n" if starts_paragraph else " ")
+                parts.append(text)
+            return "".join(parts).strip()
+
+        for paragraph in iter_paragraphs(source):
+            first_in_paragraph = True
+            for text, tokens, is_heading in self._units(paragraph):
+                starts_section = is_heading and first_in_paragraph
+
+                if current and fresh and (starts_section or total + tokens > self.chunk_size):
+                    yield emit()
+
+                    # Carry the tail forward as overlap (none across a heading)
+                    keep = 0 if starts_section else self.chunk_overlap
+                    while current and (total > keep or total + tokens > self.chunk_size):
+                        total -= current.popleft()[1]
+                    fresh = False
+
+                current.append((text, tokens, first_in_paragraph))
+                total += tokens
+                fresh = True
+                first_in_paragraph = False
+
+        if current and fresh:
+            yield emit()
+
+
+def iter_chunks(
+    source: Union[str, Iterable[str]],
+    chunk_size: Optional[int] = None,
+    chunk_overlap: Optional[int] = None
+) -> Iterator[str]:
+    """Chunk text with a default TextChunker"""
+    return TextChunker(chunk_size, chunk_overlap).iter_chunks(source)
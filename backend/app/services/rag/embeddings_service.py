@@ -101,6 +101,36 @@ class EmbeddingsService:
         self._load_model()
         return self.dimension
 
+    def count_tokens(self, texts: List[str]) -> List[int]:
+        """
+        Count model tokens for a batch of texts (excluding special tokens).
+
+        Args:
+            texts: List of text strings
+
+        Returns:
+            Token count per text
+        """
+        self._load_model()
+
+        if not texts:
+            return []
+
+        encoded = self.model.tokenizer(
+            texts,
+            add_special_tokens=False,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+            verbose=False
+        )
+        return [len(ids) for ids in encoded["input_ids"]]
+
+    def get_max_tokens(self) -> int:
+        """Max content tokens per input before the model truncates"""
+        self._load_model()
+        # Leave room for the [CLS]/[SEP] special tokens
+        return self.model.max_seq_length - 2
+
 
 # Global instance
 _embeddings_service: Optional[EmbeddingsService] = None
@@ -111,7 +141,7 @@ def get_embeddings_service() -> EmbeddingsService:
     global _embeddings_service
 
     if _embeddings_service is None:
-        model_name = getattr(settings, 'EMBEDDINGS_MODEL', 'all-MiniLM-L6-v2')
+        model_name = settings.EMBEDDING_MODEL
         _embeddings_service = EmbeddingsService(model_name=model_name)
 
     return _embeddings_service
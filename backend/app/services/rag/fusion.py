@@ -0,0 +1,37 @@
+"""
+SIMBA Backend - Rank Fusion
+
+Reciprocal rank fusion (RRF) for combining ranked result lists.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]],
+    k: int = 60,
+    n_results: int = 10
+) -> List[Tuple[str, float]]:
+    """
+    Fuse several rankings of IDs with RRF: score(d) = sum(1 / (k + rank)).
+
+    Args:
+        rankings: Ranked ID lists, best first
+        k: RRF damping constant (60 is the value from the original paper)
+        n_results: Maximum number of fused results
+
+    Returns:
+        List of (id, score) sorted by descending fused score, with scores
+        normalized to 0-1 (1.0 = ranked first in every list)
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+
+    if not scores:
+        return []
+
+    best_possible = len(rankings) / (k + 1)
+    fused = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:n_results]
+    return [(item_id, score / best_possible) for item_id, score in fused]
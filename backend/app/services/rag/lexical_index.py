@@ -0,0 +1,404 @@
+"""
+SIMBA Backend - Lexical Index
+
+BM25 inverted index used next to vector search so exact identifiers
+(ticket numbers, error codes, part numbers) are always retrievable.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from heapq import nlargest
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.helpers import file_lock, file_signature
+from app.utils.logger import logger
+
+
+# Words, plus identifier-like compounds such as "ERR-1042", "v2.3.1" or "PN_88/A"
+TOKEN_PATTERN = re.compile(r"\w+(?:[-_./:#]\w+)*", re.UNICODE)
+COMPOUND_SPLIT = re.compile(r"[-_./:#]")
+
+FORMAT_VERSION = 1
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Tokenize text for lexical matching.
+
+    Compound identifiers are kept whole and also split into their parts,
+    so "ERR-1042" matches queries for "err-1042", "ERR 1042" and "1042".
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of lowercase terms
+    """
+    terms = []
+    for match in TOKEN_PATTERN.finditer(text.lower()):
+        token = match.group(0)
+        terms.append(token)
+        if not token.isalnum():
+            terms.extend(part for part in COMPOUND_SPLIT.split(token) if part)
+    return terms
+
+
+class BM25Index:
+    """
+    Incremental BM25 inverted index for a single search scope.
+
+    Documents are addressed by slot number internally; postings map each
+    term to {slot: term frequency}. Removals tombstone the slot and the
+    index is compacted once tombstones make up a significant share.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.doc_ids: List[Optional[str]] = []
+        self.doc_lens: List[int] = []
+        self.slots: Dict[str, int] = {}
+        self.total_len = 0
+        self.dirty = False
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    @property
+    def avg_doc_len(self) -> float:
+        return self.total_len / len(self.slots) if self.slots else 0.0
+
+    def add(self, doc_id: str, text: str):
+        """Add (or replace) a document in the index"""
+        if doc_id in self.slots:
+            self.remove(doc_id)
+
+        terms = tokenize(text)
+        slot = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        self.doc_lens.append(len(terms))
+        self.slots[doc_id] = slot
+        self.total_len += len(terms)
+
+        frequencies: Dict[str, int] = {}
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+        for term, tf in frequencies.items():
+            self.postings.setdefault(term, {})[slot] = tf
+
+        self.dirty = True
+
+    def add_many(self, items: Iterable[Tuple[str, str]]):
+        """Add multiple (doc_id, text) pairs"""
+        for doc_id, text in items:
+            self.add(doc_id, text)
+
+    def remove(self, doc_id: str) -> bool:
+        """Remove a document; returns False if it was not indexed"""
+        slot = self.slots.pop(doc_id, None)
+        if slot is None:
+            return False
+
+        self.doc_ids[slot] = None
+        self.total_len -= self.doc_lens[slot]
+        self.dirty = True
+
+        if len(self.doc_ids) - len(self.slots) > max(64, len(self.slots) // 4):
+            self.compact()
+        return True
+
+    def compact(self):
+        """Drop tombstoned slots and renumber the postings"""
+        remap: Dict[int, int] = {}
+        doc_ids: List[Optional[str]] = []
+        doc_lens: List[int] = []
+        for slot, doc_id in enumerate(self.doc_ids):
+            if doc_id is None:
+                continue
+            remap[slot] = len(doc_ids)
+            doc_ids.append(doc_id)
+            doc_lens.append(self.doc_lens[slot])
+
+        postings: Dict[str, Dict[int, int]] = {}
+        for term, entries in self.postings.items():
+            kept = {remap[slot]: tf for slot, tf in entries.items() if slot in remap}
+            if kept:
+                postings[term] = kept
+
+        self.postings = postings
+        self.doc_ids = doc_ids
+        self.doc_lens = doc_lens
+        self.slots = {doc_id: slot for slot, doc_id in enumerate(doc_ids)}
+        self.dirty = True
+
+    def search(
+        self,
+        query: str,
+        n_results: int = 10,
+        stats: Optional["CorpusStats"] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Score documents against a query with BM25.
+
+        Args:
+            query: Query text
+            n_results: Maximum number of results
+            stats: Corpus statistics to score with (default: this index's);
+                scores of indexes searched with the same stats are comparable
+
+        Returns:
+            List of (doc_id, score) sorted by descending score
+        """
+        if not self.slots:
+            return []
+
+        terms = set(tokenize(query))
+        if stats is None:
+            stats = CorpusStats.of([self], terms)
+        n_docs = stats.n_docs
+        avg_len = stats.avg_doc_len or 1.0
+        k1, b = self.k1, self.b
+        doc_ids, doc_lens = self.doc_ids, self.doc_lens
+
+        scores: Dict[int, float] = {}
+        for term in terms:
+            entries = self.postings.get(term)
+            if not entries:
+                continue
+            df = stats.doc_freqs[term]
+            idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            for slot, tf in entries.items():
+                if doc_ids[slot] is None:
+                    continue
+                norm = k1 * (1.0 - b + b * doc_lens[slot] / avg_len)
+                scores[slot] = scores.get(slot, 0.0) + idf * tf * (k1 + 1.0) / (tf + norm)
+
+        best = nlargest(n_results, scores.items(), key=lambda item: item[1])
+        return [(doc_ids[slot], score) for slot, score in best]
+
+    def to_bytes(self) -> bytes:
+        """Serialize to a compact zlib-compressed payload"""
+        if len(self.doc_ids) != len(self.slots):
+            self.compact()
+
+        payload = {
+            "v": FORMAT_VERSION,
+            "ids": self.doc_ids,
+            "lens": self.doc_lens,
+            # Postings are flattened to [slot, tf, slot, tf, ...]
+            "postings": {
+                term: [value for pair in entries.items() for value in pair]
+                for term, entries in self.postings.items()
+            },
+        }
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        return zlib.compress(raw, 6)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BM25Index":
+        """Load an index serialized with to_bytes()"""
+        payload = json.loads(zlib.decompress(data).decode("utf-8"))
+        if payload.get("v") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported lexical index version: {payload.get('v')}")
+
+        index = cls()
+        index.doc_ids = payload["ids"]
+        index.doc_lens = payload["lens"]
+        index.slots = {doc_id: slot for slot, doc_id in enumerate(index.doc_ids)}
+        index.total_len = sum(index.doc_lens)
+        index.postings = {
+            term: dict(zip(flat[::2], flat[1::2]))
+            for term, flat in payload["postings"].items()
+        }
+        return index
+
+
+class CorpusStats:
+    """BM25 statistics (document count, average length, document frequencies) of a set of indexes"""
+
+    def __init__(self, n_docs: int, total_len: int, doc_freqs: Dict[str, int]):
+        self.n_docs = n_docs
+        self.total_len = total_len
+        self.doc_freqs = doc_freqs
+
+    @property
+    def avg_doc_len(self) -> float:
+        return self.total_len / self.n_docs if self.n_docs else 0.0
+
+    @classmethod
+    def of(cls, indexes: List[BM25Index], terms: Iterable[str]) -> "CorpusStats":
+        """Statistics of the indexes taken together, for the given query terms"""
+        return cls(
+            n_docs=sum(len(index) for index in indexes),
+            total_len=sum(index.total_len for index in indexes),
+            doc_freqs={
+                term: sum(len(index.postings.get(term, ())) for index in indexes)
+                for term in terms
+            }
+        )
+
+
+class LexicalIndexStore:
+    """
+    On-disk collection of BM25 indexes, one file per search scope.
+
+    Recently used indexes stay in memory (LRU), so queries only check the
+    file's signature on the hot path. Several processes may share the
+    directory (the API and an external ingestion worker): an index is
+    reloaded when its file changed on disk, and changes are applied to the
+    latest file under a file lock, so one process never overwrites
+    another's additions.
+    """
+
+    def __init__(self, directory: str, max_cached: int = 256):
+        self.directory = Path(directory)
+        self.max_cached = max_cached
+        self._cache: "OrderedDict[str, BM25Index]" = OrderedDict()
+        self._signatures: Dict[str, Optional[tuple]] = {}  # scope -> file signature when loaded/written
+        self._lock = threading.RLock()
+
+    def _path(self, scope: str) -> Path:
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", scope)
+        return self.directory / f"{safe}.bm25"
+
+    def _lock_path(self, scope: str) -> Path:
+        return self._path(scope).with_suffix(".lock")
+
+    def get(self, scope: str) -> BM25Index:
+        """Get the index for a scope, (re)loading it from disk if needed"""
+        with self._lock:
+            index = self._cache.get(scope)
+            path = self._path(scope)
+            if index is not None and file_signature(path) == self._signatures.get(scope):
+                self._cache.move_to_end(scope)
+                return index
+
+            # Not loaded yet, or written by another process since
+            signature = file_signature(path)
+            index = BM25Index()
+            if signature is not None:
+                try:
+                    index = BM25Index.from_bytes(path.read_bytes())
+                except Exception as e:
+                    signature = self._set_aside(path, signature, e)
+
+            self._cache[scope] = index
+            self._cache.move_to_end(scope)
+            self._signatures[scope] = signature
+            while len(self._cache) > self.max_cached:
+                evicted_scope, evicted = self._cache.popitem(last=False)
+                self._signatures.pop(evicted_scope, None)
+            return index
+
+    @staticmethod
+    def _set_aside(path: Path, signature: tuple, error: Exception) -> Optional[tuple]:
+        """
+        Move an unreadable index file out of the way.
+
+        The scope starts empty (until its documents are re-indexed), but the
+        next write must not overwrite the only copy of the data.
+
+        Returns:
+            Signature of the file now at the path (None if moved)
+        """
+        corrupt_path = path.with_name(f"{path.name}.corrupt-{signature[2]}")
+        if file_signature(path) == signature:
+            # Otherwise another process already replaced it
+            os.replace(path, corrupt_path)
+        logger.error(f"Corrupt lexical index {path} moved to {corrupt_path}, starting empty: {error}")
+        return file_signature(path)
+
+    def _write(self, scope: str, data: bytes):
+        # Caller holds the scope's file lock
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(scope)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._signatures[scope] = file_signature(path)
+
+    def _update(self, scope: str, change: Callable[[BM25Index], None]):
+        """Apply a change to the latest version of a scope's index and persist it"""
+        # The file lock may wait for another process: the in-process lock
+        # (shared by all scopes) is only taken around the cached index
+        with file_lock(self._lock_path(scope)):
+            try:
+                with self._lock:
+                    index = self.get(scope)
+                    change(index)
+                    if not index.dirty:
+                        return
+                    data = index.to_bytes()
+                    index.dirty = False
+                self._write(scope, data)
+            except BaseException:
+                # Don't keep a half-applied change around
+                with self._lock:
+                    self._cache.pop(scope, None)
+                raise
+
+    def add_chunks(self, scope: str, ids: List[str], texts: List[str]):
+        """Index chunks and persist the scope"""
+        self._update(scope, lambda index: index.add_many(zip(ids, texts)))
+
+    def remove_chunks(self, scope: str, ids: List[str]):
+        """Remove chunks and persist the scope"""
+        def remove(index: BM25Index):
+            for chunk_id in ids:
+                index.remove(chunk_id)
+
+        self._update(scope, remove)
+
+    def search(self, scope: str, query: str, n_results: int = 10) -> List[Tuple[str, float]]:
+        """BM25 search within a scope"""
+        with self._lock:
+            return self.get(scope).search(query, n_results)
+
+    def search_scopes(self, scopes: List[str], query: str, n_results: int = 10) -> List[Tuple[str, float]]:
+        """
+        BM25 search across scopes as if they were one index.
+
+        Each scope keeps its own statistics, so its scores cannot be
+        compared with another scope's; here every scope is scored with the
+        pooled document count, average length and document frequencies.
+
+        Returns:
+            One ranking of (doc_id, score), best first
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            indexes = [self.get(scope) for scope in scopes]
+            stats = CorpusStats.of(indexes, terms)
+            hits = [hit for index in indexes for hit in index.search(query, n_results, stats)]
+        return nlargest(n_results, hits, key=lambda hit: hit[1])
+
+    def drop(self, scope: str):
+        """Delete a scope's index from memory and disk"""
+        with file_lock(self._lock_path(scope)):
+            with self._lock:
+                self._cache.pop(scope, None)
+                self._signatures.pop(scope, None)
+            self._path(scope).unlink(missing_ok=True)
+
+
+# Global instance
+_lexical_store: Optional[LexicalIndexStore] = None
+
+
+def get_lexical_store() -> LexicalIndexStore:
+    """Get or create global lexical index store"""
+    global _lexical_store
+
+    if _lexical_store is None:
+        _lexical_store = LexicalIndexStore(settings.RAG_LEXICAL_INDEX_DIRECTORY)
+
+    return _lexical_store
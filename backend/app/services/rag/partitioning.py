@@ -0,0 +1,87 @@
+"""
+SIMBA Backend - Vector Collection Partitioning
+
+Maps conversations to vector collections.
+
+Two layouts are supported (RAG_COLLECTION_LAYOUT):
+- per_conversation: one collection per conversation (conv_<id>)
+- shared: a fixed number of shared collections, partitioned by tenant
+  (the conversation owner); conversation/document scoping is pushed
+  down to the vector store as a `where` filter
+
+Uploaded files are deduplicated by content hash: their chunks live once
+in the content collection, independent of the layout, and are referenced
+from every conversation the file was uploaded to.
+"""
+
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Union
+
+from app.config import settings
+
+
+DEFAULT_TENANT = "default"
+CONTENT_COLLECTION = "simba_content"
+
+
+@dataclass(frozen=True)
+class VectorScope:
+    """Where a conversation's vectors live"""
+    collection: str
+    where: Optional[Dict[str, Any]] = None
+
+    def filter(self, **conditions: Any) -> Optional[Dict[str, Any]]:
+        """Combine the scope filter with extra equality conditions"""
+        clauses = [{key: value} for key, value in conditions.items()]
+        if self.where:
+            clauses.insert(0, self.where)
+        if not clauses:
+            return None
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def conversation_collection_name(conversation_id: str) -> str:
+    """Per-conversation collection name"""
+    # ChromaDB collection names must be 3-63 chars, alphanumeric + - _
+    sanitized = conversation_id.replace('-', '_')
+    return f"conv_{sanitized}"
+
+
+def conversation_id_from_collection(name: str) -> Optional[str]:
+    """Reverse of conversation_collection_name (None if not a conv_ collection)"""
+    if not name.startswith("conv_"):
+        return None
+    return name[len("conv_"):].replace('_', '-')
+
+
+def shared_collection_name(tenant_id: Optional[str]) -> str:
+    """Shared collection holding a tenant's vectors"""
+    tenant = tenant_id or DEFAULT_TENANT
+    partition = zlib.crc32(tenant.encode("utf-8")) % max(1, settings.RAG_SHARED_COLLECTIONS)
+    return f"simba_shared_{partition:03d}"
+
+
+def resolve_scope(conversation_id: str, tenant_id: Optional[str] = None) -> VectorScope:
+    """Vector scope for a conversation under the configured layout"""
+    if settings.RAG_COLLECTION_LAYOUT == "shared":
+        return VectorScope(
+            collection=shared_collection_name(tenant_id),
+            where={"conversation_id": conversation_id},
+        )
+    return VectorScope(collection=conversation_collection_name(conversation_id))
+
+
+def content_scope(content_hashes: Union[str, Iterable[str]]) -> VectorScope:
+    """Vector scope for deduplicated file content (one hash or several)"""
+    if isinstance(content_hashes, str):
+        return VectorScope(collection=CONTENT_COLLECTION, where={"content_hash": content_hashes})
+    return VectorScope(
+        collection=CONTENT_COLLECTION,
+        where={"content_hash": {"$in": list(content_hashes)}},
+    )
+
+
+def content_lexical_scope(content_hash: str) -> str:
+    """Lexical (BM25) index scope for deduplicated file content"""
+    return f"content_{content_hash}"
@@ -4,160 +4,514 @@ SIMBA Backend - RAG Service
 Retrieval-Augmented Generation service for semantic search and document retrieval.
 """
 
+import asyncio
+import hashlib
 import uuid
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from itertools import islice
+from typing import List, Dict, Any, Awaitable, Callable, Iterable, Optional, Tuple, Union
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.chroma_client import get_chroma_client
+from app.config import settings
+from app.db.vector_stores import get_async_vector_store, VectorHit
 from app.services.rag.embeddings_service import get_embeddings_service
-from app.repositories import DocumentRepository
+from app.services.rag.chunking import TextChunker
+from app.services.rag.lexical_index import get_lexical_store
+from app.services.rag.fusion import reciprocal_rank_fusion
+from app.services.rag.partitioning import (
+    VectorScope,
+    content_lexical_scope,
+    content_scope,
+    conversation_collection_name,
+    resolve_scope,
+)
+from app.repositories import DocumentRepository, ConversationRepository
 from app.models.message import Source
 from app.utils.logger import logger
 
 
+# Progress callback: (chunks indexed so far, characters indexed so far)
+IndexProgressCallback = Callable[[int, int], Awaitable[None]]
+
+# conversation_id -> tenant (owner) cache for the shared collection layout
+TENANT_CACHE_SIZE = 10000
+_tenant_cache: Dict[str, str] = {}
+
+
+@dataclass(frozen=True)
+class _IndexTarget:
+    """Where a piece of content's chunks are written"""
+    scope: VectorScope
+    lexical_scope: str
+    id_prefix: str
+    metadata: Dict[str, Any]
+
+
 class RAGService:
     """RAG service for document indexing and retrieval"""
 
     def __init__(self, db: AsyncSession):
         self.db = db
-        self.chroma = get_chroma_client()
+        self.vectors = get_async_vector_store()
         self.embeddings = get_embeddings_service()
+        self.lexical = get_lexical_store()
         self.document_repo = DocumentRepository(db)
+        self.conversation_repo = ConversationRepository(db)
 
     def _get_collection_name(self, conversation_id: str) -> str:
-        """Get ChromaDB collection name for conversation"""
-        # Sanitize conversation_id for ChromaDB
-        # ChromaDB collection names must be 3-63 chars, alphanumeric + - _
-        sanitized = conversation_id.replace('-', '_')
-        return f"conv_{sanitized}"
+        """Get per-conversation collection name (also the lexical index scope)"""
+        return conversation_collection_name(conversation_id)
+
+    async def _get_scope(
+        self,
+        conversation_id: str,
+        tenant_id: Optional[str] = None
+    ) -> VectorScope:
+        """
+        Resolve where a conversation's vectors live.
+
+        With the shared layout the tenant (conversation owner) picks the
+        partition; it is looked up once per conversation and cached.
+        """
+        if settings.RAG_COLLECTION_LAYOUT == "shared" and tenant_id is None:
+            tenant_id = _tenant_cache.get(conversation_id)
+            if tenant_id is None:
+                conversation = await self.conversation_repo.get(conversation_id)
+                tenant_id = conversation.user_id if conversation else None
+                if tenant_id is not None:
+                    if len(_tenant_cache) >= TENANT_CACHE_SIZE:
+                        _tenant_cache.clear()
+                    _tenant_cache[conversation_id] = tenant_id
+
+        return resolve_scope(conversation_id, tenant_id)
 
     async def index_document(
         self,
         document_id: str,
         conversation_id: str,
-        content: str,
+        content: Union[str, Iterable[str]],
         metadata: Optional[Dict[str, Any]] = None,
-        chunk_size: int = 500,
-        chunk_overlap: int = 50
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        tenant_id: Optional[str] = None,
+        on_progress: Optional[IndexProgressCallback] = None
     ) -> List[str]:
         """
-        Index a document into ChromaDB with chunking.
+        Index a document into the vector store with chunking.
+
+        Content is chunked lazily and embedded/written in batches of
+        RAG_INDEX_BATCH_SIZE, so memory use does not grow with document size.
 
         Args:
             document_id: Document ID
             conversation_id: Conversation ID
-            content: Document text content
+            content: Document text, or an iterable of text pieces (e.g. pages)
             metadata: Optional metadata
-            chunk_size: Size of text chunks (characters)
-            chunk_overlap: Overlap between chunks
+            chunk_size: Chunk size in tokens (default: RAG_CHUNK_SIZE)
+            chunk_overlap: Overlap between chunks in tokens (default: RAG_CHUNK_OVERLAP)
+            tenant_id: Owner of the conversation (looked up if omitted)
+            on_progress: Awaited after each batch with (chunks, characters) indexed
 
         Returns:
             List of vector IDs created
         """
+        logger.info(f"Indexing document {document_id} for conversation {conversation_id}")
+        target = _IndexTarget(
+            scope=await self._get_scope(conversation_id, tenant_id),
+            lexical_scope=self._get_collection_name(conversation_id),
+            id_prefix=document_id,
+            metadata={"document_id": document_id, "conversation_id": conversation_id, **(metadata or {})},
+        )
         try:
-            logger.info(f"Indexing document {document_id} for conversation {conversation_id}")
-
-            # Get or create collection
-            collection_name = self._get_collection_name(conversation_id)
-            collection = self.chroma.get_or_create_collection(collection_name)
-
-            # Chunk the content
-            chunks = self._chunk_text(content, chunk_size, chunk_overlap)
-            logger.info(f"Split document into {len(chunks)} chunks")
-
-            # Generate embeddings
-            embeddings = self.embeddings.encode(chunks)
-
-            # Prepare IDs and metadata
-            vector_ids = [f"{document_id}_{i}" for i in range(len(chunks))]
-            chunk_metadata = [
-                {
-                    "document_id": document_id,
-                    "conversation_id": conversation_id,
-                    "chunk_index": i,
-                    "chunk_total": len(chunks),
-                    **(metadata or {})
-                }
-                for i in range(len(chunks))
-            ]
+            return await self._index_chunks(target, content, chunk_size, chunk_overlap, on_progress)
+        except Exception as e:
+            logger.error(f"Error indexing document {document_id}: {e}")
+            raise
 
-            # Add to ChromaDB
-            collection.add(
-                ids=vector_ids,
-                embeddings=embeddings.tolist(),
-                documents=chunks,
-                metadatas=chunk_metadata
-            )
+    async def index_content(
+        self,
+        content_hash: str,
+        content: Union[str, Iterable[str]],
+        metadata: Optional[Dict[str, Any]] = None,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        reuse_from: Optional[str] = None,
+        on_progress: Optional[IndexProgressCallback] = None
+    ) -> List[str]:
+        """
+        Index deduplicated file content into the shared content collection.
 
-            logger.info(f"Indexed {len(vector_ids)} chunks for document {document_id}")
-            return vector_ids
+        Content vectors are stored once per file hash and referenced by
+        every document with that hash, in any conversation.
 
+        Args:
+            content_hash: SHA-256 of the uploaded file
+            content: Extracted text, or an iterable of text pieces
+            metadata: Optional metadata
+            chunk_size: Chunk size in tokens (default: RAG_CHUNK_SIZE)
+            chunk_overlap: Overlap between chunks in tokens (default: RAG_CHUNK_OVERLAP)
+            reuse_from: Hash of a previous version; its embeddings are reused
+                        for chunks that did not change
+            on_progress: Awaited after each batch with (chunks, characters) indexed
+
+        Returns:
+            List of vector IDs created
+        """
+        logger.info(f"Indexing content {content_hash[:12]}")
+        try:
+            return await self._index_chunks(
+                self._content_target(content_hash, metadata),
+                content,
+                chunk_size,
+                chunk_overlap,
+                on_progress,
+                reuse_scope=content_scope(reuse_from) if reuse_from else None
+            )
         except Exception as e:
-            logger.error(f"Error indexing document {document_id}: {e}")
+            logger.error(f"Error indexing content {content_hash[:12]}: {e}")
             raise
 
-    def _chunk_text(
+    def _content_target(self, content_hash: str, metadata: Optional[Dict[str, Any]] = None) -> _IndexTarget:
+        return _IndexTarget(
+            scope=content_scope(content_hash),
+            lexical_scope=content_lexical_scope(content_hash),
+            id_prefix=content_hash[:16],
+            metadata={"content_hash": content_hash, **(metadata or {})},
+        )
+
+    async def _index_chunks(
         self,
-        text: str,
-        chunk_size: int = 500,
-        chunk_overlap: int = 50
+        target: _IndexTarget,
+        content: Union[str, Iterable[str]],
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        on_progress: Optional[IndexProgressCallback] = None,
+        reuse_scope: Optional[VectorScope] = None
     ) -> List[str]:
+        """Chunk, embed and write content to a target; partial writes are rolled back"""
+        vector_ids: List[str] = []
+        indexed_chars = 0
+        try:
+            chunker = await asyncio.to_thread(TextChunker, chunk_size, chunk_overlap)
+            chunk_stream = chunker.iter_chunks(content)
+            batch_size = settings.RAG_INDEX_BATCH_SIZE
+            occurrences: Dict[str, int] = {}
+
+            while True:
+                # Chunking is CPU-bound (tokenizer), so pull batches off the event loop
+                chunks = await asyncio.to_thread(lambda: list(islice(chunk_stream, batch_size)))
+                if not chunks:
+                    break
+
+                first = len(vector_ids)
+                batch_ids, batch_hashes = self._chunk_ids(target.id_prefix, chunks, occurrences)
+                chunk_metadata = [
+                    self._chunk_metadata(target, first + i, batch_hashes[i])
+                    for i in range(len(chunks))
+                ]
+                embeddings = await self._embed_chunks(chunks, batch_hashes, reuse_scope)
+
+                # Add to vector store (collection is created on first write)
+                await self.vectors.add(
+                    target.scope.collection,
+                    ids=batch_ids,
+                    embeddings=embeddings,
+                    documents=chunks,
+                    metadatas=chunk_metadata
+                )
+
+                # Keep the lexical (BM25) index in step with the vectors
+                if settings.RAG_HYBRID_SEARCH:
+                    await asyncio.to_thread(
+                        self.lexical.add_chunks, target.lexical_scope, batch_ids, chunks
+                    )
+
+                vector_ids.extend(batch_ids)
+                indexed_chars += sum(len(chunk) for chunk in chunks)
+
+                if on_progress is not None:
+                    await on_progress(len(vector_ids), indexed_chars)
+
+            logger.info(f"Indexed {len(vector_ids)} chunks into {target.scope.collection}")
+            return vector_ids
+
+        except Exception:
+            # Don't leave a partially indexed document behind
+            if vector_ids:
+                await self._delete_chunks(target, vector_ids)
+            raise
+
+    async def _embed_chunks(
+        self,
+        chunks: List[str],
+        chunk_hashes: List[str],
+        reuse_scope: Optional[VectorScope] = None
+    ) -> List[List[float]]:
+        """Embed chunks, reusing stored embeddings of identical chunks if possible"""
+        reused: Dict[str, List[float]] = {}
+        if reuse_scope is not None:
+            try:
+                records = await self.vectors.get(
+                    reuse_scope.collection,
+                    where=reuse_scope.filter(chunk_hash={"$in": list(set(chunk_hashes))}),
+                    include_embeddings=True
+                )
+                reused = {
+                    record.metadata.get("chunk_hash"): record.embedding
+                    for record in records
+                    if record.embedding is not None
+                }
+            except Exception as e:
+                logger.warning(f"Could not reuse embeddings from {reuse_scope.collection}: {e}")
+
+        missing = [i for i, chunk_hash in enumerate(chunk_hashes) if chunk_hash not in reused]
+        embeddings: List[Optional[List[float]]] = [reused.get(chunk_hash) for chunk_hash in chunk_hashes]
+        if missing:
+            encoded = await asyncio.to_thread(self.embeddings.encode, [chunks[i] for i in missing])
+            for i, vector in zip(missing, encoded.tolist()):
+                embeddings[i] = vector
+        return embeddings
+
+    @staticmethod
+    def _chunk_ids(
+        id_prefix: str,
+        chunks: List[str],
+        occurrences: Dict[str, int]
+    ) -> Tuple[List[str], List[str]]:
         """
-        Split text into overlapping chunks.
+        Content-addressed vector IDs for chunks.
+
+        The ID is derived from the chunk's content hash, so an unchanged
+        chunk keeps its ID across re-indexing. Repeated identical chunks
+        within a document get an occurrence suffix.
 
         Args:
-            text: Text to chunk
-            chunk_size: Size of each chunk in characters
-            chunk_overlap: Overlap between chunks
+            id_prefix: Document ID (or content hash prefix for shared content)
+            chunks: Chunk texts, in document order
+            occurrences: Running hash -> count map, shared across batches
 
         Returns:
-            List of text chunks
+            (vector_ids, chunk_hashes)
         """
-        if not text:
-            return []
+        ids = []
+        hashes = []
+        for chunk in chunks:
+            chunk_hash = hashlib.sha256(chunk.encode("utf-8")).hexdigest()[:16]
+            seen = occurrences.get(chunk_hash, 0)
+            occurrences[chunk_hash] = seen + 1
+            suffix = f"_{seen}" if seen else ""
+            ids.append(f"{id_prefix}_{chunk_hash}{suffix}")
+            hashes.append(chunk_hash)
+        return ids, hashes
+
+    @staticmethod
+    def _chunk_metadata(target: _IndexTarget, chunk_index: int, chunk_hash: str) -> Dict[str, Any]:
+        """Metadata stored with each chunk vector"""
+        return {
+            **target.metadata,
+            "chunk_index": chunk_index,
+            "chunk_hash": chunk_hash,
+        }
+
+    async def reindex_document(
+        self,
+        document_id: str,
+        conversation_id: str,
+        content: Union[str, Iterable[str]],
+        existing_ids: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        tenant_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Incrementally re-index a document after its content changed.
 
-        chunks = []
-        start = 0
-        text_len = len(text)
+        The content is re-chunked and each chunk's content-addressed ID is
+        compared with what is already stored: only new or changed chunks are
+        embedded and written, chunks that merely moved get a metadata update,
+        and vectors for chunks that no longer exist are deleted.
 
-        while start < text_len:
-            # Get chunk
-            end = start + chunk_size
-            chunk = text[start:end]
+        Args:
+            document_id: Document ID
+            conversation_id: Conversation ID
+            content: New document text, or an iterable of text pieces
+            existing_ids: Vector IDs currently stored for the document
+                          (looked up in the vector store if omitted)
+            metadata: Optional metadata
+            chunk_size: Chunk size in tokens (default: RAG_CHUNK_SIZE)
+            chunk_overlap: Overlap between chunks in tokens (default: RAG_CHUNK_OVERLAP)
+            tenant_id: Owner of the conversation (looked up if omitted)
 
-            # Try to break at sentence boundary
-            if end < text_len:
-                # Look for sentence endings
-                last_period = chunk.rfind('. ')
-                last_newline = chunk.rfind('\n')
-                last_break = max(last_period, last_newline)
+        Returns:
+            Dict with vector_ids and added/moved/unchanged/removed counts
+        """
+        logger.info(f"Re-indexing document {document_id} for conversation {conversation_id}")
+        scope = await self._get_scope(conversation_id, tenant_id)
+        target = _IndexTarget(
+            scope=scope,
+            lexical_scope=self._get_collection_name(conversation_id),
+            id_prefix=document_id,
+            metadata={"document_id": document_id, "conversation_id": conversation_id, **(metadata or {})},
+        )
+        try:
+            if existing_ids is None:
+                records = await self.vectors.get(
+                    scope.collection, where=scope.filter(document_id=document_id)
+                )
+                existing_ids = [record.id for record in records]
 
-                if last_break > chunk_size * 0.5:  # At least 50% of chunk
-                    chunk = chunk[:last_break + 1]
-                    end = start + last_break + 1
+            return await self._sync_chunks(target, content, existing_ids, chunk_size, chunk_overlap)
+        except Exception as e:
+            logger.error(f"Error re-indexing document {document_id}: {e}")
+            raise
 
-            chunks.append(chunk.strip())
+    async def reindex_content(
+        self,
+        content_hash: str,
+        content: Union[str, Iterable[str]],
+        existing_ids: List[str],
+        metadata: Optional[Dict[str, Any]] = None,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Incrementally re-index shared content (e.g. after chunk settings changed).
 
-            # Move to next chunk with overlap
-            start = end - chunk_overlap
+        Args:
+            content_hash: SHA-256 of the uploaded file
+            content: Extracted text, or an iterable of text pieces
+            existing_ids: Vector IDs currently stored for the content
+            metadata: Optional metadata
+            chunk_size: Chunk size in tokens (default: RAG_CHUNK_SIZE)
+            chunk_overlap: Overlap between chunks in tokens (default: RAG_CHUNK_OVERLAP)
 
-        return [c for c in chunks if c]  # Filter empty chunks
+        Returns:
+            Dict with vector_ids and added/moved/unchanged/removed counts
+        """
+        logger.info(f"Re-indexing content {content_hash[:12]}")
+        try:
+            return await self._sync_chunks(
+                self._content_target(content_hash, metadata),
+                content,
+                existing_ids,
+                chunk_size,
+                chunk_overlap
+            )
+        except Exception as e:
+            logger.error(f"Error re-indexing content {content_hash[:12]}: {e}")
+            raise
+
+    async def _sync_chunks(
+        self,
+        target: _IndexTarget,
+        content: Union[str, Iterable[str]],
+        existing_ids: List[str],
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Diff re-chunked content against stored chunk IDs and apply the changes"""
+        scope = target.scope
+        remaining = set(existing_ids)
+
+        chunker = await asyncio.to_thread(TextChunker, chunk_size, chunk_overlap)
+        chunk_stream = chunker.iter_chunks(content)
+        batch_size = settings.RAG_INDEX_BATCH_SIZE
+        occurrences: Dict[str, int] = {}
+
+        vector_ids: List[str] = []
+        added = moved = unchanged = 0
+
+        while True:
+            chunks = await asyncio.to_thread(lambda: list(islice(chunk_stream, batch_size)))
+            if not chunks:
+                break
+
+            first = len(vector_ids)
+            batch_ids, batch_hashes = self._chunk_ids(target.id_prefix, chunks, occurrences)
+            batch_metadata = [
+                self._chunk_metadata(target, first + i, batch_hashes[i])
+                for i in range(len(chunks))
+            ]
+            vector_ids.extend(batch_ids)
+
+            new = [i for i, vector_id in enumerate(batch_ids) if vector_id not in remaining]
+            kept = [i for i, vector_id in enumerate(batch_ids) if vector_id in remaining]
+            remaining.difference_update(batch_ids)
+
+            # Embed only what is actually new
+            if new:
+                new_chunks = [chunks[i] for i in new]
+                new_ids = [batch_ids[i] for i in new]
+                embeddings = await asyncio.to_thread(self.embeddings.encode, new_chunks)
+                await self.vectors.upsert(
+                    scope.collection,
+                    ids=new_ids,
+                    embeddings=embeddings.tolist(),
+                    documents=new_chunks,
+                    metadatas=[batch_metadata[i] for i in new]
+                )
+                if settings.RAG_HYBRID_SEARCH:
+                    await asyncio.to_thread(
+                        self.lexical.add_chunks, target.lexical_scope, new_ids, new_chunks
+                    )
+                added += len(new)
+
+            # Unchanged chunks only need a metadata update if they moved
+            if kept:
+                stored = {
+                    record.id: record.metadata
+                    for record in await self.vectors.get(
+                        scope.collection, ids=[batch_ids[i] for i in kept]
+                    )
+                }
+                changed = [i for i in kept if stored.get(batch_ids[i]) != batch_metadata[i]]
+                if changed:
+                    await self.vectors.update_metadata(
+                        scope.collection,
+                        ids=[batch_ids[i] for i in changed],
+                        metadatas=[batch_metadata[i] for i in changed]
+                    )
+                moved += len(changed)
+                unchanged += len(kept) - len(changed)
+
+        removed = list(remaining)
+        if removed:
+            await self._delete_chunks(target, removed)
+
+        logger.info(
+            f"Re-indexed {scope.collection}: {added} added, {moved} moved, "
+            f"{unchanged} unchanged, {len(removed)} removed"
+        )
+        return {
+            "vector_ids": vector_ids,
+            "added": added,
+            "moved": moved,
+            "unchanged": unchanged,
+            "removed": len(removed),
+        }
 
     async def search(
         self,
         conversation_id: str,
         query: str,
         n_results: int = 5,
-        min_score: float = 0.0
+        min_score: float = 0.0,
+        tenant_id: Optional[str] = None
     ) -> List[Source]:
         """
-        Semantic search for relevant documents.
+        Hybrid search for relevant documents.
+
+        Vector and BM25 lexical search run concurrently and their rankings
+        are fused with reciprocal rank fusion (RRF). With hybrid search
+        disabled this is a plain semantic search.
 
         Args:
             conversation_id: Conversation ID to search within
             query: Search query
             n_results: Maximum number of results
-            min_score: Minimum similarity score (0-1)
+            min_score: Minimum similarity score (0-1) for vector hits
+            tenant_id: Owner of the conversation (looked up if omitted)
 
         Returns:
             List of Source objects with relevant content
@@ -165,56 +519,168 @@ class RAGService:
         try:
             logger.info(f"Searching in conversation {conversation_id}: '{query[:50]}...'")
 
-            # Get collection
-            collection_name = self._get_collection_name(conversation_id)
-
-            try:
-                collection = self.chroma.get_collection(collection_name)
-            except Exception:
-                logger.warning(f"No collection found for conversation {conversation_id}")
-                return []
-
-            # Generate query embedding
-            query_embedding = self.embeddings.encode_single(query)
+            scope = await self._get_scope(conversation_id, tenant_id)
+
+            # Uploaded documents reference shared, deduplicated content
+            contents = await self.document_repo.get_indexed_content(conversation_id)
+            scopes = [scope]
+            lexical_scopes = [self._get_collection_name(conversation_id)]
+            if contents:
+                scopes.append(content_scope(list(contents)))
+                lexical_scopes.extend(content_lexical_scope(h) for h in contents)
+
+            if not settings.RAG_HYBRID_SEARCH:
+                vector_hits = await self._vector_search(scopes, query, n_results, min_score)
+                sources = [
+                    self._build_source(vector_id, document, self._annotate(metadata, contents), score)
+                    for vector_id, document, metadata, score in vector_hits
+                ]
+                logger.info(f"Found {len(sources)} relevant sources")
+                return sources
+
+            # Over-fetch from both retrievers so fusion has candidates to work with
+            candidates = max(n_results * 2, 10)
+            vector_hits, lexical_hits = await asyncio.gather(
+                self._vector_search(scopes, query, candidates, min_score),
+                asyncio.to_thread(self._lexical_search, lexical_scopes, query, candidates),
+                return_exceptions=True
+            )
 
-            # Search
-            results = collection.query(
-                query_embeddings=[query_embedding.tolist()],
+            # Degrade to whichever retriever still works (e.g. vector store down)
+            if isinstance(vector_hits, Exception):
+                logger.warning(f"Vector search failed, using lexical results only: {vector_hits}")
+                vector_hits = []
+            if isinstance(lexical_hits, Exception):
+                logger.warning(f"Lexical search failed, using vector results only: {lexical_hits}")
+                lexical_hits = []
+
+            fused = reciprocal_rank_fusion(
+                [[hit[0] for hit in vector_hits], [hit[0] for hit in lexical_hits]],
+                k=settings.RAG_RRF_K,
                 n_results=n_results
             )
 
-            # Parse results
-            sources = []
+            vector_by_id = {hit[0]: hit for hit in vector_hits}
+            bm25_by_id = dict(lexical_hits)
 
-            if results and results['ids'] and len(results['ids']) > 0:
-                for i, vector_id in enumerate(results['ids'][0]):
-                    # Calculate similarity score (1 - distance for cosine)
-                    distance = results['distances'][0][i] if 'distances' in results else 0
-                    score = 1 - distance
-
-                    if score < min_score:
-                        continue
-
-                    metadata = results['metadatas'][0][i] if 'metadatas' in results else {}
-                    document = results['documents'][0][i] if 'documents' in results else ""
-
-                    source = Source(
-                        id=vector_id,
-                        title=f"Chunk {metadata.get('chunk_index', 0) + 1}/{metadata.get('chunk_total', 1)}",
-                        content=document[:500],  # Limit excerpt
-                        score=score,
-                        provider="chromadb",
-                        metadata=metadata
-                    )
-                    sources.append(source)
+            # Lexical-only hits still need their text and metadata
+            missing = [vector_id for vector_id, _ in fused if vector_id not in vector_by_id]
+            if missing:
+                for record in await self._fetch_chunks(scopes, missing):
+                    vector_by_id[record[0]] = record
+
+            sources = []
+            for vector_id, fused_score in fused:
+                hit = vector_by_id.get(vector_id)
+                if hit is None:
+                    continue
+                _, document, metadata, vector_score = hit
+                metadata = {
+                    **self._annotate(metadata, contents),
+                    "vector_score": vector_score,
+                    "bm25_score": bm25_by_id.get(vector_id),
+                }
+                sources.append(self._build_source(vector_id, document, metadata, fused_score))
 
-            logger.info(f"Found {len(sources)} relevant sources")
+            logger.info(
+                f"Found {len(sources)} relevant sources "
+                f"({len(vector_hits)} vector, {len(lexical_hits)} lexical candidates)"
+            )
             return sources
 
         except Exception as e:
             logger.error(f"Error searching: {e}")
             return []
 
+    async def _vector_search(
+        self,
+        scopes: List[VectorScope],
+        query: str,
+        n_results: int,
+        min_score: float = 0.0
+    ) -> List[Tuple[str, str, Dict[str, Any], float]]:
+        """
+        Semantic search across vector scopes.
+
+        Returns:
+            List of (vector_id, document, metadata, score) tuples, best first
+        """
+        query_embedding = (await asyncio.to_thread(self.embeddings.encode_single, query)).tolist()
+
+        results: List[List[VectorHit]] = await asyncio.gather(*(
+            self.vectors.query(scope.collection, query_embedding, n_results, scope.where)
+            for scope in scopes
+        ))
+
+        hits = sorted(
+            (hit for scope_hits in results for hit in scope_hits),
+            key=lambda hit: hit.score,
+            reverse=True
+        )
+        return [
+            (hit.id, hit.document, hit.metadata, hit.score)
+            for hit in hits[:n_results]
+            if hit.score >= min_score
+        ]
+
+    def _lexical_search(
+        self,
+        lexical_scopes: List[str],
+        query: str,
+        n_results: int
+    ) -> List[Tuple[str, float]]:
+        """BM25 search across lexical scopes, scored with their pooled statistics"""
+        return self.lexical.search_scopes(lexical_scopes, query, n_results)
+
+    async def _fetch_chunks(
+        self,
+        scopes: List[VectorScope],
+        vector_ids: List[str]
+    ) -> List[Tuple[str, str, Dict[str, Any], Optional[float]]]:
+        """Fetch stored chunk text and metadata by vector ID"""
+        chunks = []
+        for scope in scopes:
+            try:
+                records = await self.vectors.get(scope.collection, ids=vector_ids, where=scope.where)
+            except Exception as e:
+                logger.warning(f"Could not fetch chunks from {scope.collection}: {e}")
+                continue
+            chunks.extend((record.id, record.document, record.metadata, None) for record in records)
+        return chunks
+
+    @staticmethod
+    def _annotate(metadata: Dict[str, Any], contents: Dict[str, Any]) -> Dict[str, Any]:
+        """Attach the referencing document to a shared content chunk"""
+        document = contents.get(metadata.get("content_hash"))
+        if document is None:
+            return metadata
+        return {
+            **metadata,
+            "document_id": document.id,
+            "conversation_id": document.conversation_id,
+            "filename": document.filename,
+        }
+
+    def _build_source(
+        self,
+        vector_id: str,
+        document: str,
+        metadata: Dict[str, Any],
+        score: float
+    ) -> Source:
+        """Build a Source from a stored chunk"""
+        title = f"Chunk {metadata.get('chunk_index', 0) + 1}"
+        if metadata.get("chunk_total"):
+            title += f"/{metadata['chunk_total']}"
+        return Source(
+            id=vector_id,
+            title=title,
+            content=document[:500],  # Limit excerpt
+            score=score,
+            provider=self.vectors.name,
+            metadata=metadata
+        )
+
     async def rerank_sources(
         self,
         query: str,
@@ -240,7 +706,7 @@ class RAGService:
 
             # Calculate relevance scores
             texts = [query] + [s.content for s in sources]
-            embeddings = self.embeddings.encode(texts)
+            embeddings = await asyncio.to_thread(self.embeddings.encode, texts)
 
             query_emb = embeddings[0]
             source_embs = embeddings[1:]
@@ -274,31 +740,64 @@ class RAGService:
     async def delete_document_vectors(
         self,
         conversation_id: str,
-        vector_ids: List[str]
+        vector_ids: List[str],
+        tenant_id: Optional[str] = None
     ) -> bool:
         """
-        Delete document vectors from ChromaDB.
+        Delete document vectors from the vector store.
 
         Args:
             conversation_id: Conversation ID
             vector_ids: List of vector IDs to delete
+            tenant_id: Owner of the conversation (looked up if omitted)
 
         Returns:
             True if successful
         """
         try:
-            collection_name = self._get_collection_name(conversation_id)
-            collection = self.chroma.get_collection(collection_name)
+            target = _IndexTarget(
+                scope=await self._get_scope(conversation_id, tenant_id),
+                lexical_scope=self._get_collection_name(conversation_id),
+                id_prefix="",
+                metadata={},
+            )
+            await self._delete_chunks(target, vector_ids)
+            return True
+
+        except Exception as e:
+            logger.error(f"Error deleting vectors: {e}")
+            return False
+
+    async def delete_content(self, content_hash: str) -> bool:
+        """
+        Delete all vectors of shared content (once nothing references it).
 
-            collection.delete(ids=vector_ids)
+        Args:
+            content_hash: SHA-256 of the uploaded file
 
-            logger.info(f"Deleted {len(vector_ids)} vectors from {collection_name}")
+        Returns:
+            True if successful
+        """
+        try:
+            scope = content_scope(content_hash)
+            await self.vectors.delete(scope.collection, where=scope.where)
+            await asyncio.to_thread(self.lexical.drop, content_lexical_scope(content_hash))
+            logger.info(f"Deleted content {content_hash[:12]}")
             return True
 
         except Exception as e:
-            logger.error(f"Error deleting vectors: {e}")
+            logger.error(f"Error deleting content {content_hash[:12]}: {e}")
             return False
 
+    async def _delete_chunks(self, target: _IndexTarget, vector_ids: List[str]):
+        """Delete chunks from a target's vector scope and lexical index"""
+        await self.vectors.delete(target.scope.collection, ids=vector_ids, where=target.scope.where)
+
+        if settings.RAG_HYBRID_SEARCH:
+            await asyncio.to_thread(self.lexical.remove_chunks, target.lexical_scope, vector_ids)
+
+        logger.info(f"Deleted {len(vector_ids)} vectors from {target.scope.collection}")
+
 
 # Import numpy for reranking
 import numpy as np
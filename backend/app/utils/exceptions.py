@@ -53,6 +53,11 @@ class IndexingError(RAGException):
     pass
 
 
+class VectorStoreUnavailableError(RAGException):
+    """Vector store is down or not responding"""
+    pass
+
+
 # Tool Exceptions
 class ToolException(SIMBAException):
     """Base exception for tool-related errors"""
@@ -90,6 +95,11 @@ class FileUploadError(FileException):
     pass
 
 
+class FileTooLargeError(FileUploadError):
+    """Uploaded file exceeds the size limit"""
+    pass
+
+
 class FileProcessingError(FileException):
     """Error processing file"""
     pass
@@ -100,6 +110,21 @@ class UnsupportedFileTypeError(FileException):
     pass
 
 
+class ExtractionTimeoutError(FileProcessingError):
+    """Text extraction exceeded its time limit"""
+    pass
+
+
+class ExtractionMemoryError(FileProcessingError):
+    """Text extraction exceeded its memory limit"""
+    pass
+
+
+class ExtractionWorkerError(FileException):
+    """Extraction worker process died"""
+    pass
+
+
 # Database Exceptions
 class DatabaseException(SIMBAException):
     """Base exception for database errors"""
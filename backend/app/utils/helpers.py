@@ -5,9 +5,17 @@ General purpose utility functions.
 """
 
 import hashlib
+import os
 import uuid
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Any, Dict
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 
 def generate_uuid() -> str:
@@ -63,29 +71,10 @@ def get_relative_time(dt: datetime) -> str:
         return f"{months} month{'s' if months > 1 else ''} ago"
 
 
-def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> list[str]:
-    """Chunk text into overlapping segments"""
-    if len(text) <= chunk_size:
-        return [text]
-
-    chunks = []
-    start = 0
-
-    while start < len(text):
-        end = start + chunk_size
-        chunk = text[start:end]
-
-        # Try to break at sentence boundary
-        if end < len(text):
-            last_period = chunk.rfind(". ")
-            if last_period > chunk_size * 0.5:  # Don't break too early
-                end = start + last_period + 1
-                chunk = text[start:end]
-
-        chunks.append(chunk.strip())
-        start = end - overlap
-
-    return chunks
+def chunk_text(text: str, chunk_size: int = 256, overlap: int = 32) -> list[str]:
+    """Chunk text into overlapping token-bounded segments (see app.services.rag.chunking)"""
+    from app.services.rag.chunking import iter_chunks
+    return list(iter_chunks(text, chunk_size, overlap))
 
 
 def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
@@ -136,6 +125,15 @@ def calculate_file_hash(file_bytes: bytes) -> str:
     return hashlib.sha256(file_bytes).hexdigest()
 
 
+def calculate_path_hash(path: str, block_size: int = 1024 * 1024) -> str:
+    """Calculate hash of a file on disk, reading it in blocks"""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human-readable form"""
     for unit in ['B', 'KB', 'MB', 'GB']:
@@ -148,3 +146,35 @@ def format_file_size(size_bytes: int) -> str:
 def parse_duration_ms(duration: timedelta) -> float:
     """Convert timedelta to milliseconds"""
     return duration.total_seconds() * 1000
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive lock on a lock file, shared with other processes.
+
+    The lock is not reentrant (not even within a process). Where fcntl is
+    unavailable, only the caller's own thread locking applies.
+
+    Args:
+        path: Lock file (created if missing)
+    """
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def file_signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    """(inode, size, mtime) of a file, to notice changes made by other processes; None if missing"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
@@ -0,0 +1,101 @@
+"""
+SIMBA Backend - Chunking Microbenchmark
+
+Measure throughput and peak memory of the streaming chunker on synthetic
+text fed in page-sized pieces.
+
+Usage:
+    python scripts/bench_chunking.py [--mb 50] [--chunk-size 256] [--overlap 32] [--model]
+
+By default token counts use the regex approximation so the benchmark
+measures the chunker itself; pass --model to use the embedding model's
+tokenizer (requires sentence-transformers).
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Iterator
+
+# Add parent directory to path
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.rag.chunking import TextChunker, approximate_token_counts
+
+
+WORDS = (
+    "system error ticket server request response config database index "
+    "document user conversation assistant upload timeout retry cache value"
+).split()
+
+
+def synthetic_pages(total_bytes: int, page_bytes: int = 4000, seed: int = 42) -> Iterator[str]:
+    """Yield page-sized pieces of paragraph/heading-structured text"""
+    rng = random.Random(seed)
+    produced = 0
+    section = 0
+
+    while produced < total_bytes:
+        parts = []
+        size = 0
+        while size < page_bytes:
+            if rng.random() < 0.05:
+                section += 1
+                paragraph = f"## Section {section}"
+            else:
+                sentences = []
+                for _ in range(rng.randint(2, 6)):
+                    words = [rng.choice(WORDS) for _ in range(rng.randint(6, 24))]
+                    if rng.random() < 0.1:
+                        words.append(f"ERR-{rng.randint(1000, 9999)}")
+                    sentences.append(" ".join(words).capitalize() + ".")
+                paragraph = " ".join(sentences)
+            parts.append(paragraph)
+            size += len(paragraph) + 2
+        page = "\n\n".join(parts) + "\n\n"
+        produced += len(page)
+        yield page
+
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description="Chunker microbenchmark")
+    parser.add_argument("--mb", type=float, default=50, help="Synthetic text size in MB")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Chunk size in tokens")
+    parser.add_argument("--overlap", type=int, default=32, help="Overlap in tokens")
+    parser.add_argument("--model", action="store_true", help="Use the embedding model tokenizer")
+    args = parser.parse_args()
+
+    total_bytes = int(args.mb * 1024 * 1024)
+
+    if args.model:
+        chunker = TextChunker(args.chunk_size, args.overlap)
+    else:
+        chunker = TextChunker(args.chunk_size, args.overlap, token_counter=approximate_token_counts)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    n_chunks = 0
+    chunk_chars = 0
+    for chunk in chunker.iter_chunks(synthetic_pages(total_bytes)):
+        n_chunks += 1
+        chunk_chars += len(chunk)
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"Input:        {args.mb:.1f} MB ({'model' if args.model else 'approximate'} tokens)")
+    print(f"Chunk size:   {chunker.chunk_size} tokens, overlap {chunker.chunk_overlap}")
+    print(f"Chunks:       {n_chunks} (avg {chunk_chars / max(1, n_chunks):.0f} chars)")
+    print(f"Time:         {elapsed:.2f} s")
+    print(f"Throughput:   {args.mb / elapsed:.2f} MB/s, {n_chunks / elapsed:.0f} chunks/s")
+    print(f"Peak memory:  {peak / 1024 / 1024:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
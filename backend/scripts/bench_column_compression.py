@@ -0,0 +1,144 @@
+"""
+SIMBA Backend - Column Compression Benchmark
+
+Measure storage size and read/write latency of message rows (content,
+sources, tool results) stored plain versus compressed with zlib and zstd,
+on a synthetic corpus of RAG answers in a temporary SQLite database.
+
+Usage:
+    python scripts/bench_column_compression.py [--messages 5000] [--threshold 2048]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, List
+
+from sqlalchemy import Column, MetaData, String, Table, create_engine, insert, select
+
+# Add parent directory to path
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.db.types import CompressedJSON, CompressedText, active_codec, zstandard
+
+
+WORDS = (
+    "system error ticket server request response config database index "
+    "document user conversation assistant upload timeout retry cache value "
+    "deployment cluster latency release rollback monitoring alert policy"
+).split()
+
+
+def sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(6, 18))]
+    return " ".join(words).capitalize() + "."
+
+
+def build_corpus(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Synthetic messages: short questions and long answers with sources"""
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(count):
+        if index % 2 == 0:
+            corpus.append({"content": sentence(rng), "sources": [], "tool_results": []})
+            continue
+        paragraphs = [" ".join(sentence(rng) for _ in range(rng.randint(3, 8)))
+                      for _ in range(rng.randint(2, 10))]
+        sources = [{
+            "document_id": str(uuid.uuid4()),
+            "filename": f"{rng.choice(WORDS)}_guide.pdf",
+            "content": " ".join(sentence(rng) for _ in range(6)),
+            "score": rng.random(),
+        } for _ in range(rng.randint(3, 8))]
+        tool_results = [{"tool": "search", "output": " ".join(sentence(rng) for _ in range(10))}] if index % 6 == 1 else []
+        corpus.append({"content": "\n\n".join(paragraphs), "sources": sources, "tool_results": tool_results})
+    return corpus
+
+
+def run(codec: str, corpus: List[Dict[str, Any]], directory: str) -> Dict[str, float]:
+    settings.COLUMN_COMPRESSION = codec
+    active_codec.cache_clear()
+
+    path = os.path.join(directory, f"{codec}.db")
+    engine = create_engine(f"sqlite:///{path}")
+    metadata = MetaData()
+    messages = Table(
+        "messages", metadata,
+        Column("id", String(36), primary_key=True),
+        Column("content", CompressedText, nullable=False),
+        Column("sources", CompressedJSON),
+        Column("tool_results", CompressedJSON),
+    )
+    metadata.create_all(engine)
+
+    rows = [{"id": f"{index:08d}", **message} for index, message in enumerate(corpus)]
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for offset in range(0, len(rows), 500):
+            conn.execute(insert(messages), rows[offset:offset + 500])
+    write_seconds = time.perf_counter() - start
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("VACUUM")
+    size = os.path.getsize(path)
+
+    start = time.perf_counter()
+    with engine.connect() as conn:
+        loaded = conn.execute(select(messages)).all()
+    scan_seconds = time.perf_counter() - start
+    assert loaded[1].content == corpus[1]["content"] and loaded[1].sources == corpus[1]["sources"]
+
+    rng = random.Random(7)
+    ids = [rng.choice(rows)["id"] for _ in range(1000)]
+    start = time.perf_counter()
+    with engine.connect() as conn:
+        for message_id in ids:
+            conn.execute(select(messages).where(messages.c.id == message_id)).one()
+    point_seconds = time.perf_counter() - start
+
+    engine.dispose()
+    return {
+        "size_mb": size / 1024 / 1024,
+        "write_us": write_seconds / len(rows) * 1e6,
+        "scan_us": scan_seconds / len(rows) * 1e6,
+        "point_us": point_seconds / len(ids) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Column compression benchmark")
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--threshold", type=int, default=settings.COLUMN_COMPRESSION_THRESHOLD_BYTES)
+    args = parser.parse_args()
+
+    settings.COLUMN_COMPRESSION_THRESHOLD_BYTES = args.threshold
+    corpus = build_corpus(args.messages)
+    raw_mb = sum(
+        len(m["content"]) + len(str(m["sources"])) + len(str(m["tool_results"])) for m in corpus
+    ) / 1024 / 1024
+    print(f"{args.messages} messages, ~{raw_mb:.1f} MB of text, threshold {args.threshold} bytes")
+
+    codecs = ["none", "zlib"] + (["zstd"] if zstandard is not None else [])
+    with tempfile.TemporaryDirectory() as directory:
+        baseline = None
+        for codec in codecs:
+            result = run(codec, corpus, directory)
+            baseline = baseline or result["size_mb"]
+            print(
+                f"{codec:>5}: {result['size_mb']:7.1f} MB ({result['size_mb'] / baseline:4.0%})  "
+                f"write {result['write_us']:6.0f} us/row  scan {result['scan_us']:6.0f} us/row  "
+                f"point read {result['point_us']:6.0f} us"
+            )
+    if zstandard is None:
+        print("zstandard not installed, zstd skipped")
+
+
+if __name__ == "__main__":
+    main()
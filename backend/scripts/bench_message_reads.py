@@ -0,0 +1,223 @@
+"""
+SIMBA Backend - Message Read Path Benchmark
+
+Compare the ORM read path of message history (selectinload of the
+assistant, ORM objects, Pydantic validation of every message and of the
+response) with the projection path (column rows, unvalidated construction,
+direct JSON serialization) on a synthetic 10k-message conversation in a
+temporary SQLite database.
+
+Usage:
+    python scripts/bench_message_reads.py [--messages 10000] [--page-size 200] [--runs 3]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+# Add parent directory to path
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.db.base import Base
+from app.db.models import Assistant, Conversation, Message, User
+from app.models.message import (
+    Message as MessageSchema,
+    MessagePage,
+    construct_message,
+    message_page_json,
+)
+from app.repositories import MessageRepository
+
+
+WORDS = (
+    "system error ticket server request response config database index "
+    "document user conversation assistant upload timeout retry cache value"
+).split()
+
+CONVERSATION_ID = "bench-conversation"
+
+
+def text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def build_messages(count: int, seed: int = 42) -> List[Dict]:
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    messages = []
+    for index in range(count):
+        assistant = index % 2 == 1
+        message = {
+            "id": str(uuid.uuid4()),
+            "conversation_id": CONVERSATION_ID,
+            "assistant_id": "bench-assistant" if assistant else None,
+            "role": "assistant" if assistant else "user",
+            "content": text(rng, rng.randint(80, 300) if assistant else rng.randint(5, 30)),
+            "msg_metadata": {"model": "gpt-4", "tokens": rng.randint(10, 900)} if assistant else {},
+            "sources": [],
+            "references": [],
+            "tool_calls": [],
+            "tool_results": [],
+            "created_at": start + timedelta(seconds=index),
+            "updated_at": start + timedelta(seconds=index),
+        }
+        if assistant:
+            message["sources"] = [{
+                "id": str(uuid.uuid4()),
+                "title": f"{rng.choice(WORDS)}_guide.pdf",
+                "url": None,
+                "content": text(rng, 60),
+                "score": round(rng.random(), 3),
+                "provider": "documents",
+                "metadata": {"page": rng.randint(1, 40)},
+            } for _ in range(rng.randint(2, 6))]
+            message["references"] = [
+                {"number": n + 1, "source_id": source["id"], "text": text(rng, 8)}
+                for n, source in enumerate(message["sources"][:2])
+            ]
+        messages.append(message)
+    return messages
+
+
+# ORM read path, as the listing worked before the projection path
+_orm_adapter = TypeAdapter(MessagePage)
+
+
+async def orm_page(db, limit: int, cursor):
+    repo = MessageRepository(db)
+    page = await repo._paginate(
+        select(Message)
+        .options(selectinload(Message.assistant))
+        .where(Message.conversation_id == CONVERSATION_ID),
+        Message.created_at,
+        limit,
+        cursor
+    )
+    response = MessagePage(
+        items=[MessageSchema.model_validate(message) for message in page.items],
+        next_cursor=page.next_cursor,
+        has_more=page.has_more
+    )
+    # FastAPI response handling: validate against response_model, then encode
+    validated = _orm_adapter.validate_python(response, from_attributes=True)
+    body = json.dumps(_orm_adapter.dump_python(validated, mode="json")).encode()
+    return body, page.next_cursor
+
+
+async def projection_page(db, limit: int, cursor):
+    page = await MessageRepository(db).get_rows_by_conversation(CONVERSATION_ID, limit=limit, cursor=cursor)
+    response = MessagePage.model_construct(
+        items=[construct_message(row._mapping) for row in page.items],
+        next_cursor=page.next_cursor,
+        has_more=page.has_more
+    )
+    return message_page_json(response), page.next_cursor
+
+
+async def orm_context(db, limit: int):
+    result = await db.execute(
+        select(Message)
+        .options(selectinload(Message.assistant))
+        .where(Message.conversation_id == CONVERSATION_ID)
+        .order_by(Message.created_at.desc())
+        .limit(limit)
+    )
+    return [{"role": m.role, "content": m.content} for m in reversed(result.scalars().all())]
+
+
+async def projection_context(db, limit: int):
+    rows = await MessageRepository(db).get_context_rows(CONVERSATION_ID, limit=limit)
+    return [{"role": row.role, "content": row.content} for row in rows]
+
+
+async def measure(runs: int, fn: Callable[[], Awaitable]) -> Dict[str, float]:
+    """Best wall and CPU time of several runs"""
+    best_wall = best_cpu = float("inf")
+    for _ in range(runs):
+        wall, cpu = time.perf_counter(), time.process_time()
+        await fn()
+        best_wall = min(best_wall, time.perf_counter() - wall)
+        best_cpu = min(best_cpu, time.process_time() - cpu)
+    return {"wall_ms": best_wall * 1000, "cpu_ms": best_cpu * 1000}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Message read path benchmark")
+    parser.add_argument("--messages", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--context", type=int, default=50, help="Messages in LLM context")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}")
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with Session() as db:
+            db.add(User(id="bench-user", username="bench", email="bench@example.com", hashed_password="x"))
+            db.add(Assistant(id="bench-assistant", name="Bench"))
+            db.add(Conversation(id=CONVERSATION_ID, user_id="bench-user", assistant_id="bench-assistant"))
+            await db.flush()
+            messages = build_messages(args.messages)
+            for offset in range(0, len(messages), 1000):
+                await db.execute(insert(Message), messages[offset:offset + 1000])
+            await db.commit()
+
+        def whole_history(page_fn):
+            async def run():
+                cursor = None
+                async with Session() as db:
+                    while True:
+                        _, cursor = await page_fn(db, args.page_size, cursor)
+                        if cursor is None:
+                            break
+            return run
+
+        def context(context_fn):
+            async def run():
+                async with Session() as db:
+                    await context_fn(db, args.context)
+            return run
+
+        # Both paths must produce the same document
+        async with Session() as db:
+            orm_body, _ = await orm_page(db, args.page_size, None)
+            projection_body, _ = await projection_page(db, args.page_size, None)
+        assert json.loads(orm_body) == json.loads(projection_body), "read paths disagree"
+
+        pages = -(-args.messages // args.page_size)
+        print(f"{args.messages} messages, {pages} pages of {args.page_size}, best of {args.runs} runs")
+        for label, orm_fn, projection_fn, unit in (
+            ("history", whole_history(orm_page), whole_history(projection_page), pages),
+            ("context", context(orm_context), context(projection_context), 1),
+        ):
+            before = await measure(args.runs, orm_fn)
+            after = await measure(args.runs, projection_fn)
+            print(
+                f"{label:>8}: orm {before['wall_ms'] / unit:7.2f} ms wall {before['cpu_ms'] / unit:7.2f} ms cpu"
+                f"  ->  projection {after['wall_ms'] / unit:7.2f} ms wall {after['cpu_ms'] / unit:7.2f} ms cpu"
+                f"  ({after['cpu_ms'] / before['cpu_ms']:.0%} cpu)"
+                + ("  per page" if unit > 1 else "")
+            )
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -280,7 +280,7 @@ async def main():
         # Show final stats
         async with AsyncSessionLocal() as db:
             chat_service = ChatService(db)
-            messages = await chat_service.get_conversation_messages(conversation.id)
+            messages = (await chat_service.get_conversation_messages(conversation.id)).items
             print(f"\n📊 Estadísticas finales:")
             print(f"   Total de mensajes: {len(messages)}")
             print(f"   Conversación ID: {conversation.id}")
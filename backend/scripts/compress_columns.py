@@ -0,0 +1,135 @@
+"""
+SIMBA Backend - Column Compression Backfill Script
+
+Compress message and document text stored before column compression was
+enabled (or decompress everything, before turning it off).
+
+Compression needs no schema change - compressed values live in the
+existing columns and plain values stay readable - so this runs online,
+next to the application, instead of as an Alembic migration that would
+rewrite whole tables in one transaction. Rows are walked in primary key
+order in small batches, each committed on its own; values already in the
+target form are skipped, so an interrupted run can simply be restarted.
+
+Usage:
+    python scripts/compress_columns.py [--dry-run] [--decompress] [--batch-size 500] [--table messages]
+"""
+
+import argparse
+import asyncio
+import json
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import JSON, DateTime, Text, column, select, table, update
+
+# Add parent directory to path
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.db.session import AsyncSessionLocal
+from app.db.types import active_codec, compress_json, compress_value, decompress_value, is_compressed
+from app.utils.logger import logger
+
+
+# Compressed columns: table -> [(column, is JSON)]
+COLUMNS: Dict[str, List[Tuple[str, bool]]] = {
+    "messages": [("content", False), ("sources", True), ("tool_results", True)],
+    "documents": [("content", False)],
+    "document_contents": [("content", False)],
+}
+
+
+def convert(value: Any, is_json: bool, decompress: bool) -> Any:
+    """Stored form of a value after the backfill"""
+    if value is None:
+        return None
+    if decompress:
+        if not is_compressed(value):
+            return value
+        plain = decompress_value(value)
+        if is_json:
+            return json.loads(plain)
+        # Text starting with the marker can only be stored compressed
+        return value if is_compressed(plain) else plain
+
+    if is_compressed(value):
+        return value
+    return compress_json(value) if is_json else compress_value(value)
+
+
+async def backfill_table(name: str, batch_size: int, decompress: bool, dry_run: bool) -> Tuple[int, int]:
+    """
+    Convert one table's compressed columns.
+
+    Returns:
+        (rows scanned, rows rewritten)
+    """
+    columns = COLUMNS[name]
+    # Raw column types: read and write the stored form, bypassing the
+    # Compressed* types of the ORM models
+    raw = table(name, column("id", Text), column("updated_at", DateTime), *[
+        column(col, JSON if is_json else Text) for col, is_json in columns
+    ])
+
+    scanned = rewritten = 0
+    last_id = ""
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(raw)
+                .where(raw.c.id > last_id)
+                .order_by(raw.c.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+
+            for row in rows:
+                values = {}
+                for col, is_json in columns:
+                    stored = getattr(row, col)
+                    converted = convert(stored, is_json, decompress)
+                    if converted != stored:
+                        values[col] = converted
+                if values:
+                    rewritten += 1
+                    if not dry_run:
+                        # Skip rows the application changed since they were read
+                        await db.execute(
+                            update(raw)
+                            .where(raw.c.id == row.id, raw.c.updated_at == row.updated_at)
+                            .values(**values)
+                        )
+
+            if not dry_run:
+                await db.commit()
+
+        scanned += len(rows)
+        last_id = rows[-1].id
+        logger.info(f"{name}: {scanned} rows scanned, {rewritten} {'to rewrite' if dry_run else 'rewritten'}")
+
+    return scanned, rewritten
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Backfill column compression")
+    parser.add_argument("--dry-run", action="store_true", help="Count rows without rewriting them")
+    parser.add_argument("--decompress", action="store_true", help="Store all values uncompressed")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per transaction")
+    parser.add_argument("--table", choices=sorted(COLUMNS), action="append",
+                        help="Only this table (repeatable)")
+    args = parser.parse_args()
+
+    if not args.decompress and active_codec() is None:
+        logger.error("Column compression is disabled (COLUMN_COMPRESSION / COLUMN_COMPRESSION_THRESHOLD_BYTES)")
+        return
+
+    for name in args.table or COLUMNS:
+        scanned, rewritten = await backfill_table(name, args.batch_size, args.decompress, args.dry_run)
+        logger.info(f"✓ {name}: {rewritten} of {scanned} rows {'to rewrite' if args.dry_run else 'rewritten'}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
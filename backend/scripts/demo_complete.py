@@ -208,7 +208,7 @@ async def demo_statistics():
         user = await user_repo.get_by_username("testuser")
 
         # Conversation stats
-        conversations = await conv_repo.get_by_user(user.id)
+        conversations = (await conv_repo.get_by_user(user.id)).items
         stats = await conv_repo.get_stats(user.id)
 
         print(f"User: {user.username}")
@@ -219,7 +219,7 @@ async def demo_statistics():
         # Document stats
         if conversations:
             conv = conversations[0]
-            docs = await doc_repo.get_by_conversation(conv.id)
+            docs = (await doc_repo.get_by_conversation(conv.id)).items
             total_size = await doc_repo.get_total_size(conv.id)
 
             print(f"\nDocuments:")
@@ -0,0 +1,71 @@
+"""
+SIMBA Backend - Blob Store Garbage Collection Script
+
+Delete blob store entries that no document or shared content references
+any more (deleted documents, re-indexed files).
+
+Blobs written less than --min-age-minutes ago are kept even when
+unreferenced: the transaction that stores their key may not have
+committed yet.
+
+Usage:
+    python scripts/gc_blob_store.py [--dry-run] [--min-age-minutes 60]
+"""
+
+import argparse
+import asyncio
+from typing import Set
+
+from sqlalchemy import select, union
+
+# Add parent directory to path
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.db.blob_store import get_blob_store
+from app.db.models import Document, DocumentContent
+from app.db.session import AsyncSessionLocal
+from app.utils.logger import logger
+
+
+async def referenced_keys() -> Set[str]:
+    """Blob keys referenced from the database"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(union(
+            select(Document.content_blob).where(Document.content_blob.is_not(None)),
+            select(DocumentContent.content_blob).where(DocumentContent.content_blob.is_not(None))
+        ))
+        return set(result.scalars().all())
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Delete unreferenced blob store entries")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be deleted")
+    parser.add_argument("--min-age-minutes", type=float, default=60.0,
+                        help="Keep blobs written more recently than this")
+    args = parser.parse_args()
+
+    store = get_blob_store()
+    # List blobs before reading references: a blob written in between is
+    # either referenced or too young to delete
+    keys = list(store.keys())
+    referenced = await referenced_keys()
+
+    deleted = 0
+    for key in keys:
+        if key in referenced or store.age(key) < args.min_age_minutes * 60:
+            continue
+        if args.dry_run:
+            logger.info(f"Would delete blob {key}")
+        elif store.delete(key):
+            deleted += 1
+
+    logger.info(
+        f"{len(keys)} blobs, {len(referenced)} referenced, "
+        f"{'dry run' if args.dry_run else f'{deleted} deleted'}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
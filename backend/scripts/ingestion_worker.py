@@ -0,0 +1,55 @@
+"""
+SIMBA Backend - Ingestion Worker Process
+
+Run document ingestion (extraction + indexing) outside the API process.
+Start the API with INGESTION_WORKER_MODE=external and run one or more of
+these against the same database; jobs are claimed atomically, so several
+worker processes can share the queue.
+
+Usage:
+    python scripts/ingestion_worker.py [--concurrency 2]
+"""
+
+import argparse
+import asyncio
+import signal
+
+# Add parent directory to path
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.db.vector_stores import get_vector_store
+from app.services.file_processing import shutdown_extraction_pool
+from app.services.ingestion import IngestionWorker
+from app.utils.logger import logger
+
+
+async def main():
+    """Run the worker until interrupted"""
+    parser = argparse.ArgumentParser(description="SIMBA ingestion worker")
+    parser.add_argument("--concurrency", type=int, default=None, help="Jobs processed at once")
+    args = parser.parse_args()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    store = get_vector_store()
+    await store.start()
+
+    worker = IngestionWorker(concurrency=args.concurrency)
+    await worker.start()
+    logger.info("Ingestion worker running, press Ctrl+C to stop")
+
+    try:
+        await stop.wait()
+    finally:
+        await worker.stop()
+        shutdown_extraction_pool()
+        await store.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+"""
+SIMBA Backend - Vector Collection Migration Script
+
+Move per-conversation vector collections (conv_<id>) into the shared,
+tenant-partitioned collections used by RAG_COLLECTION_LAYOUT=shared.
+
+Vectors are copied with their embeddings (nothing is re-embedded) in
+batches, grouped per target collection, and each source collection is
+verified by count before it is optionally dropped.
+
+Usage:
+    python scripts/migrate_vector_collections.py [--dry-run] [--drop-source] [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+from collections import defaultdict
+from typing import Dict, List
+
+from sqlalchemy import select
+
+# Add parent directory to path
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.db.session import AsyncSessionLocal
+from app.db.models import Conversation
+from app.db.vector_stores import get_vector_store
+from app.services.rag.partitioning import (
+    conversation_id_from_collection,
+    shared_collection_name,
+)
+from app.utils.logger import logger
+
+
+async def load_tenants(conversation_ids: List[str]) -> Dict[str, str]:
+    """Look up conversation owners in bulk"""
+    tenants: Dict[str, str] = {}
+    async with AsyncSessionLocal() as db:
+        for start in range(0, len(conversation_ids), 500):
+            batch = conversation_ids[start:start + 500]
+            result = await db.execute(
+                select(Conversation.id, Conversation.user_id)
+                .where(Conversation.id.in_(batch))
+            )
+            tenants.update({conv_id: user_id for conv_id, user_id in result.all()})
+    return tenants
+
+
+def migrate_collection(store, source: str, target: str, conversation_id: str, batch_size: int) -> int:
+    """Copy one collection into its shared target; returns vectors copied"""
+    copied = 0
+    offset = 0
+
+    while True:
+        records = store.get(
+            source,
+            include_embeddings=True,
+            limit=batch_size,
+            offset=offset
+        )
+        if not records:
+            break
+
+        store.upsert(
+            target,
+            ids=[r.id for r in records],
+            embeddings=[r.embedding for r in records],
+            documents=[r.document for r in records],
+            metadatas=[{**r.metadata, "conversation_id": conversation_id} for r in records]
+        )
+        copied += len(records)
+        offset += len(records)
+
+    return copied
+
+
+async def main():
+    """Migrate all per-conversation collections"""
+    parser = argparse.ArgumentParser(description="Migrate conv_* collections to shared collections")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be moved")
+    parser.add_argument("--drop-source", action="store_true", help="Drop source collections after verification")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Vectors per read/write batch")
+    args = parser.parse_args()
+
+    store = get_vector_store()
+
+    sources = {
+        name: conversation_id_from_collection(name)
+        for name in store.list_collections()
+        if conversation_id_from_collection(name)
+    }
+    logger.info(f"Found {len(sources)} per-conversation collections")
+
+    tenants = await load_tenants(list(sources.values()))
+
+    plan: Dict[str, List[str]] = defaultdict(list)
+    for name, conversation_id in sources.items():
+        plan[shared_collection_name(tenants.get(conversation_id))].append(name)
+
+    for target, names in sorted(plan.items()):
+        logger.info(f"{target}: {len(names)} collections")
+
+    if args.dry_run:
+        return
+
+    total = 0
+    failed = []
+    for target, names in sorted(plan.items()):
+        for name in names:
+            conversation_id = sources[name]
+            try:
+                expected = store.count(name)
+                copied = migrate_collection(store, name, target, conversation_id, args.batch_size)
+                present = len(store.get(target, where={"conversation_id": conversation_id}))
+
+                if copied != expected or present < expected:
+                    raise RuntimeError(
+                        f"verification failed (expected {expected}, copied {copied}, present {present})"
+                    )
+
+                total += copied
+                if args.drop_source:
+                    store.drop_collection(name)
+
+                logger.info(f"Migrated {name} -> {target} ({copied} vectors)")
+
+            except Exception as e:
+                logger.error(f"Failed to migrate {name}: {e}")
+                failed.append(name)
+
+    logger.info(f"Migration finished: {total} vectors moved, {len(failed)} collections failed")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
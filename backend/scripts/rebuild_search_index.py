@@ -0,0 +1,103 @@
+"""
+SIMBA Backend - Search Index Rebuild Script
+
+Index conversation titles, messages and document texts into the full-text
+search index (app.db.search): after the migration that creates it, or to
+repair it.
+
+The application keeps the index up to date as rows are written, so this
+runs online: rows are walked in primary key order in small batches, each
+committed on its own, and re-indexing a row replaces its entry, so an
+interrupted run can simply be restarted.
+
+Usage:
+    python scripts/rebuild_search_index.py [--kind messages] [--batch-size 500]
+"""
+
+import argparse
+import asyncio
+from typing import Tuple
+
+from sqlalchemy import select, text
+
+# Add parent directory to path
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.db.models import Conversation, Document, Message
+from app.db.search import FTS_TABLE
+from app.db.session import AsyncSessionLocal
+from app.repositories import DocumentRepository, SearchRepository
+from app.utils.logger import logger
+
+
+# Option -> (indexed kind, model, indexed column)
+KINDS = {
+    "conversations": ("conversation", Conversation, Conversation.title),
+    "messages": ("message", Message, Message.content),
+    "documents": ("document", Document, Document.content_hash),
+}
+
+
+async def rebuild(option: str, batch_size: int) -> Tuple[int, int]:
+    """
+    Index every row of one kind.
+
+    Returns:
+        (rows scanned, rows indexed)
+    """
+    kind, model, column = KINDS[option]
+    scanned = indexed = 0
+    last_id = ""
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(model.id, column.label("value"))
+                .where(model.id > last_id)
+                .order_by(model.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+
+            search_repo = SearchRepository(db)
+            doc_repo = DocumentRepository(db)
+            for row in rows:
+                if kind == "document":
+                    value = await doc_repo.get_content(Document(id=row.id, content_hash=row.value))
+                else:
+                    value = row.value
+                await search_repo.index(kind, [row.id], value)
+                indexed += bool(value)
+
+            await db.commit()
+
+        scanned += len(rows)
+        last_id = rows[-1].id
+        logger.info(f"{option}: {scanned} rows scanned, {indexed} indexed")
+
+    return scanned, indexed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Rebuild the full-text search index")
+    parser.add_argument("--kind", choices=sorted(KINDS), action="append",
+                        help="Only this kind of rows (repeatable)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per transaction")
+    args = parser.parse_args()
+
+    for option in args.kind or KINDS:
+        scanned, indexed = await rebuild(option, args.batch_size)
+        logger.info(f"✓ {option}: {indexed} of {scanned} rows indexed")
+
+    async with AsyncSessionLocal() as db:
+        if db.get_bind().dialect.name == "sqlite":
+            # Merge the FTS5 segments written batch by batch
+            await db.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"))
+            await db.commit()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -17,6 +17,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from app.db.session import AsyncSessionLocal
 from app.db.models import Assistant, User
+from app.repositories import AssistantRepository
 from app.utils.logger import logger
 
 
@@ -151,9 +152,8 @@ async def seed_assistants():
 
             # Create assistants
             for assistant_data in assistants_data:
-                assistant = Assistant(**assistant_data)
-                db.add(assistant)
                 logger.info(f"Creating assistant: {assistant_data['name']}")
+            await AssistantRepository(db).create_many(assistants_data)
 
             await db.commit()
             logger.info(f"Successfully seeded {len(assistants_data)} assistants")
@@ -83,7 +83,7 @@ async def test_chat_service():
 
             # Get all messages
             logger.info("Getting conversation history...")
-            messages = await chat_service.get_conversation_messages(conversation.id)
+            messages = (await chat_service.get_conversation_messages(conversation.id)).items
             logger.info(f"✓ Conversation has {len(messages)} messages total\n")
 
             logger.info("✓ Chat service test completed successfully!")
@@ -103,7 +103,7 @@ async def test_chat_infrastructure():
 
             # Test getting messages
             logger.info("Testing message retrieval...")
-            messages = await chat_service.get_conversation_messages(conversation.id)
+            messages = (await chat_service.get_conversation_messages(conversation.id)).items
             logger.info(f"✓ Retrieved {len(messages)} messages\n")
 
             # Test mock LLM client
@@ -178,7 +178,7 @@ async def test_database_relationships():
             from app.repositories import ConversationRepository
             conv_repo = ConversationRepository(db)
 
-            user_conversations = await conv_repo.get_by_user(user.id)
+            user_conversations = (await conv_repo.get_by_user(user.id)).items
             logger.info(f"✓ User has {len(user_conversations)} total conversations")
 
             # Get conversation stats
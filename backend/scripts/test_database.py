@@ -100,7 +100,7 @@ async def test_conversation_repository(user, assistant):
             logger.info(f"  Assistant: {conv_with_assistant.assistant.name}")
 
         # Get conversations by user
-        user_conversations = await repo.get_by_user(user.id)
+        user_conversations = (await repo.get_by_user(user.id)).items
         logger.info(f"User has {len(user_conversations)} conversations")
 
         # Get message count
@@ -145,7 +145,7 @@ async def test_message_repository(conversation, assistant):
         logger.info(f"Created assistant message: {assistant_msg.id}")
 
         # Get messages by conversation
-        messages = await repo.get_by_conversation(conversation.id)
+        messages = (await repo.get_by_conversation(conversation.id)).items
         logger.info(f"Conversation has {len(messages)} messages")
 
         for msg in messages:
@@ -183,8 +183,12 @@ async def test_document_repository(conversation):
         )
         logger.info(f"Created document: {doc.filename}")
 
+        # Content is deferred and loaded on request
+        content = await repo.get_content(doc)
+        logger.info(f"Document content: {len(content or '')} characters")
+
         # Get documents by conversation
-        docs = await repo.get_by_conversation(conversation.id)
+        docs = (await repo.get_by_conversation(conversation.id)).items
         logger.info(f"Conversation has {len(docs)} documents")
 
         # Get by type
@@ -0,0 +1,165 @@
+"""
+SIMBA Backend - Query Count Test Script
+
+Check that the repository write helpers cost one database round trip
+(INSERT/UPDATE/DELETE ... RETURNING) and that the fallback for dialects
+without RETURNING still returns the written rows.
+
+Runs against a temporary SQLite database (RETURNING needs SQLite >= 3.35).
+
+Usage:
+    python scripts/test_query_counts.py
+"""
+
+import asyncio
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# Add parent directory to path
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.db.base import Base
+from app.db.models import Conversation, User
+from app.db.search import create_search_index
+from app.repositories import (
+    AssistantRepository,
+    DocumentContentRepository,
+    DocumentRepository,
+    MessageRepository,
+)
+from app.utils.logger import logger
+
+
+class StatementCounter:
+    """Counts the statements sent to the database"""
+
+    def __init__(self, engine):
+        self.statements: List[str] = []
+        event.listen(engine.sync_engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement.split("\n")[0])
+
+    async def count(self, call: Callable[[], Awaitable]):
+        """Run a call and return (its result, statements it sent)"""
+        self.statements = []
+        result = await call()
+        return result, list(self.statements)
+
+
+@contextmanager
+def without_returning(engine):
+    """Make the dialect report no RETURNING support (fallback path)"""
+    dialect = engine.sync_engine.dialect
+    saved = dialect.insert_returning, dialect.update_returning, dialect.delete_returning
+    dialect.insert_returning = dialect.update_returning = dialect.delete_returning = False
+    try:
+        yield
+    finally:
+        dialect.insert_returning, dialect.update_returning, dialect.delete_returning = saved
+
+
+async def check_write_helpers(Session, counter: StatementCounter, expected: int) -> bool:
+    """Run each write helper and compare its statement count with the expected one"""
+    ok = True
+
+    def report(name: str, statements: List[str], limit: int):
+        nonlocal ok
+        passed = len(statements) <= limit
+        ok = ok and passed
+        logger.info(f"  {'✓' if passed else '✗'} {name}: {len(statements)} statement(s) (expected <= {limit})")
+        if not passed:
+            for statement in statements:
+                logger.info(f"      {statement}")
+
+    async with Session() as db:
+        assistants = AssistantRepository(db)
+        contents = DocumentContentRepository(db)
+        documents = DocumentRepository(db)
+        messages = MessageRepository(db)
+
+        assistant, statements = await counter.count(lambda: assistants.create(id="query-count", name="Counted"))
+        report("create", statements, expected)
+        assert assistant.name == "Counted" and assistant.created_at is not None
+
+        assistant, statements = await counter.count(lambda: assistants.update("query-count", name="Renamed"))
+        report("update", statements, expected)
+        assert assistant.name == "Renamed"
+
+        _, statements = await counter.count(lambda: contents.acquire("f" * 64, "text/plain", 10))
+        content, statements = await counter.count(lambda: contents.acquire("f" * 64, "text/plain", 10))
+        report("acquire (existing content)", statements, expected)
+        assert content.ref_count == 2
+
+        await documents.create(
+            id="query-count-doc", conversation_id="query-count", filename="a.txt",
+            mime_type="text/plain", size_bytes=10
+        )
+        row, statements = await counter.count(
+            lambda: documents._delete_returning("query-count-doc", documents.model.size_bytes)
+        )
+        report("delete returning", statements, expected)
+        assert row.size_bytes == 10
+
+        deleted, statements = await counter.count(lambda: assistants.delete("query-count"))
+        report("delete", statements, 1)
+        assert deleted
+
+        # Composite writes (counters and search index) for reference
+        await messages.create(id="query-count-msg", conversation_id="query-count", role="user", content="hello")
+        _, statements = await counter.count(
+            lambda: messages.create(id="query-count-msg-2", conversation_id="query-count", role="user", content="hi")
+        )
+        logger.info(f"  · message create with counters and search index: {len(statements)} statement(s)")
+
+        await db.rollback()
+
+    return ok
+
+
+async def main():
+    """Run the query count checks with and without RETURNING"""
+    logger.info("Starting query count tests...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'counts.db')}")
+        Session = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(create_search_index)
+        async with Session() as db:
+            db.add(User(id="query-count", username="counted", email="counted@example.com", hashed_password="x"))
+            await AssistantRepository(db).create(id="owner", name="Owner")
+            db.add(Conversation(id="query-count", user_id="query-count", assistant_id="owner"))
+            await db.commit()
+
+        counter = StatementCounter(engine)
+        if not engine.sync_engine.dialect.insert_returning:
+            logger.warning("SQLite without RETURNING support: only the fallback is tested")
+            returning_ok = True
+        else:
+            logger.info("=== With RETURNING ===")
+            returning_ok = await check_write_helpers(Session, counter, expected=1)
+
+        logger.info("=== Fallback without RETURNING ===")
+        with without_returning(engine):
+            fallback_ok = await check_write_helpers(Session, counter, expected=3)
+
+        await engine.dispose()
+
+    if not (returning_ok and fallback_ok):
+        logger.error("✗ Query count tests failed")
+        sys.exit(1)
+    logger.info("✓ All query count tests passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())